@@ -0,0 +1,76 @@
+"""In-memory graph algorithms used by django-directed."""
+import logging
+
+
+logger = logging.getLogger("django_directed")
+
+
+def _strongconnect(start, adjacency: dict, indexes: dict, lowlinks: dict, components: dict):
+    """Runs an iterative depth-first search of Tarjan's algorithm from one unvisited node.
+
+    Updates `indexes`, `lowlinks`, and `components` in place. Each component is identified by the index of its root.
+    """
+    stack = [start]
+    on_stack = {start}
+    indexes[start] = lowlinks[start] = len(indexes)
+    work = [(start, iter(adjacency.get(start, ())))]
+
+    while work:
+        node, children = work[-1]
+        for child in children:
+            if child not in indexes:
+                indexes[child] = lowlinks[child] = len(indexes)
+                stack.append(child)
+                on_stack.add(child)
+                work.append((child, iter(adjacency.get(child, ()))))
+                break
+            if child in on_stack:
+                lowlinks[node] = min(lowlinks[node], indexes[child])
+        else:
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlinks[parent] = min(lowlinks[parent], lowlinks[node])
+
+            if lowlinks[node] == indexes[node]:
+                member = None
+                while member != node:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    components[member] = indexes[node]
+
+
+def strongly_connected_components(adjacency: dict) -> dict:
+    """Returns a mapping of {node: component_id} for the provided adjacency mapping of {node: [children]}.
+
+    Uses an iterative version of Tarjan's algorithm, so that deep graphs do not exhaust the recursion limit.
+    Two nodes share a component_id only if each can be reached from the other.
+    """
+    indexes = {}
+    lowlinks = {}
+    components = {}
+
+    nodes = set(adjacency)
+    for children in adjacency.values():
+        nodes.update(children)
+
+    for start in nodes:
+        if start not in indexes:
+            _strongconnect(start, adjacency, indexes, lowlinks, components)
+
+    return components
+
+
+def reaches(adjacency: dict, source, target) -> bool:
+    """Returns True if `target` can be reached from `source` by following the adjacency mapping of {node: [children]}."""
+    seen = {source}
+    frontier = [source]
+    while frontier:
+        node = frontier.pop()
+        for child in adjacency.get(node, ()):
+            if child == target:
+                return True
+            if child not in seen:
+                seen.add(child)
+                frontier.append(child)
+    return False
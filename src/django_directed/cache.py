@@ -0,0 +1,100 @@
+"""Optional caching of traversal results, using Django's cache framework.
+
+Cached values are keyed by a version number kept per Graph model. Any change to the structure of the graph bumps the
+version, so that older entries are never read again and are left to be evicted by the cache backend (by LRU or by
+their timeout). Caching is enabled by setting `cache_alias` in the GraphConfig.
+
+The version is not kept per Graph instance. Cached traversals are never limited to one Graph (scoped traversals
+bypass the cache), so an Edge written in any Graph may change them, and every write invalidates the whole model.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from django.core.cache import caches
+from django.db import transaction
+from django.dispatch import receiver
+
+from django_directed.signals import child_added
+from django_directed.signals import child_removed
+from django_directed.signals import children_added
+from django_directed.signals import children_removed
+
+
+logger = logging.getLogger("django_directed")
+
+if TYPE_CHECKING:
+    from django_directed.config import GraphConfig
+
+CACHE_KEY_PREFIX = "django_directed"
+
+
+def _version_key(config: GraphConfig) -> str:
+    return f"{CACHE_KEY_PREFIX}:version:{config.graph_fullname}"
+
+
+def _new_version(cache, key: str) -> int:
+    """Stores and returns a new version number.
+
+    Versions start from the current time, so a version which was evicted from the cache is never reused.
+    """
+    version = time.time_ns()
+    if not cache.add(key, version, timeout=None):
+        version = cache.get(key, version)
+    return version
+
+
+def graph_version(config: GraphConfig) -> int:
+    """Returns the current version number of the graph's structure."""
+    cache = caches[config.cache_alias]
+    key = _version_key(config)
+    version = cache.get(key)
+    if version is None:
+        version = _new_version(cache, key)
+    return version
+
+
+def _bump(config: GraphConfig):
+    cache = caches[config.cache_alias]
+    key = _version_key(config)
+    try:
+        cache.incr(key)
+    except ValueError:
+        _new_version(cache, key)
+
+
+def bump_graph_version(config: GraphConfig):
+    """Invalidates all cached traversals of the graph by bumping its version number.
+
+    The version is bumped immediately, so the current transaction does not read stale entries, and again when the
+    transaction commits, so that entries cached by other connections before the commit are not read either.
+    """
+    if config.cache_alias is None:
+        return
+    _bump(config)
+    transaction.on_commit(lambda: _bump(config))
+
+
+def cached(config: GraphConfig, key_parts: tuple, compute):
+    """Returns the cached value for the provided key parts, calling `compute()` to fill the cache on a miss."""
+    cache = caches[config.cache_alias]
+    key = ":".join(
+        [CACHE_KEY_PREFIX, config.graph_fullname, str(graph_version(config)), *(str(part) for part in key_parts)]
+    )
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, timeout=config.cache_timeout)
+    return value
+
+
+@receiver(child_added)
+@receiver(child_removed)
+@receiver(children_added)
+@receiver(children_removed)
+def invalidate_on_graph_change(sender, **kwargs):
+    """Bumps the graph version when Edges are added or removed."""
+    if hasattr(sender, "invalidate_traversal_cache"):
+        sender.invalidate_traversal_cache()
@@ -1,5 +1,6 @@
 """Configuration objects for the django_directed app."""
 import re
+from typing import Optional
 from typing import Union
 
 from django.db import models
@@ -8,6 +9,7 @@ from pydantic import validator
 
 from django_directed.fields import CurrentGraphFKField
 from django_directed.models import directed_factory
+from django_directed.operations import PARTITION_METHODS
 
 
 def validate_fullname(fullname: str) -> bool:
@@ -41,6 +43,61 @@ class GraphConfig(BaseModel):
     edge_fullname: str
     node_fullname: str
 
+    # Closure Table
+    #   Optional model name (`appname.ModelName`) for a transitive-closure table holding
+    #   (ancestor, descendant, depth) rows. When set, ancestor/descendant lookups are answered
+    #   from this table rather than with a recursive query. Not available for 'CYCLIC' graphs.
+    closure_fullname: Optional[str] = None
+
+    # Prepared Statements
+    #   If True, frequently executed traversal statements (counts, reachability checks, and closure table
+    #   maintenance) are prepared on the server. Only applies to PostgreSQL using psycopg 3 with the
+    #   `server_side_binding` and `prepare_threshold` options set in DATABASES. Has no effect otherwise.
+    prepared_statements: bool = False
+
+    # Bidirectional Reachability
+    #   If True, reachability checks (such as the cycle check made when adding an Edge to an acyclic graph)
+    #   search leafward from the source and rootward from the target at once, one query per level, expanding
+    #   whichever side has fewer Nodes. Suits wide graphs. If False, a single recursive query is used.
+    #   Not used when a closure table is configured.
+    bidirectional_reachability: bool = False
+
+    # Traversal Cache
+    #   Optional alias of a cache in the CACHES setting. When set, unfiltered traversals (descendants, ancestors,
+    #   and their counts) are cached, keyed by a version number for the graph which is bumped whenever Edges are
+    #   added or removed. Entries expire after `cache_timeout` seconds (None caches them until evicted). The
+    #   version is kept per Graph model rather than per Graph instance, since cached traversals are not limited to
+    #   one Graph: an Edge written in any Graph invalidates the cached traversals of all Graphs in the same tables.
+    cache_alias: Optional[str] = None
+    cache_timeout: Optional[int] = 300
+
+    # Tree Paths
+    #   If True, each Node stores the materialised path of pks from its root (`tree_path`, such as "/1/4/9/") and
+    #   its depth (`tree_depth`), maintained as Edges are added or removed. Unfiltered traversals then become
+    #   indexed prefix scans and pk lookups. Only available for 'ARBORESCENCE' graphs, where each Node is limited
+    #   to one parent.
+    tree_paths: bool = False
+
+    # Degree Counters
+    #   If True, each Node stores its number of parent Edges (`in_degree`) and child Edges (`out_degree`), updated
+    #   with F-expressions as Edges are added or removed. Root, leaf, and island queries, the children quantity
+    #   check, and ordering by degree then read indexed columns rather than counting Edges.
+    degree_counters: bool = False
+
+    # Depth Counter
+    #   If True, each Node stores the length of the longest path to it from any root Node (`depth`), updated as
+    #   Edges are added or removed. Levels and topological sorts are then read from this column. Not available
+    #   for 'CYCLIC' graphs.
+    depth_counter: bool = False
+
+    # Edge Table Partitioning
+    #   Optional method ('LIST' or 'HASH') used to partition the Edge table by Graph on PostgreSQL. The table is
+    #   converted with the `PartitionEdgeTable` migration operation, and the Edge `graph` field becomes required.
+    #   With 'LIST', each Graph is given its own partition when it is created. With 'HASH', Edges are spread over
+    #   `edge_partitions` partitions. Traversals within a `graph_scope` then only read the current Graph's partition.
+    edge_partitioning: Optional[str] = None
+    edge_partitions: int = 8
+
     # Plugins
     #   A list or tuple of pluggy plugins to use with this graph
     # graph_plugins: list = field(default_factory=list)
@@ -82,26 +139,69 @@ class GraphConfig(BaseModel):
     # Pydantic Validators
 
     @validator("edge_graph_fk_field", pre=True, always=True)
-    def edge_graph_fk_field_correct_subclass(self, value):
+    def edge_graph_fk_field_correct_subclass(cls, value):
         """Validates that edge_graph_fk_field is a subclass of CurrentGraphFKField."""
         if not issubclass(value, CurrentGraphFKField):
             raise ValueError("edge_graph_fk_field must be a subclass of CurrentGraphFKField")
         return value
 
     @validator("edge_parent_fk_field", "edge_child_fk_field", pre=True, always=True)
-    def edge_parent_child_fk_fields_correct_subclass(self, value):
+    def edge_parent_child_fk_fields_correct_subclass(cls, value):
         """Validates that edge_parent_fk_field and edge_child_fk_field are subclasses of ForeignKey."""
         if not issubclass(value, models.ForeignKey):
             raise ValueError("edge_parent_fk_field and edge_child_fk_field must be a subclass of ForeignKey")
         return value
 
     @validator("node_children_m2m_field", pre=True, always=True)
-    def node_children_m2m_field_is_m2m_subclass(self, value):
+    def node_children_m2m_field_is_m2m_subclass(cls, value):
         """Validates that node_children_m2m_field is a subclass of ManyToManyField."""
         if not issubclass(value, models.ManyToManyField):
             raise ValueError("node_children_m2m_field must be a subclass of ManyToManyField")
         return value
 
+    @validator("closure_fullname")
+    def closure_fullname_valid_for_graph_type(cls, value, values):
+        """Validates closure_fullname, and that the graph type is acyclic if a closure table is used."""
+        if value is None:
+            return value
+        validate_fullname(value)
+        graph_type = values.get("graph_type")
+        if graph_type is not None and graph_type.value == "CYCLIC":
+            raise ValueError("A closure table cannot be used with 'CYCLIC' graphs")
+        return value
+
+    @validator("tree_paths")
+    def tree_paths_valid_for_graph_type(cls, value, values):
+        """Validates that tree paths are only used with arborescences."""
+        graph_type = values.get("graph_type")
+        if value and graph_type is not None and graph_type.value != "ARBORESCENCE":
+            raise ValueError("Tree paths can only be used with 'ARBORESCENCE' graphs")
+        return value
+
+    @validator("depth_counter")
+    def depth_counter_valid_for_graph_type(cls, value, values):
+        """Validates that the depth counter is only used with acyclic graphs."""
+        graph_type = values.get("graph_type")
+        if value and graph_type is not None and graph_type.value == "CYCLIC":
+            raise ValueError("A depth counter cannot be used with 'CYCLIC' graphs")
+        return value
+
+    @validator("edge_partitioning")
+    def edge_partitioning_valid_method(cls, value):
+        """Validates that the Edge table partitioning method is 'LIST' or 'HASH'."""
+        if value is None:
+            return value
+        if value.upper() not in PARTITION_METHODS:
+            raise ValueError(f"edge_partitioning must be one of {PARTITION_METHODS}")
+        return value.upper()
+
+    @validator("edge_partitions")
+    def edge_partitions_positive(cls, value):
+        """Validates that the Edge table is spread over at least one partition."""
+        if value < 1:
+            raise ValueError("edge_partitions must be at least 1")
+        return value
+
     _validate_graph_fullname = validator("graph_fullname", allow_reuse=True)(validate_fullname)
     _validate_edge_fullname = validator("edge_fullname", allow_reuse=True)(validate_fullname)
     _validate_node_fullname = validator("node_fullname", allow_reuse=True)(validate_fullname)
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import logging
+from contextlib import asynccontextmanager
 from contextlib import contextmanager
 from typing import TYPE_CHECKING
 
@@ -64,15 +65,47 @@ def graph_scope(graph: BaseGraph):
     ```
     <sphinx-skip>
     """
-    graph_fullname = f"{graph._meta.app_label}.{graph._meta.label}"
+    previous = _enter_graph_scope(graph)
+    try:
+        yield
+    finally:
+        _exit_graph_scope(graph, previous)
 
-    previous = getattr(_threadlocals, graph_fullname, None)
-    _set_current_graph_instance(graph_fullname=graph_fullname, current_graph_instance=graph)
 
+@asynccontextmanager
+async def agraph_scope(graph: BaseGraph):
+    """Async context manager for graphs, for use with `async with` in async views and tasks.
+
+    The current Graph is stored in context-local storage, so it is seen by the code awaited within the scope,
+    including ORM calls made through `sync_to_async`, and concurrent tasks each keep their own scope.
+
+    <sphinx-skip>:
+
+    ```python
+    async with agraph_scope(graph):
+        descendants = await node.adescendants()
+    ```
+    <sphinx-skip>
+    """
+    previous = _enter_graph_scope(graph)
     try:
         yield
     finally:
-        if previous is not None:
-            _set_current_graph_instance(graph_fullname=graph_fullname, current_graph_instance=previous)
-        else:
-            delattr(_threadlocals, graph_fullname)
+        _exit_graph_scope(graph, previous)
+
+
+def _enter_graph_scope(graph: BaseGraph):
+    """Sets the graph as the current graph, returning the graph it replaces (if any)."""
+    graph_fullname = graph._meta.label
+    previous = getattr(_threadlocals, graph_fullname, None)
+    _set_current_graph_instance(graph_fullname=graph_fullname, current_graph_instance=graph)
+    return previous
+
+
+def _exit_graph_scope(graph: BaseGraph, previous):
+    """Restores the graph which was current before the scope was entered."""
+    graph_fullname = graph._meta.label
+    if previous is not None:
+        _set_current_graph_instance(graph_fullname=graph_fullname, current_graph_instance=previous)
+    else:
+        delattr(_threadlocals, graph_fullname)
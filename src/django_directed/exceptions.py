@@ -35,3 +35,9 @@ class ServiceDoesNotExistError(Exception):
     """Used when refering to an application that is not yet installed."""
 
     pass
+
+
+class GraphContainsCycleError(Exception):
+    """Used when an operation which requires an acyclic graph encounters a cycle."""
+
+    pass
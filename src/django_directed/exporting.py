@@ -0,0 +1,216 @@
+"""Streaming export of graphs as node-link JSON, GraphML, or DOT.
+
+Nodes and Edges are read with chunked `values()` queries over server-side cursors, and the output is produced by a
+generator of text fragments, so memory use stays bounded however large the graph is.
+"""
+import json
+import logging
+import os
+from xml.sax.saxutils import escape
+from xml.sax.saxutils import quoteattr
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from django_directed.query_utils import nodes_from_edges_queryset
+
+
+logger = logging.getLogger("django_directed")
+
+# Number of rows fetched per round trip, and rows joined into each fragment of output
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FORMATS = ("node-link", "graphml", "dot")
+
+GRAPHML_TYPES = {
+    "AutoField": "long",
+    "BigAutoField": "long",
+    "BigIntegerField": "long",
+    "BooleanField": "boolean",
+    "DecimalField": "double",
+    "FloatField": "double",
+    "IntegerField": "long",
+    "PositiveBigIntegerField": "long",
+    "PositiveIntegerField": "long",
+    "PositiveSmallIntegerField": "long",
+    "SmallAutoField": "long",
+    "SmallIntegerField": "long",
+}
+
+_encoder = DjangoJSONEncoder()
+
+
+def _chunked(fragments, chunk_size: int):
+    """Joins successive fragments into strings of `chunk_size` fragments each, so output is written in blocks."""
+    block = []
+    for fragment in fragments:
+        block.append(fragment)
+        if len(block) >= chunk_size:
+            yield "".join(block)
+            block = []
+    if block:
+        yield "".join(block)
+
+
+def _node_rows(node_queryset, node_fields: list, chunk_size: int):
+    return node_queryset.order_by("pk").values_list("pk", *node_fields).iterator(chunk_size=chunk_size)
+
+
+def _edge_rows(edge_queryset, edge_fields: list, chunk_size: int):
+    return (
+        edge_queryset.filter(parent__isnull=False, child__isnull=False)
+        .order_by("pk")
+        .values_list("parent_id", "child_id", *edge_fields)
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def _node_link(node_rows, edge_rows, node_fields: list, edge_fields: list, multigraph: bool = False):
+    yield f'{{"directed": true, "multigraph": {_encoder.encode(multigraph)}, "graph": {{}}, "nodes": ['
+    separator = ""
+    for pk, *values in node_rows:
+        yield separator + _encoder.encode({"id": pk, **dict(zip(node_fields, values))})
+        separator = ", "
+    yield '], "links": ['
+    separator = ""
+    for parent_pk, child_pk, *values in edge_rows:
+        yield separator + _encoder.encode({"source": parent_pk, "target": child_pk, **dict(zip(edge_fields, values))})
+        separator = ", "
+    yield "]}\n"
+
+
+def _graphml_value(value) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return escape(json.dumps(value, cls=DjangoJSONEncoder))
+    return escape(str(value))
+
+
+def _graphml_data(prefix: str, fields: list, values: list) -> str:
+    return "".join(
+        f'<data key="{prefix}_{field}">{_graphml_value(value)}</data>'
+        for field, value in zip(fields, values)
+        if value is not None
+    )
+
+
+def _graphml_keys(model, prefix: str, domain: str, fields: list):
+    for field in fields:
+        attr_type = GRAPHML_TYPES.get(model._meta.get_field(field).get_internal_type(), "string")
+        yield f'  <key id="{prefix}_{field}" for="{domain}" attr.name={quoteattr(field)} attr.type="{attr_type}"/>\n'
+
+
+def _graphml(node_model, edge_model, node_rows, edge_rows, node_fields: list, edge_fields: list):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+    yield from _graphml_keys(node_model, "n", "node", node_fields)
+    yield from _graphml_keys(edge_model, "e", "edge", edge_fields)
+    yield '  <graph edgedefault="directed">\n'
+    for pk, *values in node_rows:
+        yield f"    <node id={quoteattr(str(pk))}>{_graphml_data('n', node_fields, values)}</node>\n"
+    for parent_pk, child_pk, *values in edge_rows:
+        yield (
+            f"    <edge source={quoteattr(str(parent_pk))} target={quoteattr(str(child_pk))}>"
+            f"{_graphml_data('e', edge_fields, values)}</edge>\n"
+        )
+    yield "  </graph>\n</graphml>\n"
+
+
+def _dot_id(value) -> str:
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+
+
+def _dot_attributes(fields: list, values: list) -> str:
+    attributes = ", ".join(f"{field}={_dot_id(value)}" for field, value in zip(fields, values) if value is not None)
+    return f" [{attributes}]" if attributes else ""
+
+
+def _dot(node_rows, edge_rows, node_fields: list, edge_fields: list):
+    yield "digraph {\n"
+    for pk, *values in node_rows:
+        yield f"  {_dot_id(pk)}{_dot_attributes(node_fields, values)};\n"
+    for parent_pk, child_pk, *values in edge_rows:
+        yield f"  {_dot_id(parent_pk)} -> {_dot_id(child_pk)}{_dot_attributes(edge_fields, values)};\n"
+    yield "}\n"
+
+
+def export_rows(
+    node_model,
+    edge_model,
+    node_rows,
+    edge_rows,
+    format: str = "node-link",
+    node_fields: list = None,
+    edge_fields: list = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    multigraph: bool = False,
+):
+    """Yields the text of a graph in the requested format, from iterables of Node and Edge rows.
+
+    Node rows are `(pk, *node_field_values)` and Edge rows are `(parent_pk, child_pk, *edge_field_values)`.
+    `multigraph` is recorded in node-link JSON, and should be True if several Edges may link the same Nodes.
+    Used by `export_graph`, and by in-memory structures such as `Subgraph`.
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {format}. Choose from {', '.join(EXPORT_FORMATS)}")
+    node_fields = list(node_fields or [])
+    edge_fields = list(edge_fields or [])
+    if format == "node-link":
+        fragments = _node_link(node_rows, edge_rows, node_fields, edge_fields, multigraph)
+    elif format == "graphml":
+        fragments = _graphml(node_model, edge_model, node_rows, edge_rows, node_fields, edge_fields)
+    else:
+        fragments = _dot(node_rows, edge_rows, node_fields, edge_fields)
+    yield from _chunked(fragments, chunk_size)
+
+
+def export_graph(
+    edge_queryset,
+    format: str = "node-link",
+    node_queryset=None,
+    node_fields: list = None,
+    edge_fields: list = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    multigraph: bool = False,
+):
+    """Yields the text of the graph formed by a QuerySet of Edges, in the requested format.
+
+    Formats are "node-link" (JSON, as read by networkx's `node_link_graph`), "graphml", and "dot". Nodes are those
+    in `node_queryset`, or if it is not provided, every Node referenced by the Edges. `node_fields` and
+    `edge_fields` name the model fields written as attributes of each Node and Edge. `multigraph` is passed on to
+    `export_rows`, and defaults to the Edge model's `allow_duplicate_edges` when exporting through a QuerySet.
+    """
+    node_fields = list(node_fields or [])
+    edge_fields = list(edge_fields or [])
+    edge_model = edge_queryset.model
+    node_model = edge_model._meta.get_field("parent").related_model
+    if node_queryset is None:
+        node_queryset = nodes_from_edges_queryset(edge_queryset)
+
+    node_rows = _node_rows(node_queryset, node_fields, chunk_size)
+    edge_rows = _edge_rows(edge_queryset, edge_fields, chunk_size)
+    yield from export_rows(
+        node_model, edge_model, node_rows, edge_rows, format, node_fields, edge_fields, chunk_size, multigraph
+    )
+
+
+def write_export(file, export, format: str = None):
+    """Writes the text yielded by `export(format)` to a path or open text file.
+
+    If `format` is not provided, it is taken from the file extension of a path (".json", ".graphml", or ".dot").
+    """
+    if isinstance(file, (str, os.PathLike)):
+        if format is None:
+            extension = os.path.splitext(os.fspath(file))[1].lstrip(".").lower()
+            format = {"json": "node-link", "gv": "dot"}.get(extension, extension)
+        with open(file, "w", encoding="utf-8") as opened:
+            return write_export(opened, export, format=format)
+
+    for text in export(format or "node-link"):
+        file.write(text)
+
+
+def write_graph(file, edge_queryset, format: str = None, **kwargs):
+    """Writes the graph formed by a QuerySet of Edges to a path or open text file. See `export_graph`."""
+    write_export(file, lambda format: export_graph(edge_queryset, format=format, **kwargs), format=format)
+    logger.debug(f"Exported {edge_queryset.model._meta.label}")
@@ -0,0 +1,118 @@
+"""Helpers for importing Edges from edge lists (CSV, JSON Lines, or any iterable of pairs).
+
+See `EdgeQuerySet.import_edges`, which validates every candidate Edge with the Edge model's bulk checks before
+writing them with PostgreSQL's `COPY` where available, or with batched `bulk_create` otherwise.
+"""
+import csv
+import json
+import logging
+import os
+
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connections
+
+
+logger = logging.getLogger("django_directed")
+
+# Number of distinct node references resolved per lookup query
+IMPORT_BATCH_SIZE = 1000
+
+
+def read_edge_list(source, format: str = None, parent_key: str = "parent", child_key: str = "child"):
+    """Yields `(parent, child)` pairs from an edge list, one line at a time.
+
+    `source` may be a path, an open text file, or an iterable of pairs. Files are read as CSV (with a header row)
+    or as JSON Lines (one object per line), using `parent_key` and `child_key` to find the values. If `format` is
+    not provided, it is taken from the file extension of a path ("csv", "jsonl", or "ndjson").
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if format is None:
+            format = os.path.splitext(os.fspath(source))[1].lstrip(".").lower()
+        with open(source, newline="", encoding="utf-8") as file:
+            yield from read_edge_list(file, format=format, parent_key=parent_key, child_key=child_key)
+        return
+
+    if format == "csv":
+        for row in csv.DictReader(source):
+            yield row[parent_key], row[child_key]
+    elif format in ("jsonl", "ndjson"):
+        for line in source:
+            if line.strip():
+                row = json.loads(line)
+                yield row[parent_key], row[child_key]
+    elif format is None:
+        for parent, child in source:
+            yield parent, child
+    else:
+        raise ValueError(f"Unsupported edge list format: {format}")
+
+
+def resolve_nodes(node_model, pairs: list, node_field: str = "pk") -> list:
+    """Converts the node references in `(parent, child)` pairs to Node pks.
+
+    References are matched against `node_field` (the pk by default), with one query per batch of distinct values.
+    Raises a ValidationError listing every pair which refers to an unknown Node.
+    """
+    field = node_model._meta.pk if node_field == "pk" else node_model._meta.get_field(node_field)
+    pairs = [(field.to_python(parent), field.to_python(child)) for parent, child in pairs]
+    values = {value for pair in pairs for value in pair}
+
+    lookup = {}
+    values = list(values)
+    for start in range(0, len(values), IMPORT_BATCH_SIZE):
+        batch = values[start : start + IMPORT_BATCH_SIZE]
+        lookup.update(
+            node_model._base_manager.filter(**{f"{node_field}__in": batch}).order_by().values_list(node_field, "pk")
+        )
+
+    errors = [
+        ValidationError("The Edge refers to an unknown Node", code="unknown_node", params={"parent": p, "child": c})
+        for p, c in pairs
+        if p not in lookup or c not in lookup
+    ]
+    if errors:
+        raise ValidationError(errors)
+    return [(lookup[parent], lookup[child]) for parent, child in pairs]
+
+
+def copy_supported(using=DEFAULT_DB_ALIAS) -> bool:
+    """Returns True if the database connection supports `COPY ... FROM STDIN` (PostgreSQL with psycopg 3)."""
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        return hasattr(cursor.cursor, "copy")
+
+
+def _edge_columns(edge_model, field_values: dict, using=DEFAULT_DB_ALIAS) -> tuple:
+    """Returns the columns written for each Edge, and the database values shared by every Edge.
+
+    Shared values are taken from a template instance, so that field defaults are applied as `save()` would.
+    """
+    template = edge_model(**field_values)
+    columns, values = [], []
+    for field in edge_model._meta.concrete_fields:
+        if field.name in ("parent", "child") or (field.primary_key and getattr(template, field.attname) is None):
+            continue
+        columns.append(field.column)
+        values.append(field.get_db_prep_save(field.pre_save(template, True), connections[using]))
+    return columns, values
+
+
+def copy_edges(edge_model, pairs: list, field_values: dict = None, using=DEFAULT_DB_ALIAS):
+    """Writes Edges for the `(parent_pk, child_pk)` pairs with a single `COPY` statement.
+
+    Requires PostgreSQL with psycopg 3 (see `copy_supported`). No Edge instances are created, and no checks are run.
+    """
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    columns, values = _edge_columns(edge_model, field_values or {}, using=using)
+    parent_column = edge_model._meta.get_field("parent").column
+    child_column = edge_model._meta.get_field("child").column
+    column_sql = ", ".join(qn(column) for column in [parent_column, child_column, *columns])
+
+    with connection.cursor() as cursor:
+        with cursor.cursor.copy(f"COPY {qn(edge_model._meta.db_table)} ({column_sql}) FROM STDIN") as copy:
+            for parent_pk, child_pk in pairs:
+                copy.write_row([parent_pk, child_pk, *values])
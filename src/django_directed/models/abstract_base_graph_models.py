@@ -1,22 +1,106 @@
 """Abstract Base Graph Models for Django Directed."""
 from __future__ import annotations
 
+import functools
 import logging
+from collections import Counter
 from typing import TYPE_CHECKING
 
+import django
+from asgiref.sync import sync_to_async
 from django.apps import apps
 from django.core.exceptions import ImproperlyConfigured
 from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS
+from django.db import NotSupportedError
+from django.db import connections
 from django.db import models
-
+from django.db import router
+from django.db import transaction
+from django.db.models import Case
+from django.db.models import Count
+from django.db.models import Exists
+from django.db.models import F
+from django.db.models import Min
+from django.db.models import OuterRef
+from django.db.models import Q
+from django.db.models import Subquery
+from django.db.models import Value
+from django.db.models import When
+from django.db.models.functions import Coalesce
+
+from django_directed.algorithms import reaches
+from django_directed.algorithms import strongly_connected_components
+from django_directed.cache import bump_graph_version
+from django_directed.cache import cached
 from django_directed.context_managers import get_current_graph_instance
+from django_directed.exceptions import GraphContainsCycleError
+from django_directed.exceptions import NodeNotReachableError
+from django_directed.exporting import export_graph
+from django_directed.exporting import write_graph
+from django_directed.importing import IMPORT_BATCH_SIZE
+from django_directed.importing import copy_edges
+from django_directed.importing import copy_supported
+from django_directed.importing import read_edge_list
+from django_directed.importing import resolve_nodes
+from django_directed.operations import create_graph_partition
+from django_directed.operations import drop_graph_partition
 from django_directed.query_utils import _ordered_filter
+from django_directed.query_utils import edges_from_nodes_queryset
 from django_directed.signals import child_added
 from django_directed.signals import child_removed
+from django_directed.signals import children_added
+from django_directed.signals import children_removed
+from django_directed.snapshot import SNAPSHOT_CHUNK_SIZE
+from django_directed.snapshot import GraphSnapshot
+from django_directed.subgraph import SUBGRAPH_DIRECTIONS
+from django_directed.subgraph import Subgraph
+from django_directed.traversal import DEFAULT_MAX_DEPTH
+from django_directed.traversal import STREAM_CHUNK_SIZE
+from django_directed.traversal import bidirectional_reachable
+from django_directed.traversal import bidirectional_shortest_path
+from django_directed.traversal import closure_delta_params
+from django_directed.traversal import closure_insert_sql
+from django_directed.traversal import closure_levels_sql
+from django_directed.traversal import closure_prune_sql
+from django_directed.traversal import closure_subtract_sql
+from django_directed.traversal import closure_traversal_params
+from django_directed.traversal import closure_traversal_sql
+from django_directed.traversal import count_sql
+from django_directed.traversal import db_pk
+from django_directed.traversal import detach_traversal
+from django_directed.traversal import execute_statement
+from django_directed.traversal import filter_sql
+from django_directed.traversal import graph_filter_sql
+from django_directed.traversal import join_traversal
+from django_directed.traversal import levels_sql
+from django_directed.traversal import multi_source_closure_sql
+from django_directed.traversal import multi_source_traversal_params
+from django_directed.traversal import multi_source_traversal_sql
+from django_directed.traversal import ordered_pks_sql
+from django_directed.traversal import parse_path
+from django_directed.traversal import paths_params
+from django_directed.traversal import paths_sql
+from django_directed.traversal import reachability_sql
+from django_directed.traversal import reachable_edges_sql
+from django_directed.traversal import recursive_traversal_params
+from django_directed.traversal import recursive_traversal_sql
+from django_directed.traversal import rows_sql
+from django_directed.traversal import rows_traversal_params
+from django_directed.traversal import rows_traversal_sql
+from django_directed.traversal import rows_traversal_supported
+from django_directed.traversal import seed_sql
+from django_directed.traversal import stream_statement
 
 
 logger = logging.getLogger("django_directed")
 
+# Largest number of candidate Edges (or Nodes) whose pks are passed in a single query by the bulk checks
+BULK_CHECK_BATCH_SIZE = 500
+
+# Fields on which Edges are unique, unless `allow_duplicate_edges` is True
+EDGE_UNIQUE_FIELDS = ("graph", "parent", "child")
+
 if TYPE_CHECKING:
     from django_directed.config import GraphConfig
 
@@ -44,6 +128,29 @@ class BaseNode(models.Model):
         abstract = True
 
 
+class BaseClosure(models.Model):
+    """Base Closure Model lets us verify that a given model instance derives from BaseClosure."""
+
+    class Meta:  # noqa: D106
+        abstract = True
+
+
+def batched(items, size: int = BULK_CHECK_BATCH_SIZE):
+    """Yields successive lists of at most `size` items."""
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def same_graph(graph_pk) -> Q:
+    """Returns a filter matching the Edges of a Graph, or the Edges without a Graph if `graph_pk` is None.
+
+    Duplicate Edges are checked within a Graph, as the `(graph, parent, child)` unique constraint does. The constraint
+    cannot match Edges without a Graph, so the checks treat those as one more Graph of their own.
+    """
+    return Q(graph__isnull=True) if graph_pk is None else Q(graph_id=graph_pk)
+
+
 def get_model_class(model_fullname: str) -> models.Model:
     """Provided with a model fullname (`app_name.ModelName`), returns the associated model class."""
     split_names = model_fullname.split(".")
@@ -60,33 +167,459 @@ def get_model_class(model_fullname: str) -> models.Model:
     return model_class
 
 
+def graph_scoped(config: GraphConfig) -> bool:
+    """Returns True if a `graph_scope` is active for the configured Graph model."""
+    return get_current_graph_instance(graph_fullname=config.graph_fullname) is not None
+
+
+def scoped_edge_filter_sql(config: GraphConfig, edge_model, edge_filter, using: str = DEFAULT_DB_ALIAS) -> tuple:
+    """Returns the SQL and params restricting a traversal to the Edges in the current graph scope matching `edge_filter`."""
+    qn = connections[using].ops.quote_name
+    scope_sql, scope_params = graph_filter_sql(
+        edge_model, get_current_graph_instance(graph_fullname=config.graph_fullname), using=using
+    )
+    filters_sql, filters_params = filter_sql(
+        edge_model, edge_filter, f"{qn(edge_model._meta.db_table)}.{qn(edge_model._meta.pk.column)}", using=using
+    )
+    return " ".join(sql for sql in (scope_sql, filters_sql) if sql), scope_params + filters_params
+
+
 def get_graph_aware_queryset(config: GraphConfig):
     """Creates a queryset that is aware of the current graph instance."""
 
     class GraphAwareQuerySet(models.QuerySet):
         """A QuerySet that is aware of the current graph instance."""
 
-        def bulk_create(self, objs, batch_size=None, ignore_conflicts=False):
-            objs = list(objs)
+        def _stamp_graph(self, objs: list):
+            """Sets the current Graph on any of the objects without one, if a `graph_scope` is active.
+
+            The current Graph is looked up once for the batch.
+            """
+            if not any(field.name == "graph" for field in self.model._meta.concrete_fields):
+                return
+            graph = get_current_graph_instance(graph_fullname=config.graph_fullname)
+            if graph is None:
+                return
             for obj in objs:
-                obj.provider = get_current_graph_instance(graph_fullname=config.graph_fullname)
+                if obj.graph_id is None:
+                    obj.graph_id = graph.pk
 
-            super().bulk_create(objs, batch_size, ignore_conflicts)
+        def bulk_create(self, objs, batch_size=None, ignore_conflicts=False, **kwargs):
+            """Inserts the objects as `QuerySet.bulk_create` does, returning them.
+
+            Within a `graph_scope`, objects without a Graph are assigned the current Graph. Any other arguments, such
+            as `update_conflicts`, `update_fields`, and `unique_fields`, are passed on.
+            """
+            objs = list(objs)
+            self._stamp_graph(objs)
+            return super().bulk_create(objs, batch_size=batch_size, ignore_conflicts=ignore_conflicts, **kwargs)
 
     return GraphAwareQuerySet
 
 
+def get_edge_queryset(config: GraphConfig):  # noqa: C901
+    """Creates a graph-aware queryset with bulk methods for Edges."""
+
+    class EdgeQuerySet(get_graph_aware_queryset(config)):
+        """A graph-aware QuerySet for Edges."""
+
+        def bulk_create(self, objs, batch_size=None, ignore_conflicts=False, update_conflicts=False, **kwargs):
+            """Inserts the Edges as `QuerySet.bulk_create` does, returning them with their pks.
+
+            With `update_conflicts=True`, Edges which already exist are updated instead (an upsert), which requires
+            Django 4.1 or later. Unless other `unique_fields` are provided, existing Edges are matched on their Graph,
+            parent, and child, which requires `allow_duplicate_edges` to be False. `update_fields` defaults to the
+            Edge's other concrete fields. The pks of upserted Edges are then read back with one query per batch, so
+            that every returned Edge has its pk, whether it was inserted or updated.
+
+            The unique constraint treats Edges without a Graph as distinct, so those are matched on their parent and
+            child with one query per batch, then updated with `bulk_update` or inserted.
+            """
+            if not update_conflicts:
+                return super().bulk_create(objs, batch_size=batch_size, ignore_conflicts=ignore_conflicts, **kwargs)
+            if django.VERSION < (4, 1):
+                raise NotSupportedError("Upserting Edges with update_conflicts requires Django 4.1 or later.")
+
+            objs = list(objs)
+            self._stamp_graph(objs)
+            unique_fields = kwargs.setdefault("unique_fields", list(EDGE_UNIQUE_FIELDS))
+            if not kwargs.get("update_fields"):
+                kwargs["update_fields"] = [
+                    field.name
+                    for field in self.model._meta.concrete_fields
+                    if not field.primary_key and field.name not in unique_fields
+                ]
+            if tuple(unique_fields) != EDGE_UNIQUE_FIELDS:
+                return self._upsert(objs, batch_size, **kwargs)
+
+            with transaction.atomic(using=self.db):
+                self._upsert([edge for edge in objs if edge.graph_id is not None], batch_size, **kwargs)
+                self._upsert_without_graph([edge for edge in objs if edge.graph_id is None], batch_size, **kwargs)
+            for batch in batched(edge for edge in objs if edge.pk is None):
+                graph_pks = {edge.graph_id for edge in batch}
+                graphs = Q(graph_id__in=graph_pks - {None})
+                if None in graph_pks:
+                    graphs |= Q(graph__isnull=True)
+                pks = {
+                    (graph_pk, parent_pk, child_pk): pk
+                    for pk, graph_pk, parent_pk, child_pk in self.model._base_manager.filter(
+                        graphs,
+                        parent_id__in={edge.parent_id for edge in batch},
+                        child_id__in={edge.child_id for edge in batch},
+                    ).values_list("pk", "graph_id", "parent_id", "child_id")
+                }
+                for edge in batch:
+                    edge.pk = pks.get((edge.graph_id, edge.parent_id, edge.child_id))
+                    edge._state.adding = False
+            return objs
+
+        def _upsert(self, edges: list, batch_size=None, update_fields=None, **kwargs) -> list:
+            """Upserts the Edges with `ON CONFLICT`, or skips existing Edges if there are no fields to update."""
+            if not edges:
+                return edges
+            if not update_fields:
+                kwargs.pop("unique_fields", None)
+                return super().bulk_create(edges, batch_size=batch_size, ignore_conflicts=True, **kwargs)
+            return super().bulk_create(
+                edges, batch_size=batch_size, update_conflicts=True, update_fields=update_fields, **kwargs
+            )
+
+        def _upsert_without_graph(self, edges: list, batch_size=None, update_fields=None, **kwargs):
+            """Upserts Edges without a Graph, matching existing Edges without a Graph on their parent and child."""
+            for batch in batched(edges):
+                pks = {
+                    (parent_pk, child_pk): pk
+                    for pk, parent_pk, child_pk in self.model._base_manager.filter(
+                        graph__isnull=True,
+                        parent_id__in={edge.parent_id for edge in batch},
+                        child_id__in={edge.child_id for edge in batch},
+                    ).values_list("pk", "parent_id", "child_id")
+                }
+                existing = []
+                for edge in batch:
+                    edge.pk = pks.get((edge.parent_id, edge.child_id))
+                    if edge.pk is not None:
+                        edge._state.adding = False
+                        existing.append(edge)
+                if existing and update_fields:
+                    self.model._base_manager.bulk_update(existing, update_fields, batch_size=batch_size)
+                created = [edge for edge in batch if edge._state.adding]
+                if created:
+                    super().bulk_create(created, batch_size=batch_size)
+
+        def _new_graph_pk(self, kwargs: dict):
+            """Returns the pk of the Graph which new Edges created with these field values will belong to."""
+            if "graph_id" in kwargs:
+                return kwargs["graph_id"]
+            if "graph" in kwargs:
+                return getattr(kwargs["graph"], "pk", kwargs["graph"])
+            graph = get_current_graph_instance(graph_fullname=config.graph_fullname)
+            return graph.pk if graph is not None else None
+
+        def bulk_add(self, pairs, batch_size=None, **kwargs) -> list:
+            """Provided with an iterable of (parent, child) Nodes or pks, creates the Edges between them.
+
+            All candidate Edges are validated together before any are inserted, and a single `children_added`
+            signal is sent for the batch. Any kwargs are used as field values for every new Edge.
+            Note: As with `bulk_create`, the Edge model's `save()` method is not called.
+            """
+            pairs = [
+                (getattr(parent, "pk", parent), getattr(child, "pk", child))
+                for parent, child in pairs
+                if parent is not None and child is not None
+            ]
+            if not pairs:
+                return []
+
+            node_model = get_model_class(config.node_fullname)
+            with transaction.atomic():
+                self.model.bulk_check(pairs, graph_pk=self._new_graph_pk(kwargs))
+                edges = self.bulk_create(
+                    [self.model(parent_id=parent_pk, child_id=child_pk, **kwargs) for parent_pk, child_pk in pairs],
+                    batch_size=batch_size,
+                )
+                if node_model.tracks_edges():
+                    node_model.on_edges_added(pairs)
+
+            children_added.send(
+                sender=node_model,
+                pairs=pairs,
+                graph_fullname=config.graph_fullname,
+            )
+            return edges
+
+        async def abulk_add(self, pairs, batch_size=None, **kwargs) -> list:
+            """Async version of `bulk_add()`."""
+            return await sync_to_async(self.bulk_add)(pairs, batch_size=batch_size, **kwargs)
+
+        def import_edges(
+            self,
+            source,
+            format: str = None,
+            node_field: str = "pk",
+            parent_key: str = "parent",
+            child_key: str = "child",
+            batch_size: int = None,
+            use_copy: bool = True,
+            **kwargs,
+        ) -> int:
+            """Imports Edges from an edge list file or iterable of pairs, returning the number of Edges created.
+
+            The edge list is streamed (see `read_edge_list`), its node references are resolved against `node_field`,
+            and all candidate Edges are validated together before any are written. On PostgreSQL with psycopg 3,
+            Edges are written with `COPY`; otherwise with batched `bulk_create`. A single `children_added` signal is
+            sent for the import. Any kwargs are used as field values for every new Edge.
+            """
+            node_model = get_model_class(config.node_fullname)
+            graph = get_current_graph_instance(graph_fullname=config.graph_fullname)
+            if graph is not None and "graph" not in kwargs and "graph_id" not in kwargs:
+                kwargs["graph"] = graph
+            pairs = read_edge_list(source, format=format, parent_key=parent_key, child_key=child_key)
+            pairs = resolve_nodes(node_model, pairs, node_field=node_field)
+            if not pairs:
+                return 0
+
+            using = router.db_for_write(self.model)
+            with transaction.atomic(using=using):
+                self.model.bulk_check(pairs, graph_pk=self._new_graph_pk(kwargs))
+                if use_copy and copy_supported(using=using):
+                    copy_edges(self.model, pairs, kwargs, using=using)
+                else:
+                    self.bulk_create(
+                        [self.model(parent_id=parent_pk, child_id=child_pk, **kwargs) for parent_pk, child_pk in pairs],
+                        batch_size=batch_size or IMPORT_BATCH_SIZE,
+                    )
+                if node_model.tracks_edges():
+                    node_model.on_edges_added(pairs)
+
+            children_added.send(
+                sender=node_model,
+                pairs=pairs,
+                graph_fullname=config.graph_fullname,
+            )
+            logger.debug(f"Imported {len(pairs)} Edges into {config.edge_fullname}")
+            return len(pairs)
+
+        def export(self, file=None, format: str = None, **kwargs):
+            """Exports the Edges in this QuerySet, and the Nodes they connect, as node-link JSON, GraphML, or DOT.
+
+            If a path or open file is provided, the export is written to it. Otherwise a generator of text is
+            returned. See `django_directed.exporting.export_graph` for the options.
+            """
+            kwargs.setdefault("multigraph", config.allow_duplicate_edges)
+            if file is not None:
+                return write_graph(file, self, format=format, **kwargs)
+            return export_graph(self, format=format or "node-link", **kwargs)
+
+    return EdgeQuerySet
+
+
+def get_node_queryset(config: GraphConfig):  # noqa: C901
+    """Creates a graph-aware queryset with bulk methods for Nodes."""
+
+    class NodeQuerySet(get_graph_aware_queryset(config)):
+        """A graph-aware QuerySet for Nodes."""
+
+        def bulk_add_edges(self, pairs, batch_size=None, **kwargs) -> list:
+            """Provided with an iterable of (parent, child) Nodes or pks, creates the Edges between them."""
+            edge_model = get_model_class(config.edge_fullname)
+            return edge_model.objects.bulk_add(pairs, batch_size=batch_size, **kwargs)
+
+        async def abulk_add_edges(self, pairs, batch_size=None, **kwargs) -> list:
+            """Async version of `bulk_add_edges()`."""
+            return await sync_to_async(self.bulk_add_edges)(pairs, batch_size=batch_size, **kwargs)
+
+        def bulk_create(self, objs, *args, **kwargs):
+            """Inserts the Nodes as `QuerySet.bulk_create` does, giving each new Node a tree path if configured."""
+            nodes = super().bulk_create(objs, *args, **kwargs)
+            if config.tree_paths:
+                self.model.init_tree_paths(nodes)
+            return nodes
+
+        def __or__(self, other):
+            return super(NodeQuerySet, detach_traversal(self)).__or__(detach_traversal(other))
+
+        def __xor__(self, other):
+            return super(NodeQuerySet, detach_traversal(self)).__xor__(detach_traversal(other))
+
+        def _combinator_query(self, combinator, *other_qs, **kwargs):
+            """Detaches any traversals before `union()`, `intersection()`, or `difference()`."""
+            other_qs = tuple(detach_traversal(qs) for qs in other_qs)
+            return super(NodeQuerySet, detach_traversal(self))._combinator_query(combinator, *other_qs, **kwargs)
+
+        def export(self, file=None, format: str = None, **kwargs):
+            """Exports the subgraph induced by the Nodes in this QuerySet, as node-link JSON, GraphML, or DOT.
+
+            Every Node in the QuerySet is included, along with each Edge whose parent and child are both included.
+            """
+            return edges_from_nodes_queryset(self).export(file=file, format=format, node_queryset=self, **kwargs)
+
+        def roots(self):
+            """Returns the nodes in this QuerySet which have no parents.
+
+            Reads the `in_degree` column if `degree_counters` is configured, and otherwise checks for parent Edges
+            (only those in the current Graph, within a `graph_scope`).
+            """
+            if config.degree_counters and not graph_scoped(config):
+                return self.filter(in_degree=0)
+            edge_model = get_model_class(config.edge_fullname)
+            return self.filter(~Exists(edge_model.objects.filter(child=OuterRef("pk"), parent__isnull=False)))
+
+        def leaves(self):
+            """Returns the nodes in this QuerySet which have no children. See `roots()`."""
+            if config.degree_counters and not graph_scoped(config):
+                return self.filter(out_degree=0)
+            edge_model = get_model_class(config.edge_fullname)
+            return self.filter(~Exists(edge_model.objects.filter(parent=OuterRef("pk"), child__isnull=False)))
+
+        def islands(self):
+            """Returns the nodes in this QuerySet which have neither parents nor children. See `roots()`."""
+            return self.roots().leaves()
+
+        def levels(self, max_depth: int = None):
+            """Returns this QuerySet annotated with each node's `level`, and ordered by level and then pk.
+
+            A node's level is the length of the longest path to it from any root node, so nodes only depend on nodes
+            at lower levels, and each level can be fetched as a batch with `.filter(level=n)`. Levels are read from
+            the tree paths or the closure table if configured, and otherwise computed with a single recursive query
+            limited to `max_depth` levels. Within a `graph_scope`, levels are always computed from the current
+            Graph's Edges. Only available for acyclic graphs.
+            """
+            if config.graph_type.value == "CYCLIC":
+                raise GraphContainsCycleError("Levels are only available for acyclic graph types")
+            if not graph_scoped(config):
+                if config.depth_counter:
+                    return self.annotate(level=F("depth")).order_by("level", "pk")
+                if config.tree_paths:
+                    return self.annotate(level=F("tree_depth")).order_by("level", "pk")
+                if config.closure_fullname is not None:
+                    sql = closure_levels_sql(get_model_class(config.closure_fullname), using=self.db)
+                    return join_traversal(self, sql, [], annotation="level")
+
+            edge_model = get_model_class(config.edge_fullname)
+            scope_sql, scope_params = graph_filter_sql(
+                edge_model, get_current_graph_instance(graph_fullname=config.graph_fullname), using=self.db
+            )
+            sql = levels_sql(edge_model, edge_filter_sql=scope_sql, using=self.db)
+            params = [*scope_params, DEFAULT_MAX_DEPTH if max_depth is None else max_depth, *scope_params]
+            return join_traversal(self, sql, params, annotation="level")
+
+        def topological_sort(self, max_depth: int = None):
+            """Returns this QuerySet in a topological order, in which every node follows all of its ancestors.
+
+            Nodes are ordered by `level` and then pk. See `levels()`.
+            """
+            return self.levels(max_depth=max_depth)
+
+        def _traversal_sql(self, leafward=True, per_source=False, max_depth=None, edge_filter=None, node_filter=None):
+            """Returns the SQL and params walking the graph from every Node in this QuerySet at once."""
+            sources_sql, sources_params = seed_sql(self)
+            if config.closure_fullname is not None and not edge_filter and not node_filter and not graph_scoped(config):
+                sql = multi_source_closure_sql(
+                    get_model_class(config.closure_fullname),
+                    sources_sql,
+                    leafward=leafward,
+                    per_source=per_source,
+                    limit_depth=max_depth is not None,
+                    using=self.db,
+                )
+                return sql, sources_params + ([] if max_depth is None else [max_depth])
+
+            edge_model = get_model_class(config.edge_fullname)
+            qn = connections[self.db].ops.quote_name
+            edge_table = qn(edge_model._meta.db_table)
+            target_col = qn(edge_model._meta.get_field("child" if leafward else "parent").column)
+            edge_filter_sql, edge_filter_params = scoped_edge_filter_sql(config, edge_model, edge_filter, using=self.db)
+            node_filter_sql, node_filter_params = filter_sql(
+                self.model, node_filter, f"{edge_table}.{target_col}", using=self.db
+            )
+            sql = multi_source_traversal_sql(
+                edge_model,
+                sources_sql,
+                leafward=leafward,
+                per_source=per_source,
+                edge_filter_sql=edge_filter_sql,
+                node_filter_sql=node_filter_sql,
+                using=self.db,
+            )
+            params = multi_source_traversal_params(
+                sources_params,
+                max_depth=max_depth,
+                edge_filter_params=edge_filter_params,
+                node_filter_params=node_filter_params,
+            )
+            return sql, params
+
+        def _traversal_by_source(self, leafward=True, **kwargs) -> dict:
+            sql, params = self._traversal_sql(leafward=leafward, per_source=True, **kwargs)
+            rows = execute_statement(
+                f"SELECT * FROM ({sql}) AS traversal ORDER BY source_id, depth, node_id", params, using=self.db
+            )
+            mapping = {}
+            pk_field = self.model._meta.pk
+            for source_id, node_id, depth in rows:
+                mapping.setdefault(pk_field.to_python(source_id), {})[pk_field.to_python(node_id)] = depth
+            return mapping
+
+        def descendants(self, max_depth: int = None, edge_filter=None, node_filter=None):
+            """Returns a QuerySet of all nodes in connected paths in a leafward direction from any of these nodes.
+
+            The traversal is seeded with every node in this QuerySet and runs as a single query. Each node is
+            annotated with its shortest `traversal_depth` from any of the sources. Accepts the same arguments as
+            `Node.descendants()`.
+            """
+            sql, params = self._traversal_sql(
+                leafward=True, max_depth=max_depth, edge_filter=edge_filter, node_filter=node_filter
+            )
+            return join_traversal(self.model.objects.using(self.db), sql, params)
+
+        def ancestors(self, max_depth: int = None, edge_filter=None, node_filter=None):
+            """Returns a QuerySet of all nodes in connected paths in a rootward direction from any of these nodes.
+
+            See `descendants()`.
+            """
+            sql, params = self._traversal_sql(
+                leafward=False, max_depth=max_depth, edge_filter=edge_filter, node_filter=node_filter
+            )
+            return join_traversal(self.model.objects.using(self.db), sql, params)
+
+        def descendants_by_source(self, max_depth: int = None, edge_filter=None, node_filter=None) -> dict:
+            """Returns a mapping of {source_pk: {descendant_pk: depth}} for the nodes in this QuerySet.
+
+            Computed with a single query. Sources without descendants are omitted.
+            """
+            return self._traversal_by_source(
+                leafward=True, max_depth=max_depth, edge_filter=edge_filter, node_filter=node_filter
+            )
+
+        def ancestors_by_source(self, max_depth: int = None, edge_filter=None, node_filter=None) -> dict:
+            """Returns a mapping of {source_pk: {ancestor_pk: depth}} for the nodes in this QuerySet.
+
+            Computed with a single query. Sources without ancestors are omitted.
+            """
+            return self._traversal_by_source(
+                leafward=False, max_depth=max_depth, edge_filter=edge_filter, node_filter=node_filter
+            )
+
+    return NodeQuerySet
+
+
 def get_graph_aware_manager(config: GraphConfig):
     """Creates a manager that is aware of the current graph instance."""
 
     class GraphAwareManager(models.Manager):
-        """A Manager that is aware of the current graph instance."""
+        """A Manager that is aware of the current graph instance.
 
-        pass
-        # def get_queryset(self):
-        #     graph = get_current_graph_instance(graph_fullname=config.graph_fullname)
-        #     queryset = super().get_queryset().filter(graph=graph)
-        #     return queryset
+        Inside a `graph_scope`, QuerySets of models with a `graph` field (such as Edges) are limited to the current
+        Graph. Outside of one, every Graph is included.
+        """
+
+        def get_queryset(self):
+            queryset = super().get_queryset()
+            graph = get_current_graph_instance(graph_fullname=config.graph_fullname)
+            if graph is not None and any(field.name == "graph" for field in self.model._meta.concrete_fields):
+                queryset = queryset.filter(graph=graph)
+            return queryset
 
     return GraphAwareManager
 
@@ -101,7 +634,34 @@ def base_graph(config: GraphConfig):
             abstract = True
 
         def save(self, *args, **kwargs):
+            adding = self._state.adding
             super().save(*args, **kwargs)
+            if adding and config.edge_partitioning == "LIST":
+                create_graph_partition(get_model_class(config.edge_fullname), self.pk)
+
+        def delete(self, *args, **kwargs):
+            pk = self.pk
+            deleted = super().delete(*args, **kwargs)
+            if config.edge_partitioning == "LIST":
+                drop_graph_partition(get_model_class(config.edge_fullname), pk)
+            return deleted
+
+        def snapshot(self, chunk_size: int = SNAPSHOT_CHUNK_SIZE) -> GraphSnapshot:
+            """Returns an in-memory GraphSnapshot of this Graph's Edges, loaded with a single streamed query.
+
+            Useful when many traversals are made over the same Graph, as each is then answered without a query.
+            """
+            edge_model = get_model_class(config.edge_fullname)
+            return GraphSnapshot.from_queryset(edge_model.objects.filter(graph=self), chunk_size=chunk_size)
+
+        def export(self, file=None, format: str = None, **kwargs):
+            """Exports this Graph's Edges, and the Nodes they connect, as node-link JSON, GraphML, or DOT.
+
+            If a path or open file is provided, the export is written to it. Otherwise a generator of text is
+            returned. See `django_directed.exporting.export_graph` for the options.
+            """
+            edge_model = get_model_class(config.edge_fullname)
+            return edge_model.objects.filter(graph=self).export(file=file, format=format, **kwargs)
 
         def clean_fields(self, exclude=None):
             super().clean_fields(exclude=exclude)
@@ -112,7 +672,7 @@ def base_graph(config: GraphConfig):
     return AbstractGraph
 
 
-def base_edge(config: GraphConfig):
+def base_edge(config: GraphConfig):  # noqa: C901
     """Creates "Abstract Edge Model"."""
 
     class AbstractEdge(BaseEdge):
@@ -120,12 +680,14 @@ def base_edge(config: GraphConfig):
 
         graph = config.edge_graph_fk_field(
             to=config.graph_fullname,
-            null=True,
+            # A partitioned Edge table uses the Graph as its partition key, which must not be null
+            null=config.edge_partitioning is None,
             related_name="graph_edges",
             related_query_name="graph_edges",
             # related_name="%(app_label)s_%(class)s_related",
             # related_query_name="%(app_label)s_%(class)ss",
             graph_fullname=config.graph_fullname,
+            db_index=False,
         )
 
         parent = config.edge_parent_fk_field(
@@ -133,30 +695,103 @@ def base_edge(config: GraphConfig):
             related_name="child_edges",
             on_delete=models.SET_NULL,
             null=True,
+            db_index=False,
         )
         child = config.edge_child_fk_field(
             config.node_fullname,
             related_name="parent_edges",
             on_delete=models.SET_NULL,
             null=True,
+            db_index=False,
         )
 
         GraphAwareManager = get_graph_aware_manager(config)
-        GraphAwareQuerySet = get_graph_aware_queryset(config)
+        GraphAwareQuerySet = get_edge_queryset(config)
         CombinedGraphManager = GraphAwareManager.from_queryset(GraphAwareQuerySet)
         objects = CombinedGraphManager()
 
         class Meta:
             abstract = True
+            # One index per traversal direction, plus one per direction within a single Graph for traversals in a
+            # `graph_scope`. Each also serves lookups on its leading column alone, so the foreign keys do not get
+            # single-column indexes of their own.
+            indexes = [
+                models.Index(fields=["parent", "child"]),
+                models.Index(fields=["child", "parent"]),
+                models.Index(fields=["graph", "parent"]),
+                models.Index(fields=["graph", "child"]),
+            ]
+            # Identifies an Edge within its Graph, so that Edges can be upserted with `bulk_create`
+            if not config.allow_duplicate_edges:
+                constraints = [
+                    models.UniqueConstraint(
+                        fields=list(EDGE_UNIQUE_FIELDS), name="%(app_label)s_%(class)s_unique_edge"
+                    ),
+                ]
+
+        @classmethod
+        def bulk_checks(cls, graph_pk=None) -> list:
+            """Returns the Node checks which are run against candidate (parent_pk, child_pk) pairs in bulk.
+
+            `graph_pk` is the Graph the candidate Edges will belong to, against which duplicates are checked.
+            """
+            node_model = get_model_class(config.node_fullname)
+            checks = []
+            if not config.allow_duplicate_edges:
+                checks.append(functools.partial(node_model.bulk_duplicate_edge_check, graph_pk=graph_pk))
+            checks.append(node_model.bulk_children_quantity_check)
+            return checks
+
+        @classmethod
+        def bulk_check(cls, pairs: list, graph_pk=None):
+            """Runs each of the bulk checks, raising a single ValidationError listing every offending Edge."""
+            errors = []
+            for check in cls.bulk_checks(graph_pk):
+                try:
+                    check(pairs)
+                except ValidationError as err:
+                    errors.extend(err.error_list)
+            if errors:
+                raise ValidationError(errors)
 
         def save(self, *args, **kwargs):
+            # Within a graph_scope, a new Edge without a Graph belongs to the current Graph, as with bulk_create
+            if self.graph_id is None:
+                graph = get_current_graph_instance(graph_fullname=config.graph_fullname)
+                if graph is not None:
+                    self.graph = graph
+
             # Check for duplicate edges, if needed
             allow_duplicate_edges = config.allow_duplicate_edges
             if not allow_duplicate_edges:
-                self.parent.__class__.duplicate_edge_check(self.parent, self.child)
+                self.parent.__class__.duplicate_edge_check(self.parent, self.child, graph_pk=self.graph_id)
 
             self.parent.__class__.children_quantity_check(self.parent)  # ToDo: Needs fixing
-            super().save(*args, **kwargs)
+
+            bump_graph_version(config)
+            node_model = get_model_class(config.node_fullname)
+            if not node_model.tracks_edges():
+                super().save(*args, **kwargs)
+                return
+
+            # Keep the closure table (or other structures derived from the Edges) in step with the new Edge
+            adding = self._state.adding
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+                if adding and self.parent_id is not None and self.child_id is not None:
+                    node_model.on_edge_added(self.parent_id, self.child_id)
+
+        def delete(self, *args, **kwargs):
+            bump_graph_version(config)
+            node_model = get_model_class(config.node_fullname)
+            if not node_model.tracks_edges() or self.parent_id is None or self.child_id is None:
+                return super().delete(*args, **kwargs)
+
+            with transaction.atomic():
+                node_model.on_edge_removed(self.parent_id, self.child_id)
+                deleted = super().delete(*args, **kwargs)
+                node_model.on_edges_removed([self.child_id])
+                return deleted
 
         def clean_fields(self, exclude=None):
             super().clean_fields(exclude=exclude)
@@ -167,6 +802,44 @@ def base_edge(config: GraphConfig):
     return AbstractEdge
 
 
+def base_closure(config: GraphConfig):
+    """Creates "Abstract Closure Model"."""
+
+    class AbstractClosure(BaseClosure):
+        """Abstract Closure Model.
+
+        Each row records that `descendant` can be reached from `ancestor` in `depth` steps, and the number
+        of distinct `paths` of that length. Rows are maintained incrementally as Edges are added and removed.
+        """
+
+        ancestor = models.ForeignKey(
+            config.node_fullname,
+            related_name="descendant_closures",
+            on_delete=models.CASCADE,
+        )
+        descendant = models.ForeignKey(
+            config.node_fullname,
+            related_name="ancestor_closures",
+            on_delete=models.CASCADE,
+        )
+        depth = models.PositiveIntegerField()
+        paths = models.PositiveBigIntegerField(default=1)
+
+        class Meta:
+            abstract = True
+            constraints = [
+                models.UniqueConstraint(
+                    fields=["ancestor", "descendant", "depth"],
+                    name="%(app_label)s_%(class)s_unique_path",
+                ),
+            ]
+            indexes = [
+                models.Index(fields=["descendant", "ancestor", "depth"]),
+            ]
+
+    return AbstractClosure
+
+
 def base_node(config: GraphConfig):  # noqa: C901
     """Creates "Abstract Node Model"."""
 
@@ -185,10 +858,15 @@ def base_node(config: GraphConfig):  # noqa: C901
         def edge_table(self):
             return self.edge_class()._meta.db_table
 
+        def closure_class(self):
+            if config.closure_fullname is None:
+                return None
+            return get_model_class(config.closure_fullname)
+
         children_blank_null = config.children_blank_null
 
         GraphAwareManager = get_graph_aware_manager(config)
-        GraphAwareQuerySet = get_graph_aware_queryset(config)
+        GraphAwareQuerySet = get_node_queryset(config)
         CombinedGraphManager = GraphAwareManager.from_queryset(GraphAwareQuerySet)
         objects = CombinedGraphManager()
 
@@ -204,6 +882,15 @@ def base_node(config: GraphConfig):  # noqa: C901
             related_name="parents",
         )
 
+        if config.degree_counters:
+            # Numbers of Edges leading to and from this Node, maintained as Edges are added or removed
+            in_degree = models.PositiveIntegerField(default=0, editable=False, db_index=True)
+            out_degree = models.PositiveIntegerField(default=0, editable=False, db_index=True)
+
+        if config.depth_counter:
+            # Length of the longest path to this Node from any root Node, maintained as Edges are added or removed
+            depth = models.PositiveIntegerField(default=0, editable=False, db_index=True)
+
         def get_foreign_key_field(self, fk_instance=None):
             """Provided a model instance, checks if the edge model has a ForeignKey field to the model class of that instance.
 
@@ -261,12 +948,7 @@ def base_node(config: GraphConfig):  # noqa: C901
 
         def add_children(self, children: models.QuerySet, **kwargs) -> list:
             """Provided with a QuerySet of Node instances, attaches those instances as children of the current Node instance."""
-            edge_list = []
-            for child in children:
-                if child is not None:
-                    edge_list.append(self.add_child(child))
-
-            return edge_list
+            return self.edge_class().objects.bulk_add([(self, child) for child in children], **kwargs)
 
         def add_parent(self, parent: BaseNode, **kwargs):
             """Provided with a Node instance, attaches that instance as a parent to the current Node instance."""
@@ -274,37 +956,85 @@ def base_node(config: GraphConfig):  # noqa: C901
 
         def add_parents(self, parents: models.QuerySet, **kwargs) -> list:
             """Provided with a QuerySet of Node instances, attaches those instances as parents of the current Node instance."""
-            edge_list = []
-            for parent in parents:
-                edge_list.append(parent.add_child(child=self, **kwargs))
+            return self.edge_class().objects.bulk_add([(parent, self) for parent in parents], **kwargs)
 
-            return edge_list
+        def _remove_edges(self, leafward: bool = True, nodes=None, delete_nodes: bool = False) -> bool:
+            """Removes the Edges between this Node and the provided Nodes (or all of its children or parents).
+
+            The matching Edges are fetched and deleted with one query each, and the counters (if configured) are
+            updated with a constant number of queries per batch of Nodes. The closure table and tree paths (if
+            configured) are still updated once per Edge, and with `delete_nodes` the other Nodes are deleted with one
+            query, or one at a time if any structure derived from the Edges must be updated. A single
+            `children_removed` signal is sent for the batch. Returns True if every provided Node was removed.
+            """
+            edge_model = self.edge_class()
+            node_model = self.node_class()
+            own_field, other_field = ("parent", "child") if leafward else ("child", "parent")
+            edges = edge_model.objects.filter(**{own_field: self, f"{other_field}__isnull": False})
+
+            requested = None
+            if nodes is not None:
+                if isinstance(nodes, models.QuerySet):
+                    requested = set(nodes.values_list("pk", flat=True))
+                else:
+                    requested = {getattr(node, "pk", node) for node in nodes if node is not None}
+                edges = edges.filter(**{f"{other_field}__in": requested})
+
+            pairs = list(edges.order_by().values_list("parent_id", "child_id"))
+            removed = {child_pk if leafward else parent_pk for parent_pk, child_pk in pairs}
+            if pairs:
+                bump_graph_version(config)
+                with transaction.atomic():
+                    if self.tracks_edges():
+                        self.on_edges_removing(pairs)
+                    edges.delete()
+
+                    if delete_nodes:
+                        removed_nodes = node_model.objects.filter(pk__in=removed)
+                        if self.tracks_edges():
+                            # Each Node's other Edges must also be removed from the derived structures
+                            for node in removed_nodes:
+                                node.delete()
+                        else:
+                            removed_nodes.delete()
+
+                    if self.tracks_edges():
+                        self.on_edges_removed({child_pk for _, child_pk in pairs})
+
+                children_removed.send(
+                    sender=node_model,
+                    pairs=pairs,
+                    nodes_deleted=delete_nodes,
+                    graph_fullname=config.graph_fullname,
+                )
+
+            all_successful = requested is None or requested <= removed
+            if not all_successful:
+                logger.debug("One or more Nodes could not be removed")
+            return all_successful
 
         def remove_child(self, child: BaseNode = None, delete_node: bool = False):
             """Removes the edge connecting this node to the child Node specified.
 
             Optionally deletes the child node as well.
             """
-            if child is not None and child in self.children.all():
-                self.children.through.objects.filter(parent=self, child=child).delete()
-                if delete_node:
-                    # Note: Per django docs:
-                    # https://docs.djangoproject.com/en/dev/ref/models/instances/#deleting-objects
-                    # This only deletes the object in the database; the Python instance will still
-                    # exist and will still have data in its fields.
-                    child_id = child.pk
-                    child.delete()
-                    child_removed.send(
-                        sender=self.__class__,
-                        child_id=child_id,
-                        parent_id=self.pk,
-                        graph_fullname=config.graph_fullname,
-                    )
-                return True
-            logger.debug(
-                "Argument `child` in `Node.remove_child()` was not provided or was not a child of the current Node."
-            )
-            return False
+            if child is None or not self._remove_edges(leafward=True, nodes=[child], delete_nodes=delete_node):
+                logger.debug(
+                    "Argument `child` in `Node.remove_child()` was not provided or was not a child of the current Node."
+                )
+                return False
+            if delete_node:
+                # Note: Per django docs:
+                # https://docs.djangoproject.com/en/dev/ref/models/instances/#deleting-objects
+                # This only deletes the object in the database; the Python instance will still
+                # exist and will still have data in its fields.
+                child_removed.send(
+                    sender=self.__class__,
+                    child_id=child.pk,
+                    parent_id=self.pk,
+                    graph_fullname=config.graph_fullname,
+                )
+            return True
 
         def remove_children(
             self,
@@ -318,85 +1048,783 @@ def base_node(config: GraphConfig):  # noqa: C901
             Optionally deletes the child(ren) node(s) as well.
             """
             if children is not None:
-                return self._remove_specified_children(children, delete_nodes)
+                return self._remove_edges(leafward=True, nodes=children, delete_nodes=delete_nodes)
             elif remove_all:
-                return self._remove_all_children(delete_nodes)
+                return self._remove_edges(leafward=True, delete_nodes=delete_nodes)
             else:
                 logger.warning(
                     "`Node.remove_children` should receive an argument for `children` or `remove_all`. No action taken."
                 )
                 return False
 
-        def _remove_specified_children(self, children, delete_nodes):
-            """Helper function to remove specified children."""
-            all_successful = all(self.remove_child(child=child, delete_node=delete_nodes) for child in children.all())
-            if not all_successful:
-                logger.debug("One or more children could not be removed")
-            return all_successful
+        def remove_parent(self, parent: BaseNode = None, delete_node: bool = False):
+            """Removes the edge connecting the parent Node specified to this node.
 
-        def _remove_all_children(self, delete_nodes):
-            """Helper function to remove all children."""
-            all_successful = all(
-                self.remove_child(child=child, delete_node=delete_nodes) for child in self.children.all()
-            )
-            if not all_successful:
-                logger.debug("One or more children could not be removed")
-            return all_successful
+            Optionally deletes the parent node as well.
+            """
+            if parent is None or not self._remove_edges(leafward=False, nodes=[parent], delete_nodes=delete_node):
+                logger.debug(
+                    "Argument `parent` in `Node.remove_parent()` was not provided or was not a parent of the current "
+                    "Node."
+                )
+                return False
+            return True
+
+        def remove_parents(
+            self,
+            parents: models.QuerySet = None,
+            remove_all: bool = False,
+            delete_nodes: bool = False,
+        ):
+            """Removes the edge connecting each parent specified to this node.
+
+            If no parents are specified, removes the edges connecting to all parents.
+            Optionally deletes the parent node(s) as well.
+            """
+            if parents is not None:
+                return self._remove_edges(leafward=False, nodes=parents, delete_nodes=delete_nodes)
+            elif remove_all:
+                return self._remove_edges(leafward=False, delete_nodes=delete_nodes)
+            else:
+                logger.warning(
+                    "`Node.remove_parents` should receive an argument for `parents` or `remove_all`. No action taken."
+                )
+                return False
 
         # Pulled from django-postgresql-dag (may need to be moved)
 
-        def raw_queryset(self):
-            QUERY = """
-            WITH RECURSIVE traverse({pk_name}, depth) AS (
-                SELECT first.child_id, 1
-                    FROM {relationship_table} AS first
-                    LEFT OUTER JOIN {relationship_table} AS second
-                    ON first.child_id = second.parent_id
-                WHERE first.parent_id = {pk}
-            UNION
-                SELECT DISTINCT child_id, traverse.depth + 1
-                    FROM traverse
-                    INNER JOIN {relationship_table}
-                    ON {relationship_table}.parent_id = traverse.{pk_name}
-                WHERE 1=1
-            )
-            SELECT {pk_name} FROM traverse
-            WHERE depth <= {max_depth}
-            GROUP BY {pk_name}
-            ORDER BY MAX(depth), {pk_name} ASC
-            """
-
-            return self.node_class().objects.raw(
-                QUERY.format(
-                    relationship_table=self.edge_table(),
-                    pk_name=self.get_pk_name(),
-                    pk=self.pk,
-                    max_depth=100,
-                ),
+        def _read_db(self) -> str:
+            """Returns the alias of the database which traversals from this node read from."""
+            return router.db_for_read(self.__class__, instance=self)
+
+        def _traversal_cacheable(self, edge_filter=None, node_filter=None) -> bool:
+            """Returns True if a traversal with the provided filters can be served from the traversal cache."""
+            return (
+                config.cache_alias is not None
+                and not edge_filter
+                and not node_filter
+                and not graph_scoped(config)
+                and rows_traversal_supported(using=self._read_db())
+            )
+
+        def _cached_traversal_rows(self, leafward: bool = True, include_self: bool = False, max_depth: int = None):
+            """Returns the `(node_id, depth)` rows of an unfiltered traversal, from the traversal cache if present."""
+
+            def fetch_rows():
+                sql, params = self._query_traversal_sql(
+                    leafward=leafward, include_self=include_self, max_depth=max_depth
+                )
+                rows = execute_statement(rows_sql(sql), params, prepare=config.prepared_statements, using=using)
+                return [tuple(row) for row in rows]
+
+            using = self._read_db()
+            return cached(config, ("traversal", using, self.pk, leafward, include_self, max_depth), fetch_rows)
+
+        @classmethod
+        def invalidate_traversal_cache(cls):
+            """Invalidates all cached traversals of this graph."""
+            bump_graph_version(config)
+
+        def _traversal_sql(
+            self,
+            leafward: bool = True,
+            include_self: bool = False,
+            max_depth: int = None,
+            edge_filter=None,
+            node_filter=None,
+        ):
+            """Returns the SQL and params for a `(node_id, depth)` subquery of the nodes reachable from this node.
+
+            Unfiltered traversals are read from the traversal cache when one is configured.
+            """
+            if self._traversal_cacheable(edge_filter, node_filter):
+                rows = self._cached_traversal_rows(leafward=leafward, include_self=include_self, max_depth=max_depth)
+                return rows_traversal_sql(self.node_class(), using=self._read_db()), rows_traversal_params(rows)
+            return self._query_traversal_sql(
+                leafward=leafward,
+                include_self=include_self,
+                max_depth=max_depth,
+                edge_filter=edge_filter,
+                node_filter=node_filter,
+            )
+
+        def _query_traversal_sql(
+            self,
+            leafward: bool = True,
+            include_self: bool = False,
+            max_depth: int = None,
+            edge_filter=None,
+            node_filter=None,
+        ):
+            """Returns the SQL and params for a `(node_id, depth)` subquery which walks the graph in the database.
+
+            Reads from the closure table if one is configured and no filters are provided, otherwise uses a
+            recursive query over the edges with any filters applied while the graph is walked.
+            """
+            using = self._read_db()
+            if config.closure_fullname is not None and not edge_filter and not node_filter and not graph_scoped(config):
+                sql = closure_traversal_sql(
+                    self.closure_class(),
+                    leafward=leafward,
+                    include_self=include_self,
+                    limit_depth=max_depth is not None,
+                    using=using,
+                )
+                params = closure_traversal_params(
+                    db_pk(self.__class__, self.pk, using), include_self=include_self, max_depth=max_depth
+                )
+                return sql, params
+
+            edge_model = self.edge_class()
+            qn = connections[using].ops.quote_name
+            edge_table = qn(edge_model._meta.db_table)
+            target_col = qn(edge_model._meta.get_field("child" if leafward else "parent").column)
+            edge_filter_sql, edge_filter_params = scoped_edge_filter_sql(config, edge_model, edge_filter, using=using)
+            node_filter_sql, node_filter_params = filter_sql(
+                self.node_class(), node_filter, f"{edge_table}.{target_col}", using=using
+            )
+            sql = recursive_traversal_sql(
+                edge_model,
+                leafward=leafward,
+                include_self=include_self,
+                edge_filter_sql=edge_filter_sql,
+                node_filter_sql=node_filter_sql,
+                using=using,
+            )
+            params = recursive_traversal_params(
+                db_pk(self.__class__, self.pk, using),
+                max_depth=max_depth,
+                edge_filter_params=edge_filter_params,
+                node_filter_params=node_filter_params,
+            )
+            return sql, params
+
+        def _traversal_queryset(self, leafward: bool = True, include_self: bool = False, **kwargs):
+            """Returns a QuerySet of the nodes reachable from this node, joined to their depth and ordered by it."""
+            sql, params = self._traversal_sql(leafward=leafward, include_self=include_self, **kwargs)
+            return join_traversal(self.__class__.objects.using(self._read_db()), sql, params)
+
+        def _traversal_count(self, leafward: bool = True, max_depth: int = None, edge_filter=None, node_filter=None):
+            """Returns the number of nodes reachable from this node, not including this node."""
+            if self._traversal_cacheable(edge_filter, node_filter):
+                return len(self._cached_traversal_rows(leafward=leafward, max_depth=max_depth))
+            if config.closure_fullname is not None and not edge_filter and not node_filter and not graph_scoped(config):
+                source, target = ("ancestor", "descendant") if leafward else ("descendant", "ancestor")
+                closures = self.closure_class().objects.using(self._read_db()).filter(**{source: self})
+                if max_depth is not None:
+                    closures = closures.filter(depth__lte=max_depth)
+                return closures.values(target).distinct().count()
+            sql, params = self._traversal_sql(
+                leafward=leafward, max_depth=max_depth, edge_filter=edge_filter, node_filter=node_filter
+            )
+            rows = execute_statement(count_sql(sql), params, prepare=config.prepared_statements, using=self._read_db())
+            return rows[0][0]
+
+        def raw_queryset(self, leafward: bool = True, max_depth: int = None, edge_filter=None, node_filter=None):
+            """Returns a RawQuerySet of the pks of all nodes in connected paths in the specified direction."""
+            sql, params = self._traversal_sql(
+                leafward=leafward, max_depth=max_depth, edge_filter=edge_filter, node_filter=node_filter
+            )
+            using = self._read_db()
+            QUERY = f"""
+            SELECT traversal.node_id AS {connections[using].ops.quote_name(self.get_pk_name())}
+            FROM ({sql}) AS traversal
+            ORDER BY traversal.depth, traversal.node_id
+            """
+            return self.node_class().objects.raw(QUERY, params, using=using)
+
+        def ancestors_raw(self, **kwargs):
+            """Returns a raw QuerySet of all nodes in connected paths in a rootward direction.
+
+            Accepts the same `max_depth`, `edge_filter`, and `node_filter` arguments as `ancestors()`.
+            """
+            return self.raw_queryset(leafward=False, **kwargs)
+
+        def ancestors(self, max_depth: int = None, edge_filter=None, node_filter=None):
+            """Returns a QuerySet of all nodes in connected paths in a rootward direction.
+
+            Accepts the same `max_depth`, `edge_filter`, and `node_filter` arguments as `descendants()`.
+            """
+            return self._traversal_queryset(
+                leafward=False, max_depth=max_depth, edge_filter=edge_filter, node_filter=node_filter
             )
 
+        def ancestors_count(self, max_depth: int = None, edge_filter=None, node_filter=None):
+            """Returns an integer number representing the total number of ancestor nodes."""
+            return self._traversal_count(
+                leafward=False, max_depth=max_depth, edge_filter=edge_filter, node_filter=node_filter
+            )
+
+        def self_and_ancestors(self, max_depth: int = None, edge_filter=None, node_filter=None):
+            """Returns a QuerySet of all nodes in connected paths in a rootward direction, prepending with self."""
+            return self._traversal_queryset(
+                leafward=False, include_self=True, max_depth=max_depth, edge_filter=edge_filter, node_filter=node_filter
+            )
+
+        def ancestors_and_self(self, max_depth: int = None, edge_filter=None, node_filter=None):
+            """Returns a QuerySet of all nodes in connected paths in a rootward direction, appending with self."""
+            return self.self_and_ancestors(
+                max_depth=max_depth, edge_filter=edge_filter, node_filter=node_filter
+            ).order_by(Case(When(pk=self.pk, then=1), default=0), "-traversal_depth", "pk")
+
         def descendants_raw(self, **kwargs):
-            """Returns a raw QuerySet of all nodes in connected paths in a leafward direction."""
-            return self.raw_queryset()
+            """Returns a raw QuerySet of all nodes in connected paths in a leafward direction.
 
-        def descendants(self, **kwargs):
-            """Returns a QuerySet of all nodes in connected paths in a leafward direction."""
-            pks = [item.pk for item in self.descendants_raw(**kwargs)]
-            return self.ordered_queryset_from_pks(pks)
+            Accepts the same `max_depth`, `edge_filter`, and `node_filter` arguments as `descendants()`.
+            """
+            return self.raw_queryset(leafward=True, **kwargs)
 
-        def descendants_count(self):
+        def descendants(self, max_depth: int = None, edge_filter=None, node_filter=None):
+            """Returns a QuerySet of all nodes in connected paths in a leafward direction.
+
+            `max_depth` limits how many edges are followed. `edge_filter` and `node_filter` (a Q object or dict of
+            lookups against the Edge or Node model) prune the traversal: edges and nodes which do not match are
+            not followed.
+            """
+            return self._traversal_queryset(
+                leafward=True, max_depth=max_depth, edge_filter=edge_filter, node_filter=node_filter
+            )
+
+        def descendants_count(self, max_depth: int = None, edge_filter=None, node_filter=None):
             """Returns an integer number representing the total number of descendant nodes."""
-            return self.descendants().count()
+            return self._traversal_count(
+                leafward=True, max_depth=max_depth, edge_filter=edge_filter, node_filter=node_filter
+            )
 
-        def self_and_descendants(self, **kwargs):
+        def self_and_descendants(self, max_depth: int = None, edge_filter=None, node_filter=None):
             """Returns a QuerySet of all nodes in connected paths in a leafward direction, prepending with self."""
-            pks = [self.pk] + [item.pk for item in self.descendants_raw(**kwargs)]
-            return self.ordered_queryset_from_pks(pks)
+            return self._traversal_queryset(
+                leafward=True, include_self=True, max_depth=max_depth, edge_filter=edge_filter, node_filter=node_filter
+            )
 
-        def descendants_and_self(self, **kwargs):
+        def descendants_and_self(self, max_depth: int = None, edge_filter=None, node_filter=None):
             """Returns a QuerySet of all nodes in connected paths in a leafward direction, appending with self."""
-            pks = [item.pk for item in self.descendants_raw(**kwargs)] + [self.pk]
-            return self.ordered_queryset_from_pks(pks)
+            return self.self_and_descendants(
+                max_depth=max_depth, edge_filter=edge_filter, node_filter=node_filter
+            ).order_by(Case(When(pk=self.pk, then=1), default=0), "traversal_depth", "pk")
+
+        def subgraph(self, direction: str = "descendants", max_depth: int = None, edge_filter=None, node_filter=None):
+            """Returns a Subgraph of this node, its descendants and/or ancestors, and every Edge between them.
+
+            `direction` is "descendants", "ancestors", or "both". Nodes are fetched with one traversal query per
+            direction, and the induced Edges with one further query. Nodes are ordered by depth, with ancestors
+            (which have negative depths) first. Accepts the same `max_depth`, `edge_filter`, and `node_filter`
+            arguments as `descendants()`.
+            """
+            if direction not in SUBGRAPH_DIRECTIONS:
+                raise ValueError(f"direction must be one of: {', '.join(SUBGRAPH_DIRECTIONS)}")
+            kwargs = {"max_depth": max_depth, "edge_filter": edge_filter, "node_filter": node_filter}
+            traversals = []
+            if direction in ("ancestors", "both"):
+                traversals.append((-1, self.self_and_ancestors(**kwargs)))
+            if direction in ("descendants", "both"):
+                traversals.append((1, self.self_and_descendants(**kwargs)))
+
+            depths, nodes = {}, []
+            for sign, queryset in traversals:
+                for node in queryset:
+                    if node.pk not in depths:
+                        depths[node.pk] = sign * node.traversal_depth
+                        nodes.append(node)
+            nodes.sort(key=lambda node: (depths[node.pk], node.pk))
+
+            node_pks = Q()
+            for _, queryset in traversals:
+                node_pks |= Q(pk__in=queryset.order_by().values("pk"))
+            edge_model = self.edge_class()
+            node_subquery = self.__class__.objects.filter(node_pks).values("pk")
+            edges = edge_model.objects.filter(parent__in=node_subquery, child__in=node_subquery)
+            if edge_filter:
+                edges = edges.filter(edge_filter if isinstance(edge_filter, Q) else Q(**edge_filter))
+            pairs = list(edges.order_by("parent", "child").values_list("parent_id", "child_id"))
+            return Subgraph(
+                nodes,
+                pairs,
+                depths,
+                node_model=self.__class__,
+                edge_model=edge_model,
+                multigraph=config.allow_duplicate_edges,
+            )
+
+        def _iter_traversal(self, leafward: bool = True, chunk_size: int = STREAM_CHUNK_SIZE, pks_only=False, **kwargs):
+            """Yields the nodes (or pks) reachable from this node lazily, in depth order, in chunks."""
+            if not pks_only:
+                yield from self._traversal_queryset(leafward=leafward, **kwargs).iterator(chunk_size=chunk_size)
+                return
+            sql, params = self._traversal_sql(leafward=leafward, **kwargs)
+            for row in stream_statement(ordered_pks_sql(sql), params, chunk_size=chunk_size, using=self._read_db()):
+                yield self._meta.pk.to_python(row[0])
+
+        def iter_descendants(self, chunk_size: int = STREAM_CHUNK_SIZE, pks_only: bool = False, **kwargs):
+            """Yields all nodes in connected paths in a leafward direction, in depth order, without loading them all.
+
+            Rows are fetched `chunk_size` at a time, using a server-side cursor where the database supports one.
+            If `pks_only` is True, yields pks read directly from the traversal, without fetching the nodes.
+            Accepts the same `max_depth`, `edge_filter`, and `node_filter` arguments as `descendants()`.
+            """
+            return self._iter_traversal(leafward=True, chunk_size=chunk_size, pks_only=pks_only, **kwargs)
+
+        def iter_ancestors(self, chunk_size: int = STREAM_CHUNK_SIZE, pks_only: bool = False, **kwargs):
+            """Yields all nodes in connected paths in a rootward direction, in depth order, without loading them all.
+
+            See `iter_descendants()`.
+            """
+            return self._iter_traversal(leafward=False, chunk_size=chunk_size, pks_only=pks_only, **kwargs)
+
+        def roots(self):
+            """Returns a QuerySet of the ancestor nodes which have no parents, ordered by distance from this node."""
+            return self.ancestors().roots()
+
+        def leaves(self):
+            """Returns a QuerySet of the descendant nodes which have no children, ordered by distance from this node."""
+            return self.descendants().leaves()
+
+        @classmethod
+        def reachable(cls, source_pk, target_pk, bidirectional: bool = None) -> bool:
+            """Returns True if a path of one or more Edges leads from the source Node to the target Node.
+
+            Uses the closure table if one is configured. Otherwise `bidirectional` (which defaults to the
+            `bidirectional_reachability` config value) selects between a single query which stops as soon as the
+            target is found, and a search from both ends at once which expands the smaller frontier first. Within a
+            `graph_scope`, only the current Graph's Edges are followed.
+            """
+            graph = get_current_graph_instance(graph_fullname=config.graph_fullname)
+            return cls._reachable(source_pk, target_pk, bidirectional=bidirectional, graph=graph)
+
+        @classmethod
+        def _reachable(cls, source_pk, target_pk, bidirectional: bool = None, graph=None) -> bool:
+            """Returns True if a path leads from the source Node to the target Node in `graph`, or in any Graph."""
+            using = router.db_for_read(cls)
+            if config.closure_fullname is not None and graph is None:
+                closure_model = get_model_class(config.closure_fullname)
+                return closure_model.objects.using(using).filter(ancestor=source_pk, descendant=target_pk).exists()
+
+            edge_model = get_model_class(config.edge_fullname)
+            if bidirectional is None:
+                bidirectional = config.bidirectional_reachability
+            if bidirectional:
+                return bidirectional_reachable(edge_model, source_pk, target_pk, graph=graph, using=using)
+            scope_sql, scope_params = graph_filter_sql(edge_model, graph, using=using)
+            rows = execute_statement(
+                reachability_sql(edge_model, edge_filter_sql=scope_sql, using=using),
+                [
+                    db_pk(cls, source_pk, using),
+                    *scope_params,
+                    db_pk(cls, target_pk, using),
+                    *scope_params,
+                    db_pk(cls, target_pk, using),
+                ],
+                prepare=config.prepared_statements,
+                using=using,
+            )
+            return bool(rows[0][0])
+
+        def is_ancestor_of(self, target_node: BaseNode, bidirectional: bool = None) -> bool:
+            """Returns True if this Node is an ancestor of the target Node."""
+            return self.reachable(self.pk, target_node.pk, bidirectional=bidirectional)
+
+        def is_descendant_of(self, target_node: BaseNode, bidirectional: bool = None) -> bool:
+            """Returns True if this Node is a descendant of the target Node."""
+            return self.reachable(target_node.pk, self.pk, bidirectional=bidirectional)
+
+        # Path queries
+
+        @classmethod
+        def _paths(
+            cls, source_pk, target_pk, shortest: bool = True, max_depth=None, edge_filter=None, node_filter=None
+        ):
+            """Returns the paths from the source Node to the target Node, each as a list of pks, in order of length.
+
+            If `shortest` is True, returns only one shortest path (see `shortest_path_sql`).
+            """
+            using = router.db_for_read(cls)
+            edge_model = get_model_class(config.edge_fullname)
+            qn = connections[using].ops.quote_name
+            edge_table = qn(edge_model._meta.db_table)
+            edge_filter_sql, edge_filter_params = scoped_edge_filter_sql(config, edge_model, edge_filter, using=using)
+            node_filter_sql, node_filter_params = filter_sql(
+                cls, node_filter, f"{edge_table}.{qn(edge_model._meta.get_field('child').column)}", using=using
+            )
+            sql = paths_sql(
+                edge_model,
+                shortest=shortest,
+                edge_filter_sql=edge_filter_sql,
+                node_filter_sql=node_filter_sql,
+                using=using,
+            )
+            params = paths_params(
+                db_pk(cls, source_pk, using),
+                db_pk(cls, target_pk, using),
+                max_depth=max_depth,
+                edge_filter_params=edge_filter_params,
+                node_filter_params=node_filter_params,
+                shortest=shortest,
+            )
+            rows = execute_statement(sql, params, prepare=config.prepared_statements, using=using)
+            return [parse_path(row[0], cls._meta.pk) for row in rows]
+
+        @classmethod
+        def shortest_path_pks(cls, source_pk, target_pk, bidirectional: bool = None, **kwargs):
+            """Returns the pks along a shortest path from the source Node to the target Node, or None if there is none.
+
+            `bidirectional` (which defaults to the `bidirectional_reachability` config value) selects between a
+            single breadth-first recursive query which keeps each Node once per depth, and a search from both ends at
+            once. Accepts the same `max_depth`, `edge_filter`, and `node_filter` arguments as `descendants()`, though
+            filters always use the single query.
+            """
+            if source_pk == target_pk:
+                return [source_pk]
+            if bidirectional is None:
+                bidirectional = config.bidirectional_reachability
+            if bidirectional and not kwargs.get("edge_filter") and not kwargs.get("node_filter"):
+                edge_model = get_model_class(config.edge_fullname)
+                return bidirectional_shortest_path(
+                    edge_model, source_pk, target_pk, max_depth=kwargs.get("max_depth"), using=router.db_for_read(cls)
+                )
+            paths = cls._paths(source_pk, target_pk, shortest=True, **kwargs)
+            return paths[0] if paths else None
+
+        def _directional_path_pks(self, target_node: BaseNode, directional: bool = True, **kwargs) -> list:
+            """Returns the pks along a shortest path to the target Node, or from it if `directional` is False."""
+            pks = self.shortest_path_pks(self.pk, target_node.pk, **kwargs)
+            if pks is None and not directional:
+                pks = self.shortest_path_pks(target_node.pk, self.pk, **kwargs)
+            if pks is None:
+                raise NodeNotReachableError(f"There is no path between {self} and {target_node}")
+            return pks
+
+        def shortest_path(self, target_node: BaseNode, directional: bool = True, **kwargs):
+            """Returns a QuerySet of the nodes along a shortest path from this node to the target node, in order.
+
+            If `directional` is False and there is no such path, a path from the target node to this node is
+            returned instead, still ordered leafward. Raises NodeNotReachableError if there is no path. Accepts the
+            same arguments as `shortest_path_pks()`.
+            """
+            pks = self._directional_path_pks(target_node, directional=directional, **kwargs)
+            return _ordered_filter(self.__class__.objects, "pk", pks)
+
+        def distance(self, target_node: BaseNode, directional: bool = True, **kwargs) -> int:
+            """Returns the number of Edges along a shortest path from this node to the target node.
+
+            Reads from the closure table if one is configured and no filters are provided. See `shortest_path()`.
+            """
+            if (
+                config.closure_fullname is not None
+                and not kwargs.get("edge_filter")
+                and not kwargs.get("node_filter")
+                and not graph_scoped(config)
+            ):
+                if self.pk == target_node.pk:
+                    return 0
+                closures = self.closure_class().objects.filter(ancestor=self, descendant=target_node)
+                if not directional:
+                    closures = closures | self.closure_class().objects.filter(ancestor=target_node, descendant=self)
+                if kwargs.get("max_depth") is not None:
+                    closures = closures.filter(depth__lte=kwargs["max_depth"])
+                depth = closures.aggregate(distance=Min("depth"))["distance"]
+                if depth is None:
+                    raise NodeNotReachableError(f"There is no path between {self} and {target_node}")
+                return depth
+            return len(self._directional_path_pks(target_node, directional=directional, **kwargs)) - 1
+
+        def all_paths(
+            self,
+            target_node: BaseNode,
+            directional: bool = True,
+            max_depth: int = None,
+            edge_filter=None,
+            node_filter=None,
+        ) -> list:
+            """Returns every path from this node to the target node, as lists of nodes ordered by length.
+
+            Paths are found with a single recursive query, and their nodes fetched with one more. If `directional`
+            is False and there are no such paths, the paths from the target node to this node are returned instead.
+            `max_depth` limits the length of the paths, and should be kept low on densely connected graphs, where
+            the number of paths grows very quickly.
+            """
+            kwargs = {"max_depth": max_depth, "edge_filter": edge_filter, "node_filter": node_filter}
+            paths = self._paths(self.pk, target_node.pk, shortest=False, **kwargs)
+            if not paths and not directional:
+                paths = self._paths(target_node.pk, self.pk, shortest=False, **kwargs)
+            nodes = self.__class__.objects.in_bulk({pk for path in paths for pk in path})
+            return [[nodes[pk] for pk in path] for path in paths]
+
+        # Async
+        #   Django does not yet provide async database cursors, so, as with Django's own async QuerySet methods,
+        #   each of these runs its queries in a worker thread with `sync_to_async`, leaving the event loop free.
+
+        async def adescendants(self, **kwargs) -> list:
+            """Returns a list of all nodes in connected paths in a leafward direction. See `descendants()`."""
+            return await sync_to_async(lambda: list(self.descendants(**kwargs)))()
+
+        async def aancestors(self, **kwargs) -> list:
+            """Returns a list of all nodes in connected paths in a rootward direction. See `ancestors()`."""
+            return await sync_to_async(lambda: list(self.ancestors(**kwargs)))()
+
+        async def adescendants_count(self, **kwargs) -> int:
+            """Returns the number of descendant nodes. See `descendants_count()`."""
+            return await sync_to_async(self.descendants_count)(**kwargs)
+
+        async def aancestors_count(self, **kwargs) -> int:
+            """Returns the number of ancestor nodes. See `ancestors_count()`."""
+            return await sync_to_async(self.ancestors_count)(**kwargs)
+
+        async def aadd_child(self, child: BaseNode, **kwargs):
+            """Async version of `add_child()`."""
+            return await sync_to_async(self.add_child)(child, **kwargs)
+
+        async def aadd_children(self, children, **kwargs) -> list:
+            """Async version of `add_children()`."""
+            return await sync_to_async(self.add_children)(children, **kwargs)
+
+        async def aremove_child(self, child: BaseNode = None, delete_node: bool = False):
+            """Async version of `remove_child()`."""
+            return await sync_to_async(self.remove_child)(child=child, delete_node=delete_node)
+
+        async def aremove_children(self, children=None, **kwargs):
+            """Async version of `remove_children()`."""
+            return await sync_to_async(self.remove_children)(children, **kwargs)
+
+        # Structures derived from the Edges, such as the closure table
+
+        @classmethod
+        def tracks_edges(cls) -> bool:
+            """Returns True if any structure derived from the Edges must be updated as Edges are added or removed."""
+            return config.closure_fullname is not None or config.degree_counters or config.depth_counter
+
+        @classmethod
+        def on_edge_added(cls, parent_pk, child_pk, quantity: int = 1):
+            """Updates the structures derived from the Edges after a parent -> child Edge is added."""
+            if config.closure_fullname is not None:
+                cls.closure_add_edge(parent_pk, child_pk, quantity=quantity)
+            if config.degree_counters:
+                cls.update_degrees(parent_pk, child_pk, quantity)
+            if config.depth_counter:
+                cls.deepen(parent_pk, child_pk)
+
+        @classmethod
+        def on_edge_removed(cls, parent_pk, child_pk, quantity: int = 1):
+            """Updates the structures derived from the Edges before a parent -> child Edge is removed."""
+            if config.closure_fullname is not None:
+                cls.closure_remove_edge(parent_pk, child_pk, quantity=quantity)
+            if config.degree_counters:
+                cls.update_degrees(parent_pk, child_pk, -quantity)
+
+        @classmethod
+        def on_edges_added(cls, pairs):
+            """Updates the structures derived from the Edges after a batch of parent -> child Edges is added.
+
+            The counters are updated with a constant number of queries per batch of Nodes, while the closure table
+            (if any) is still updated once per Edge.
+            """
+            if config.closure_fullname is not None:
+                for parent_pk, child_pk in pairs:
+                    cls.closure_add_edge(parent_pk, child_pk)
+            if config.degree_counters:
+                cls.bulk_update_degrees(pairs)
+            if config.depth_counter:
+                cls.bulk_deepen(pairs)
+
+        @classmethod
+        def on_edges_removing(cls, pairs):
+            """Updates the structures derived from the Edges before a batch of parent -> child Edges is removed.
+
+            Depths are only recomputed from the remaining Edges, by `on_edges_removed()`.
+            """
+            if config.closure_fullname is not None:
+                for parent_pk, child_pk in pairs:
+                    cls.closure_remove_edge(parent_pk, child_pk)
+            if config.degree_counters:
+                cls.bulk_update_degrees(pairs, sign=-1)
+
+        @classmethod
+        def on_edges_removed(cls, child_pks):
+            """Updates the structures recomputed from the remaining Edges, after Edges to the provided Nodes are removed."""
+            if config.depth_counter:
+                cls.refresh_depths(child_pks)
+
+        # Counters (only used when `degree_counters` or `depth_counter` is configured)
+
+        @classmethod
+        def update_degrees(cls, parent_pk, child_pk, quantity: int = 1):
+            """Adds `quantity` (which may be negative) to the parent's `out_degree` and the child's `in_degree`."""
+            node_model = get_model_class(config.node_fullname)
+            node_model.objects.filter(pk=parent_pk).update(out_degree=F("out_degree") + quantity)
+            node_model.objects.filter(pk=child_pk).update(in_degree=F("in_degree") + quantity)
+
+        @classmethod
+        def bulk_update_degrees(cls, pairs, sign: int = 1):
+            """Adds the number of parent -> child `pairs` of each Node to its `out_degree` and `in_degree`.
+
+            With `sign=-1`, the numbers are subtracted instead. Each direction is one update per batch of Nodes, adding
+            each Node's count through a `Case` with one branch per distinct count.
+            """
+            node_model = get_model_class(config.node_fullname)
+            for field, counts in (
+                ("out_degree", Counter(parent_pk for parent_pk, _ in pairs)),
+                ("in_degree", Counter(child_pk for _, child_pk in pairs)),
+            ):
+                # Each pk is used twice per update, so the batches are halved to respect parameter limits
+                for pks in batched(counts, size=BULK_CHECK_BATCH_SIZE // 2):
+                    by_count = {}
+                    for pk in pks:
+                        by_count.setdefault(counts[pk], []).append(pk)
+                    quantity = Case(
+                        *(When(pk__in=group, then=Value(sign * count)) for count, group in by_count.items()),
+                        default=Value(0),
+                    )
+                    node_model.objects.filter(pk__in=pks).update(**{field: F(field) + quantity})
+
+        @classmethod
+        def deepen(cls, parent_pk, child_pk):
+            """Updates the depths below a new parent -> child Edge, if the Edge lengthens the longest path to the child.
+
+            Depths can only grow when an Edge is added, so nothing is written unless the child's depth increases.
+            """
+            cls.bulk_deepen([(parent_pk, child_pk)])
+
+        @classmethod
+        def bulk_deepen(cls, pairs):
+            """Updates the depths below a batch of new parent -> child Edges, with at most one `refresh_depths()`.
+
+            Only the children whose depth increases are refreshed. A child whose parent is itself deepened by the batch
+            is a descendant of a refreshed Node, so its depth is recomputed too.
+            """
+            node_model = get_model_class(config.node_fullname)
+            depths = {}
+            for pks in batched({pk for pair in pairs for pk in pair}):
+                depths.update(node_model.objects.filter(pk__in=pks).values_list("pk", "depth"))
+            deeper = {
+                child_pk for parent_pk, child_pk in pairs if depths.get(parent_pk, 0) + 1 > depths.get(child_pk, 0)
+            }
+            if deeper:
+                cls.refresh_depths(deeper)
+
+        @classmethod
+        def refresh_depths(cls, node_pks):
+            """Recomputes the depths of the provided Nodes and all of their descendants from the current Edges.
+
+            The affected Nodes are found with `reachable_edges()`, which follows every Edge without a depth limit, as
+            depths count the Edges of every Graph. Their depths are computed in memory from the depths of their
+            parents. Only changed depths are written, with one update per depth.
+            """
+            node_pks = set(node_pks)
+            if not node_pks:
+                return
+            node_model = get_model_class(config.node_fullname)
+            edge_model = get_model_class(config.edge_fullname)
+            affected = node_pks | {child_pk for _, child_pk in cls.reachable_edges(node_pks)}
+
+            pairs = []
+            for pks in batched(affected):
+                pairs.extend(
+                    edge_model._base_manager.filter(child_id__in=pks, parent__isnull=False)
+                    .values_list("parent_id", "child_id")
+                    .order_by()
+                )
+            current = {}
+            for pks in batched(affected | {parent_pk for parent_pk, _ in pairs}):
+                current.update(node_model.objects.filter(pk__in=pks).values_list("pk", "depth"))
+            # Nodes which were deleted along with their Edges have nothing to update
+            affected &= current.keys()
+            if not affected:
+                return
+
+            snapshot = GraphSnapshot(pairs)
+            depths = {pk: 0 for pk in affected}
+            for pk in snapshot.topological_sort():
+                if pk in affected:
+                    for parent_pk in snapshot.parents(pk):
+                        parent_depth = depths[parent_pk] if parent_pk in affected else current[parent_pk]
+                        depths[pk] = max(depths[pk], parent_depth + 1)
+
+            changed = {}
+            for pk, depth in depths.items():
+                if current.get(pk) != depth:
+                    changed.setdefault(depth, []).append(pk)
+            for depth, pks in changed.items():
+                for batch in batched(pks):
+                    node_model.objects.filter(pk__in=batch).update(depth=depth)
+
+        @classmethod
+        def rebuild_counters(cls):
+            """Recomputes the degree and depth counters of every Node from the current Edges.
+
+            Useful when enabling `degree_counters` or `depth_counter` on a graph which already contains Edges.
+            """
+            node_model = get_model_class(config.node_fullname)
+            edge_model = get_model_class(config.edge_fullname)
+            with transaction.atomic():
+                if config.degree_counters:
+                    for field, own_field, other_field in (
+                        ("in_degree", "child", "parent"),
+                        ("out_degree", "parent", "child"),
+                    ):
+                        edges = (
+                            edge_model._base_manager.filter(
+                                **{own_field: OuterRef("pk"), f"{other_field}__isnull": False}
+                            )
+                            .order_by()
+                            .values(own_field)
+                            .annotate(quantity=Count("pk"))
+                            .values("quantity")
+                        )
+                        node_model.objects.update(**{field: Coalesce(Subquery(edges), 0)})
+                if config.depth_counter:
+                    node_model.objects.update(depth=0)
+                    cls.refresh_depths(node_model.objects.filter(parents__isnull=True).values_list("pk", flat=True))
+
+        # Closure table (only used when `closure_fullname` is configured)
+
+        @classmethod
+        def closure_add_edge(cls, parent_pk, child_pk, quantity: int = 1):
+            """Adds the paths created by a new parent -> child Edge to the closure table."""
+            closure_model = get_model_class(config.closure_fullname)
+            using = router.db_for_write(closure_model)
+            parent_pk, child_pk = db_pk(cls, parent_pk, using), db_pk(cls, child_pk, using)
+            execute_statement(
+                closure_insert_sql(closure_model, using=using),
+                closure_delta_params(parent_pk, child_pk, quantity),
+                prepare=config.prepared_statements,
+                using=using,
+            )
+
+        @classmethod
+        def closure_remove_edge(cls, parent_pk, child_pk, quantity: int = 1):
+            """Removes the paths provided by a parent -> child Edge from the closure table."""
+            closure_model = get_model_class(config.closure_fullname)
+            using = router.db_for_write(closure_model)
+            parent_pk, child_pk = db_pk(cls, parent_pk, using), db_pk(cls, child_pk, using)
+            execute_statement(
+                closure_subtract_sql(closure_model, using=using),
+                closure_delta_params(parent_pk, child_pk, quantity),
+                prepare=config.prepared_statements,
+                using=using,
+            )
+            execute_statement(
+                closure_prune_sql(closure_model, using=using),
+                [child_pk, child_pk],
+                prepare=config.prepared_statements,
+                using=using,
+            )
+
+        @classmethod
+        def rebuild_closure(cls):
+            """Rebuilds the closure table from the current Edges.
+
+            Useful when enabling `closure_fullname` on a graph which already contains Edges.
+            """
+            closure_model = get_model_class(config.closure_fullname)
+            edge_model = get_model_class(config.edge_fullname)
+            edges = (
+                edge_model._base_manager.filter(parent__isnull=False, child__isnull=False)
+                .values_list("parent_id", "child_id")
+                .order_by()
+            )
+            with transaction.atomic():
+                closure_model.objects.all().delete()
+                for parent_pk, child_pk in edges.iterator():
+                    cls.closure_add_edge(parent_pk, child_pk)
 
         # Checks
 
@@ -412,13 +1840,15 @@ def base_node(config: GraphConfig):  # noqa: C901
             # Whenever we check for circular links, we also check for self-links (which are a type of circular link)
             cls.self_link_check(parent, child)
 
-            if child in parent.self_and_ancestors():
+            # Cycles are checked across every Graph, whatever the current `graph_scope`
+            if cls._reachable(child.pk, parent.pk):
                 raise ValidationError("The new child Node is already an ancestor")
 
         @staticmethod
-        def duplicate_edge_check(parent: BaseNode, child: BaseNode):
-            """Checks that the Node is not linked in duplicate to another Node."""
-            if child in parent.self_and_descendants():
+        def duplicate_edge_check(parent: BaseNode, child: BaseNode, graph_pk=None):
+            """Checks that the Node is not linked in duplicate to another Node within the same Graph."""
+            edge_model = get_model_class(config.edge_fullname)
+            if edge_model._base_manager.filter(same_graph(graph_pk), parent=parent, child=child).exists():
                 raise ValidationError("The new Edge is a duplicate")
 
         @staticmethod
@@ -429,15 +1859,184 @@ def base_node(config: GraphConfig):  # noqa: C901
                 if config.children_quantity_max and config.children_quantity_max > 0
                 else False
             )
-            if children_quantity_max and parent.children.all().count() >= children_quantity_max:
+            if not children_quantity_max:
+                return
+            if config.degree_counters:
+                node_model = get_model_class(config.node_fullname)
+                quantity = node_model.objects.filter(pk=parent.pk).values_list("out_degree", flat=True).first() or 0
+            else:
+                quantity = parent.children.all().count()
+            if quantity >= children_quantity_max:
                 raise ValidationError("The maximum number of children per node will be exceeded")
 
+        # Bulk checks
+        #   Each is provided with a list of candidate (parent_pk, child_pk) pairs, and raises a single
+        #   ValidationError with one entry (with `parent` and `child` params) per offending pair.
+
+        @staticmethod
+        def bulk_self_link_check(pairs: list):
+            """Checks that none of the candidate Edges link a Node to itself."""
+            errors = [
+                ValidationError(
+                    "The object cannot be linked to itself",
+                    code="self_link",
+                    params={"parent": parent_pk, "child": child_pk},
+                )
+                for parent_pk, child_pk in pairs
+                if parent_pk == child_pk
+            ]
+            if errors:
+                raise ValidationError(errors)
+
+        @classmethod
+        def reachable_edges(cls, node_pks) -> set:
+            """Returns the (parent_pk, child_pk) pairs of every Edge leaving the provided Nodes or their descendants.
+
+            Uses one recursive query per batch of Nodes. Every Edge is followed, whatever the current `graph_scope`,
+            and without a depth limit.
+            """
+            edge_model = get_model_class(config.edge_fullname)
+            using = router.db_for_read(edge_model)
+            pk_field = cls._meta.pk
+            edges = set()
+            for seeds in batched(db_pk(cls, pk, using) for pk in node_pks):
+                rows = execute_statement(
+                    reachable_edges_sql(edge_model, len(seeds), using=using),
+                    seeds + seeds,
+                    prepare=config.prepared_statements,
+                    using=using,
+                )
+                edges.update(
+                    (pk_field.to_python(parent_pk), pk_field.to_python(child_pk)) for parent_pk, child_pk in rows
+                )
+            return edges
+
+        @classmethod
+        def bulk_circular_check(cls, pairs: list):
+            """Checks that none of the candidate Edges, alone or together, would create a cycle.
+
+            Loads the existing Edges reachable from the candidate children in a single recursive query, then
+            finds any candidate Edge whose parent and child end up in the same strongly connected component. Such an
+            Edge is reported as closing a cycle either through the existing Edges alone, or only together with other
+            candidate Edges.
+            """
+            existing_edges = cls.reachable_edges({child_pk for _, child_pk in pairs})
+            existing_adjacency = {}
+            for parent_pk, child_pk in existing_edges:
+                existing_adjacency.setdefault(parent_pk, []).append(child_pk)
+            adjacency = {parent_pk: list(children) for parent_pk, children in existing_adjacency.items()}
+            for parent_pk, child_pk in pairs:
+                adjacency.setdefault(parent_pk, []).append(child_pk)
+            components = strongly_connected_components(adjacency)
+
+            errors = []
+            for parent_pk, child_pk in pairs:
+                if parent_pk == child_pk:
+                    message, code = "The object cannot be linked to itself", "self_link"
+                elif components[parent_pk] != components[child_pk]:
+                    continue
+                elif reaches(existing_adjacency, child_pk, parent_pk):
+                    message, code = "The new child Node is already an ancestor", "circular"
+                else:
+                    message, code = "The Edge would create a cycle together with other new Edges", "circular"
+                errors.append(ValidationError(message, code=code, params={"parent": parent_pk, "child": child_pk}))
+            if errors:
+                raise ValidationError(errors)
+
+        @staticmethod
+        def bulk_duplicate_edge_check(pairs: list, graph_pk=None):
+            """Checks that none of the candidate Edges already exist in their Graph, or are repeated in the candidates."""
+            edge_model = get_model_class(config.edge_fullname)
+            existing = set()
+            for batch in batched(pairs):
+                existing.update(
+                    edge_model._base_manager.filter(
+                        same_graph(graph_pk),
+                        parent_id__in={parent_pk for parent_pk, _ in batch},
+                        child_id__in={child_pk for _, child_pk in batch},
+                    )
+                    .values_list("parent_id", "child_id")
+                    .order_by()
+                )
+
+            errors = []
+            for pair in pairs:
+                if pair in existing:
+                    errors.append(
+                        ValidationError(
+                            "The new Edge is a duplicate",
+                            code="duplicate",
+                            params={"parent": pair[0], "child": pair[1]},
+                        )
+                    )
+                existing.add(pair)
+            if errors:
+                raise ValidationError(errors)
+
+        @staticmethod
+        def bulk_children_quantity_check(pairs: list):
+            """Checks that no parent in the candidate Edges will have more than the allowed number of children."""
+            children_quantity_max = (
+                config.children_quantity_max
+                if config.children_quantity_max and config.children_quantity_max > 0
+                else False
+            )
+            if not children_quantity_max:
+                return
+
+            edge_model = get_model_class(config.edge_fullname)
+            node_model = get_model_class(config.node_fullname)
+            quantities = {}
+            for parent_pks in batched({parent_pk for parent_pk, _ in pairs}):
+                if config.degree_counters:
+                    quantities.update(node_model.objects.filter(pk__in=parent_pks).values_list("pk", "out_degree"))
+                    continue
+                quantities.update(
+                    edge_model._base_manager.filter(parent_id__in=parent_pks)
+                    .values("parent_id")
+                    .annotate(quantity=Count("pk"))
+                    .values_list("parent_id", "quantity")
+                    .order_by()
+                )
+
+            errors = []
+            for parent_pk, child_pk in pairs:
+                quantities[parent_pk] = quantities.get(parent_pk, 0) + 1
+                if quantities[parent_pk] > children_quantity_max:
+                    errors.append(
+                        ValidationError(
+                            "The maximum number of children per node will be exceeded",
+                            code="children_quantity",
+                            params={"parent": parent_pk, "child": child_pk},
+                        )
+                    )
+            if errors:
+                raise ValidationError(errors)
+
         class Meta:
             abstract = True
 
         def save(self, *args, **kwargs):
             super().save(*args, **kwargs)
 
+        def delete(self, *args, **kwargs):
+            bump_graph_version(config)
+            if not self.tracks_edges():
+                return super().delete(*args, **kwargs)
+
+            # Remove the paths running through this Node before its Edges are detached from it
+            edge_model = self.edge_class()
+            with transaction.atomic():
+                edges = edge_model._base_manager.filter(models.Q(parent=self) | models.Q(child=self))
+                pairs = list(
+                    edges.filter(parent__isnull=False, child__isnull=False).values_list("parent_id", "child_id")
+                )
+                self.on_edges_removing(pairs)
+                own_pk = self.pk
+                deleted = super().delete(*args, **kwargs)
+                self.on_edges_removed({child_pk for _, child_pk in pairs} - {own_pk})
+                return deleted
+
         def clean_fields(self, exclude=None):
             super().clean_fields(exclude=exclude)
 
@@ -3,13 +3,32 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.db import transaction
+from django.db.models import CharField
+from django.db.models import F
+from django.db.models import Max
+from django.db.models import Value
+from django.db.models.functions import Concat
+from django.db.models.functions import Length
+from django.db.models.functions import Substr
+
+from django_directed.models.abstract_base_graph_models import base_closure
 from django_directed.models.abstract_base_graph_models import base_edge
 from django_directed.models.abstract_base_graph_models import base_graph
 from django_directed.models.abstract_base_graph_models import base_node
+from django_directed.models.abstract_base_graph_models import batched
+from django_directed.models.abstract_base_graph_models import get_model_class
+from django_directed.models.abstract_base_graph_models import graph_scoped
 
 
 if TYPE_CHECKING:
     from django_directed.config import GraphConfig
+    from django_directed.models.abstract_base_graph_models import BaseNode
+
+# Largest number of characters in a Node's `tree_path`, which bounds the depth of trees using tree paths
+TREE_PATH_MAX_LENGTH = 1024
 
 
 def cyclic_graph_factory(config: GraphConfig):
@@ -25,10 +44,19 @@ def cyclic_graph_factory(config: GraphConfig):
 def cyclic_edge_factory(config: GraphConfig):
     """Type: Subclassed Abstract Model. Abstract methods of the Edge base model are implemented."""
 
-    class CyclicEdge(base_edge(config)):
-        class Meta:
+    AbstractEdge = base_edge(config)
+
+    class CyclicEdge(AbstractEdge):
+        class Meta(AbstractEdge.Meta):
             abstract = True
 
+        @classmethod
+        def bulk_checks(cls, graph_pk=None) -> list:
+            checks = super().bulk_checks(graph_pk)
+            if not config.allow_self_links:
+                checks.insert(0, get_model_class(config.node_fullname).bulk_self_link_check)
+            return checks
+
         def save(self, *args, **kwargs):
             # Check for self links
             allow_self_links = config.allow_self_links
@@ -63,10 +91,16 @@ def dag_graph_factory(config: GraphConfig):
 def dag_edge_factory(config: GraphConfig):
     """Type: Subclassed Abstract Model. Abstract methods of the Edge base model are implemented."""
 
-    class DAGEdge(base_edge(config)):
-        class Meta:
+    AbstractEdge = base_edge(config)
+
+    class DAGEdge(AbstractEdge):
+        class Meta(AbstractEdge.Meta):
             abstract = True
 
+        @classmethod
+        def bulk_checks(cls, graph_pk=None) -> list:
+            return [get_model_class(config.node_fullname).bulk_circular_check] + super().bulk_checks(graph_pk)
+
         def save(self, *args, **kwargs):
             # Check for circular links
             self.parent.__class__.circular_check(self.parent, self.child)
@@ -86,6 +120,18 @@ def dag_node_factory(config: GraphConfig):
     return DAGNode
 
 
+def dag_closure_factory(config: GraphConfig):
+    """Type: Subclassed Abstract Model. Abstract methods of the Closure base model are implemented."""
+
+    AbstractClosure = base_closure(config)
+
+    class DAGClosure(AbstractClosure):
+        class Meta(AbstractClosure.Meta):
+            abstract = True
+
+    return DAGClosure
+
+
 def polytree_graph_factory(config: GraphConfig):
     """Type: Subclassed Abstract Model. Abstract methods of the Graph base model are implemented."""
 
@@ -99,10 +145,16 @@ def polytree_graph_factory(config: GraphConfig):
 def polytree_edge_factory(config: GraphConfig):
     """Type: Subclassed Abstract Model. Abstract methods of the Edge base model are implemented."""
 
-    class PolytreeEdge(base_edge(config)):
-        class Meta:
+    AbstractEdge = base_edge(config)
+
+    class PolytreeEdge(AbstractEdge):
+        class Meta(AbstractEdge.Meta):
             abstract = True
 
+        @classmethod
+        def bulk_checks(cls, graph_pk=None) -> list:
+            return [get_model_class(config.node_fullname).bulk_circular_check] + super().bulk_checks(graph_pk)
+
         def save(self, *args, **kwargs):
             # Check for circular links
             self.parent.__class__.circular_check(self.parent, self.child)
@@ -122,6 +174,18 @@ def polytree_node_factory(config: GraphConfig):
     return PolytreeNode
 
 
+def polytree_closure_factory(config: GraphConfig):
+    """Type: Subclassed Abstract Model. Abstract methods of the Closure base model are implemented."""
+
+    AbstractClosure = base_closure(config)
+
+    class PolytreeClosure(AbstractClosure):
+        class Meta(AbstractClosure.Meta):
+            abstract = True
+
+    return PolytreeClosure
+
+
 def arborescence_graph_factory(config: GraphConfig):
     """Type: Subclassed Abstract Model. Abstract methods of the Graph base model are implemented."""
 
@@ -135,24 +199,269 @@ def arborescence_graph_factory(config: GraphConfig):
 def arborescence_edge_factory(config: GraphConfig):
     """Type: Subclassed Abstract Model. Abstract methods of the Edge base model are implemented."""
 
-    class ArborescenceEdge(base_edge(config)):
-        class Meta:
+    AbstractEdge = base_edge(config)
+
+    class ArborescenceEdge(AbstractEdge):
+        class Meta(AbstractEdge.Meta):
             abstract = True
 
+        @classmethod
+        def bulk_checks(cls, graph_pk=None) -> list:
+            checks = [get_model_class(config.node_fullname).bulk_circular_check] + super().bulk_checks(graph_pk)
+            if config.tree_paths:
+                checks.append(get_model_class(config.node_fullname).bulk_single_parent_check)
+            return checks
+
         def save(self, *args, **kwargs):
             # Check for circular links, if needed
             self.parent.__class__.circular_check(self.parent, self.child)
 
+            if config.tree_paths and self._state.adding:
+                self.parent.__class__.single_parent_check(self.child)
+
             super().save(*args, **kwargs)
 
     return ArborescenceEdge
 
 
-def arborescence_node_factory(config: GraphConfig):
+def arborescence_node_factory(config: GraphConfig):  # noqa: C901
     """Type: Subclassed Abstract Model. Abstract methods of the Node base model are implemented."""
 
     class ArborescenceNode(base_node(config)):
+        if config.tree_paths:
+            # Materialised path of pks from the root, such as "/1/4/9/", and the number of Edges from the root
+            tree_path = models.CharField(
+                max_length=TREE_PATH_MAX_LENGTH, blank=True, default="", editable=False, db_index=True
+            )
+            tree_depth = models.PositiveIntegerField(default=0, editable=False)
+
         class Meta:
             abstract = True
 
+        def save(self, *args, **kwargs):
+            adding = self._state.adding
+            super().save(*args, **kwargs)
+            if config.tree_paths and adding:
+                self.init_tree_paths([self])
+
+        # Tree paths (only used when `tree_paths` is configured)
+
+        @classmethod
+        def init_tree_paths(cls, nodes):
+            """Gives newly created Nodes without a tree path the path of a root, such as "/9/".
+
+            Called by `save()` and by `bulk_create()` on Node QuerySets, so new Nodes are never left without a path.
+            """
+            pending = [node for node in nodes if node.pk is not None and not node.tree_path]
+            for node in pending:
+                node.tree_path, node.tree_depth = f"/{node.pk}/", 0
+            if pending:
+                get_model_class(config.node_fullname).objects.bulk_update(pending, ["tree_path", "tree_depth"])
+
+        @classmethod
+        def tracks_edges(cls) -> bool:
+            return config.tree_paths or super().tracks_edges()
+
+        @classmethod
+        def on_edge_added(cls, parent_pk, child_pk, quantity: int = 1):
+            super().on_edge_added(parent_pk, child_pk, quantity=quantity)
+            if config.tree_paths:
+                cls.move_subtree(child_pk, parent_pk)
+
+        @classmethod
+        def on_edge_removed(cls, parent_pk, child_pk, quantity: int = 1):
+            super().on_edge_removed(parent_pk, child_pk, quantity=quantity)
+            if config.tree_paths:
+                cls.move_subtree(child_pk, None)
+
+        @classmethod
+        def on_edges_added(cls, pairs):
+            super().on_edges_added(pairs)
+            if config.tree_paths:
+                for parent_pk, child_pk in pairs:
+                    cls.move_subtree(child_pk, parent_pk)
+
+        @classmethod
+        def on_edges_removing(cls, pairs):
+            super().on_edges_removing(pairs)
+            if config.tree_paths:
+                for _, child_pk in pairs:
+                    cls.move_subtree(child_pk, None)
+
+        @classmethod
+        def move_subtree(cls, node_pk, parent_pk=None):
+            """Rewrites the tree paths of a Node and all of its descendants, placing the Node below a new parent.
+
+            If `parent_pk` is None, the Node becomes a root. The whole subtree is updated with one prefix update. Raises
+            ValidationError if the longest path in the moved subtree would exceed `TREE_PATH_MAX_LENGTH` characters.
+            """
+            node_model = get_model_class(config.node_fullname)
+            paths = dict(
+                (pk, (path, depth))
+                for pk, path, depth in node_model.objects.filter(pk__in=[node_pk, parent_pk]).values_list(
+                    "pk", "tree_path", "tree_depth"
+                )
+            )
+            old_path, old_depth = paths[node_pk]
+            if not old_path:
+                # Nodes created before tree paths were enabled start as roots; see `rebuild_tree_paths()`
+                old_path, old_depth = f"/{node_pk}/", 0
+                node_model.objects.filter(pk=node_pk).update(tree_path=old_path, tree_depth=old_depth)
+
+            if parent_pk is None:
+                new_path, new_depth = f"/{node_pk}/", 0
+            else:
+                parent_path, parent_depth = paths[parent_pk]
+                new_path, new_depth = f"{parent_path or f'/{parent_pk}/'}{node_pk}/", parent_depth + 1
+
+            subtree = node_model.objects.filter(tree_path__startswith=old_path)
+            if len(new_path) > len(old_path):
+                longest = subtree.aggregate(longest=Max(Length("tree_path")))["longest"] or len(old_path)
+                if longest - len(old_path) + len(new_path) > TREE_PATH_MAX_LENGTH:
+                    raise ValidationError(
+                        "The tree would be too deep: the tree path of a Node would exceed %(max_length)s characters",
+                        code="tree_path_too_long",
+                        params={"max_length": TREE_PATH_MAX_LENGTH, "parent": parent_pk, "child": node_pk},
+                    )
+
+            subtree.update(
+                tree_path=Concat(Value(new_path), Substr("tree_path", len(old_path) + 1), output_field=CharField()),
+                tree_depth=F("tree_depth") + (new_depth - old_depth),
+            )
+
+        @classmethod
+        def rebuild_tree_paths(cls):
+            """Rebuilds the tree path of every Node from the current Edges.
+
+            Useful when enabling `tree_paths` on a graph which already contains Nodes.
+            """
+            node_model = get_model_class(config.node_fullname)
+            edge_model = get_model_class(config.edge_fullname)
+            children = {}
+            for parent_pk, child_pk in (
+                edge_model._base_manager.filter(parent__isnull=False, child__isnull=False)
+                .values_list("parent_id", "child_id")
+                .order_by()
+            ):
+                children.setdefault(parent_pk, []).append(child_pk)
+            child_pks = {child_pk for pks in children.values() for child_pk in pks}
+
+            with transaction.atomic():
+                for root_pk in node_model.objects.exclude(pk__in=child_pks).values_list("pk", flat=True).iterator():
+                    stack = [(root_pk, f"/{root_pk}/", 0)]
+                    while stack:
+                        pk, path, depth = stack.pop()
+                        if len(path) > TREE_PATH_MAX_LENGTH:
+                            raise ValidationError(
+                                "The tree is too deep: the tree path of a Node would exceed %(max_length)s characters",
+                                code="tree_path_too_long",
+                                params={"max_length": TREE_PATH_MAX_LENGTH, "child": pk},
+                            )
+                        node_model.objects.filter(pk=pk).update(tree_path=path, tree_depth=depth)
+                        stack.extend((child_pk, f"{path}{child_pk}/", depth + 1) for child_pk in children.get(pk, ()))
+
+        def _usable_tree_position(self, edge_filter=None, node_filter=None):
+            """Returns the `(tree_path, tree_depth)` of this Node if a traversal can be read from the tree paths.
+
+            Returns None for filtered or scoped traversals, and for a Node without a tree path (such as one created
+            before tree paths were enabled and not yet given one by `rebuild_tree_paths()`), which are traversed with
+            the recursive query instead.
+            """
+            if not config.tree_paths or edge_filter or node_filter or graph_scoped(config):
+                return None
+            position = self._tree_position()
+            return position if position[0] else None
+
+        def _tree_position(self) -> tuple:
+            """Returns the current `(tree_path, tree_depth)` of this Node, refreshed from the database."""
+            self.tree_path, self.tree_depth = self.__class__.objects.values_list("tree_path", "tree_depth").get(
+                pk=self.pk
+            )
+            return self.tree_path, self.tree_depth
+
+        def _tree_path_queryset(
+            self, leafward: bool = True, include_self: bool = False, max_depth: int = None, position: tuple = None
+        ):
+            """Returns the traversal QuerySet using tree paths, annotated and ordered as other traversals are."""
+            path, depth = position or self._tree_position()
+            queryset = self.__class__.objects.all()
+            if leafward:
+                queryset = queryset.filter(tree_path__startswith=path).annotate(traversal_depth=F("tree_depth") - depth)
+                if max_depth is not None:
+                    queryset = queryset.filter(tree_depth__lte=depth + max_depth)
+            else:
+                field = self._meta.pk
+                ancestor_pks = [field.to_python(pk) for pk in path.strip("/").split("/")]
+                if max_depth is not None:
+                    ancestor_pks = ancestor_pks[-(max_depth + 1) :]
+                queryset = queryset.filter(pk__in=ancestor_pks).annotate(traversal_depth=depth - F("tree_depth"))
+            if not include_self:
+                queryset = queryset.exclude(pk=self.pk)
+            return queryset.order_by("traversal_depth", "pk")
+
+        def _traversal_queryset(self, leafward: bool = True, include_self: bool = False, **kwargs):
+            position = self._usable_tree_position(kwargs.get("edge_filter"), kwargs.get("node_filter"))
+            if position is not None:
+                return self._tree_path_queryset(
+                    leafward=leafward, include_self=include_self, max_depth=kwargs.get("max_depth"), position=position
+                )
+            return super()._traversal_queryset(leafward=leafward, include_self=include_self, **kwargs)
+
+        def _traversal_count(self, leafward: bool = True, max_depth: int = None, edge_filter=None, node_filter=None):
+            position = self._usable_tree_position(edge_filter, node_filter)
+            if position is not None:
+                if leafward:
+                    return self._tree_path_queryset(leafward=True, max_depth=max_depth, position=position).count()
+                depth = position[1]
+                return depth if max_depth is None else min(depth, max_depth)
+            return super()._traversal_count(
+                leafward=leafward, max_depth=max_depth, edge_filter=edge_filter, node_filter=node_filter
+            )
+
+        # Checks
+
+        @staticmethod
+        def single_parent_check(child: BaseNode):
+            """Checks that the Node does not already have a parent."""
+            edge_model = get_model_class(config.edge_fullname)
+            if edge_model._base_manager.filter(child=child, parent__isnull=False).exists():
+                raise ValidationError("The Node already has a parent")
+
+        @staticmethod
+        def bulk_single_parent_check(pairs: list):
+            """Checks that none of the candidate Edges would give a Node a second parent."""
+            edge_model = get_model_class(config.edge_fullname)
+            has_parent = set()
+            for child_pks in batched({child_pk for _, child_pk in pairs}):
+                has_parent.update(
+                    edge_model._base_manager.filter(child__in=child_pks, parent__isnull=False)
+                    .order_by()
+                    .values_list("child_id", flat=True)
+                )
+            errors = []
+            for parent_pk, child_pk in pairs:
+                if child_pk in has_parent:
+                    errors.append(
+                        ValidationError(
+                            "The Node already has a parent",
+                            code="second_parent",
+                            params={"parent": parent_pk, "child": child_pk},
+                        )
+                    )
+                has_parent.add(child_pk)
+            if errors:
+                raise ValidationError(errors)
+
     return ArborescenceNode
+
+
+def arborescence_closure_factory(config: GraphConfig):
+    """Type: Subclassed Abstract Model. Abstract methods of the Closure base model are implemented."""
+
+    AbstractClosure = base_closure(config)
+
+    class ArborescenceClosure(AbstractClosure):
+        class Meta(AbstractClosure.Meta):
+            abstract = True
+
+    return ArborescenceClosure
@@ -5,15 +5,18 @@ from enum import Enum
 from typing import TYPE_CHECKING
 
 from django_directed.exceptions import ServiceDoesNotExistError
+from django_directed.models.abstract_graph_models import arborescence_closure_factory
 from django_directed.models.abstract_graph_models import arborescence_edge_factory
 from django_directed.models.abstract_graph_models import arborescence_graph_factory
 from django_directed.models.abstract_graph_models import arborescence_node_factory
 from django_directed.models.abstract_graph_models import cyclic_edge_factory
 from django_directed.models.abstract_graph_models import cyclic_graph_factory
 from django_directed.models.abstract_graph_models import cyclic_node_factory
+from django_directed.models.abstract_graph_models import dag_closure_factory
 from django_directed.models.abstract_graph_models import dag_edge_factory
 from django_directed.models.abstract_graph_models import dag_graph_factory
 from django_directed.models.abstract_graph_models import dag_node_factory
+from django_directed.models.abstract_graph_models import polytree_closure_factory
 from django_directed.models.abstract_graph_models import polytree_edge_factory
 from django_directed.models.abstract_graph_models import polytree_graph_factory
 from django_directed.models.abstract_graph_models import polytree_node_factory
@@ -67,6 +70,10 @@ class DAGService:
         """Returns the actual Node model."""
         return dag_node_factory(config=self._config)
 
+    def closure(self):
+        """Returns the actual Closure model."""
+        return dag_closure_factory(config=self._config)
+
 
 def create_dag_service(config: GraphConfig):
     """Creates a new DAGService instance."""
@@ -92,6 +99,10 @@ class PolytreeService:
         """Returns the actual Node model."""
         return polytree_node_factory(config=self._config)
 
+    def closure(self):
+        """Returns the actual Closure model."""
+        return polytree_closure_factory(config=self._config)
+
 
 def create_polytree_service(config: GraphConfig):
     """Creates a new PolytreeService instance."""
@@ -117,6 +128,10 @@ class ArborescenceService:
         """Returns the actual Node model."""
         return arborescence_node_factory(config=self._config)
 
+    def closure(self):
+        """Returns the actual Closure model."""
+        return arborescence_closure_factory(config=self._config)
+
 
 def create_arborescence_service(config: GraphConfig):
     """Creates a new ArborescenceService instance."""
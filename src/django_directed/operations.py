@@ -0,0 +1,211 @@
+"""Migration operations for django_directed graphs.
+
+`PartitionEdgeTable` converts an Edge model's table into a PostgreSQL table partitioned by Graph, so that vacuuming,
+indexes, and traversals within a `graph_scope` each only touch the partitions they need. Partitioning is only
+available on PostgreSQL, and the operation does nothing on other databases.
+"""
+import logging
+
+from django.db import connections
+from django.db import router
+from django.db.backends.utils import truncate_name
+from django.db.migrations.operations.base import Operation
+
+
+logger = logging.getLogger("django_directed")
+
+PARTITION_METHODS = ("LIST", "HASH")
+
+
+def partition_name(table: str, suffix: str, connection) -> str:
+    """Returns the name of one partition of a table, truncated to the database's identifier length."""
+    return truncate_name(f"{table}_{suffix}", connection.ops.max_name_length())
+
+
+def _partition_value(value) -> str:
+    """Returns a Graph pk as an SQL literal. Partition bounds cannot be passed as parameters."""
+    if isinstance(value, int):
+        return str(value)
+    return "'{}'".format(str(value).replace("'", "''"))
+
+
+def is_partitioned(model, connection=None) -> bool:
+    """Returns True if the model's table is a partitioned PostgreSQL table, on the model's write database by default."""
+    if connection is None:
+        connection = connections[router.db_for_write(model)]
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS(SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))",
+            [connection.ops.quote_name(model._meta.db_table)],
+        )
+        return cursor.fetchone()[0]
+
+
+def graph_partition_sql(edge_model, graph_pk, connection) -> str:
+    """Returns the SQL creating the partition of a LIST partitioned Edge table which holds one Graph's Edges."""
+    qn = connection.ops.quote_name
+    table = edge_model._meta.db_table
+    return (
+        f"CREATE TABLE IF NOT EXISTS {qn(partition_name(table, f'graph_{graph_pk}', connection))} "
+        f"PARTITION OF {qn(table)} FOR VALUES IN ({_partition_value(graph_pk)})"
+    )
+
+
+def create_graph_partition(edge_model, graph_pk, connection=None) -> bool:
+    """Creates the partition for a new Graph, if the Edge table is LIST partitioned. Returns True if created.
+
+    Uses the Edge model's write database unless a connection is given.
+    """
+    if connection is None:
+        connection = connections[router.db_for_write(edge_model)]
+    if not is_partitioned(edge_model, connection):
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(graph_partition_sql(edge_model, graph_pk, connection))
+    return True
+
+
+def drop_graph_partition(edge_model, graph_pk, connection=None) -> bool:
+    """Drops the partition of a deleted Graph, if the Edge table is LIST partitioned. Returns True if dropped.
+
+    Uses the Edge model's write database unless a connection is given.
+    """
+    if connection is None:
+        connection = connections[router.db_for_write(edge_model)]
+    if not is_partitioned(edge_model, connection):
+        return False
+    qn = connection.ops.quote_name
+    name = partition_name(edge_model._meta.db_table, f"graph_{graph_pk}", connection)
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {qn(name)}")
+    return True
+
+
+class PartitionEdgeTable(Operation):
+    """Rebuilds an Edge model's table as a PostgreSQL table partitioned by its `graph` column.
+
+    With `method="HASH"`, Edges are spread over `partitions` partitions. With `method="LIST"`, each existing Graph
+    gets its own partition, Graphs created later are given one as they are saved, and a default partition holds any
+    other rows. The primary key becomes `(id, graph)`, as PostgreSQL requires the partition key in every unique
+    constraint, so the `graph` column must not contain nulls. Existing rows, indexes, constraints, and foreign keys
+    are kept.
+
+    Reversing the operation rebuilds the table without partitions. Does nothing on databases other than
+    PostgreSQL. Add it to a migration after the one creating the Edge model:
+
+        operations = [PartitionEdgeTable("DAGEdge", method="HASH", partitions=16)]
+    """
+
+    reversible = True
+    atomic = True
+
+    def __init__(self, model_name: str, method: str = "HASH", partitions: int = 8):
+        method = method.upper()
+        if method not in PARTITION_METHODS:
+            raise ValueError(f"Partitioning method must be one of {PARTITION_METHODS}")
+        self.model_name = model_name
+        self.method = method
+        self.partitions = partitions
+
+    def deconstruct(self):
+        return self.__class__.__qualname__, [self.model_name], {"method": self.method, "partitions": self.partitions}
+
+    def state_forwards(self, app_label, state):
+        # The model state has no notion of partitions or of a primary key constraint spanning several columns: the
+        # model's pk field is still `id`, and `(id, graph)` is only enforced in the database, so the state is unchanged
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            self._rebuild(schema_editor, to_state.apps.get_model(app_label, self.model_name), partitioned=True)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            self._rebuild(schema_editor, to_state.apps.get_model(app_label, self.model_name), partitioned=False)
+
+    def describe(self):
+        return f"Partition the table of {self.model_name} by graph ({self.method})"
+
+    @property
+    def migration_name_fragment(self):
+        return f"partition_{self.model_name.lower()}"
+
+    def _partitions_sql(self, schema_editor, model, source: str) -> list:
+        """Returns the SQL creating the partitions of the new table, given the name of the table holding the rows."""
+        qn = schema_editor.quote_name
+        table = model._meta.db_table
+        graph_col = model._meta.get_field("graph").column
+        if self.method == "HASH":
+            return [
+                f"CREATE TABLE {qn(partition_name(table, f'p{remainder}', schema_editor.connection))} PARTITION OF "
+                f"{qn(table)} FOR VALUES WITH (MODULUS {self.partitions}, REMAINDER {remainder})"
+                for remainder in range(self.partitions)
+            ]
+
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(f"SELECT DISTINCT {qn(graph_col)} FROM {qn(source)} WHERE {qn(graph_col)} IS NOT NULL")
+            graph_pks = sorted(row[0] for row in cursor.fetchall())
+        statements = [graph_partition_sql(model, graph_pk, schema_editor.connection) for graph_pk in graph_pks]
+        statements.append(
+            f"CREATE TABLE {qn(partition_name(table, 'default', schema_editor.connection))} "
+            f"PARTITION OF {qn(table)} DEFAULT"
+        )
+        return statements
+
+    def _rebuild(self, schema_editor, model, partitioned: bool):
+        """Copies the table into a new table with the same columns, with or without partitions, and swaps them."""
+        qn = schema_editor.quote_name
+        table = model._meta.db_table
+        old_table = truncate_name(f"{table}__rebuild", schema_editor.connection.ops.max_name_length())
+        pk_col = model._meta.pk.column
+        graph_col = model._meta.get_field("graph").column
+
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_get_serial_sequence(%s, %s), attidentity <> '' FROM pg_attribute "
+                "WHERE attrelid = to_regclass(%s) AND attname = %s",
+                [qn(table), pk_col, qn(table), pk_col],
+            )
+            sequence, identity = cursor.fetchone()
+
+        # Pending deferred foreign key checks would prevent the table from being altered
+        schema_editor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        schema_editor.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(old_table)}")
+        if partitioned:
+            schema_editor.execute(
+                f"CREATE TABLE {qn(table)} (LIKE {qn(old_table)} INCLUDING DEFAULTS INCLUDING IDENTITY) "
+                f"PARTITION BY {self.method} ({qn(graph_col)})"
+            )
+            for sql in self._partitions_sql(schema_editor, model, old_table):
+                schema_editor.execute(sql)
+        else:
+            schema_editor.execute(
+                f"CREATE TABLE {qn(table)} (LIKE {qn(old_table)} INCLUDING DEFAULTS INCLUDING IDENTITY)"
+            )
+
+        schema_editor.execute(f"INSERT INTO {qn(table)} SELECT * FROM {qn(old_table)}")
+        if sequence and not identity:
+            # A serial column's sequence moves to the new table, rather than being dropped with the old one
+            schema_editor.execute(f"ALTER SEQUENCE {sequence} OWNED BY {qn(table)}.{qn(pk_col)}")
+        elif sequence:
+            schema_editor.execute(
+                f"SELECT setval(pg_get_serial_sequence('{qn(table)}', '{pk_col}'), "
+                f"COALESCE((SELECT MAX({qn(pk_col)}) FROM {qn(table)}), 0) + 1, false)"
+            )
+        schema_editor.execute(f"DROP TABLE {qn(old_table)}")
+
+        # The primary key is added once the old table, which holds the constraint's name until then, is dropped
+        pk_name = truncate_name(f"{table}_pkey", schema_editor.connection.ops.max_name_length())
+        pk_sql = ", ".join(qn(column) for column in ([pk_col, graph_col] if partitioned else [pk_col]))
+        schema_editor.execute(f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(pk_name)} PRIMARY KEY ({pk_sql})")
+
+        for sql in schema_editor._model_indexes_sql(model):
+            schema_editor.execute(sql)
+        for constraint in model._meta.constraints:
+            schema_editor.add_constraint(model, constraint)
+        for field in model._meta.local_fields:
+            if field.remote_field and field.db_constraint:
+                schema_editor.execute(schema_editor._create_fk_sql(model, field, "_fk_%(to_table)s_%(to_column)s"))
+        logger.debug(f"Rebuilt {table} {'with' if partitioned else 'without'} partitions")
@@ -2,15 +2,18 @@
 import logging
 from inspect import ismethod
 from itertools import chain
+from itertools import islice
 
 from django.core.exceptions import FieldDoesNotExist
 from django.db.models import Case
+from django.db.models import Q
 from django.db.models import When
 from django.db.models.fields import DateTimeField
 from django.db.models.fields import UUIDField
 from django.db.models.fields.files import FileField
 from django.db.models.fields.files import ImageField
 from django.db.models.fields.related import ManyToManyField
+from django.db.models.query import RawQuerySet
 
 from django_directed.exceptions import GraphModelsCannotBeParsedError
 from django_directed.exceptions import IncorrectInputTypeError
@@ -105,7 +108,8 @@ def get_field_value(instance, field, date_strf=None):
             return []
         else:
             qs = field.value_from_object(instance)
-            if qs._result_cache is not None:
+            # Django 4.0+ returns the related instances as a list, rather than as a QuerySet
+            if isinstance(qs, list) or qs._result_cache is not None:
                 return [item.pk for item in qs]
             else:
                 # ToDo: Handle complex ManyToManyField cases
@@ -154,36 +158,152 @@ def model_to_dict(instance, field_list, date_strf=None):
     return data
 
 
+def get_field_converter(field, date_strf=None):
+    """Returns a function converting a field's raw value as `get_field_value` would.
+
+    Used with queryset_to_dicts, so that the type of each field is checked once rather than once per instance.
+    """
+    if isinstance(field, DateTimeField):
+        if date_strf:
+            return lambda dt: dt.strftime(date_strf) if dt else None
+        return lambda dt: dt.timestamp() if dt else None
+
+    elif isinstance(field, FileField):
+        return lambda file: field.storage.url(getattr(file, "name", file)) if file else None
+
+    elif isinstance(field, UUIDField):
+        return lambda uuid: str(uuid) if uuid else None
+
+    return lambda value: value
+
+
+def _chunks(rows, size: int):
+    """Yields successive lists of at most `size` items from an iterable."""
+    rows = iter(rows)
+    chunk = list(islice(rows, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(rows, size))
+
+
+def _m2m_pks(field, pks: list) -> dict:
+    """Returns a mapping of {instance pk: [related pks]} for a ManyToManyField, using a single query.
+
+    Rows of the through table without a related instance (such as Edges whose child was deleted) are skipped, as the
+    field's related manager skips them.
+    """
+    through = field.remote_field.through
+    source = through._meta.get_field(field.m2m_field_name()).attname
+    target = through._meta.get_field(field.m2m_reverse_field_name()).attname
+    related = {pk: [] for pk in pks}
+    rows = (
+        through._base_manager.filter(**{f"{source}__in": pks, f"{target}__isnull": False})
+        .order_by("pk")
+        .values_list(source, target)
+    )
+    for pk, related_pk in rows:
+        related[pk].append(related_pk)
+    return related
+
+
+def _plan_fields(opts, field_list, date_strf=None) -> tuple:
+    """Splits field_list into (name, attname, converter) columns, ManyToManyFields, and attributes read from instances.
+
+    Attributes are methods, properties, and private fields (such as GenericForeignKeys), which model_to_dict also
+    reads from the instance.
+    """
+    __fields = list(map(lambda a: a.split("__")[0], field_list))
+
+    columns, many_to_many = [], []
+    for f in chain(opts.concrete_fields, opts.many_to_many):
+        if f.name not in __fields:
+            continue
+        if isinstance(f, ManyToManyField):
+            many_to_many.append(f)
+        else:
+            columns.append((f.name, f.attname, get_field_converter(f, date_strf)))
+
+    field_names = {f.name for f in chain(opts.concrete_fields, opts.many_to_many)}
+    funcs = [func for func in dict.fromkeys(__fields) if func not in field_names]
+    return columns, many_to_many, funcs
+
+
+def queryset_to_dicts(queryset, field_list, date_strf=None, chunk_size=2000):
+    """Yields a dictionary of {field_name: field_value} for each instance in a QuerySet, as model_to_dict would.
+
+    Each field's converter is chosen once, values are read with a chunked `values_list()` query, and the pks of
+    ManyToManyFields are fetched with one query per field per chunk. If `field_list` names methods, properties, or
+    private fields, instances are loaded instead, so that they can be evaluated. Fields holding null values are
+    included as None. Unlike model_to_dict, non-editable fields are always read from the column (so a foreign key
+    gives the related pk rather than the related instance), and null DateTimeFields give None rather than an error.
+    e.g.: queryset_to_dicts(myqueryset, ["id", "name"])
+    """
+    if not check_field_list(field_list):
+        raise IncorrectInputTypeError("field_list argument must be a list or tuple of fields")
+
+    columns, many_to_many, funcs = _plan_fields(queryset.model._meta, field_list, date_strf)
+    attnames = [attname for _, attname, _ in columns]
+
+    if funcs:
+        rows = (
+            ([getattr(instance, attname) for attname in attnames], instance)
+            for instance in queryset.iterator(chunk_size=chunk_size)
+        )
+    else:
+        rows = (
+            (list(values), None) for values in queryset.values_list(*attnames, "pk").iterator(chunk_size=chunk_size)
+        )
+
+    for chunk in _chunks(rows, chunk_size):
+        pks = [values.pop() if instance is None else instance.pk for values, instance in chunk]
+        related = {f.name: _m2m_pks(f, pks) for f in many_to_many}
+        for pk, (values, instance) in zip(pks, chunk):
+            data = {}
+            for (name, _, converter), value in zip(columns, values):
+                data[name] = converter(value)
+            for name, related_pks in related.items():
+                data[name] = related_pks[pk]
+            for func in funcs:
+                obj = getattr(instance, func)
+                data[func] = obj() if ismethod(obj) else obj
+            yield data
+
+
+def _pks_subquery(queryset):
+    """Returns the pks of a QuerySet as an unordered subquery, or as a list of pks for a RawQuerySet."""
+    if isinstance(queryset, RawQuerySet):
+        return [instance.pk for instance in queryset]
+    return queryset.order_by().values("pk")
+
+
 def edges_from_nodes_queryset(nodes_queryset):
-    """Given an Edge Model and a QuerySet or RawQuerySet of nodes, returns a queryset of the associated edges."""
+    """Given a QuerySet or RawQuerySet of nodes, returns a queryset of the edges between them.
+
+    The nodes are passed to the database as a subquery, and the edges are ordered by parent and then child, which
+    follows the Edge table's (parent, child) index.
+    """
     _NodeModel, _EdgeModel, queryset_type = get_queryset_characteristics(nodes_queryset)  # noqa: N806
 
     if queryset_type == "nodes_queryset":
-        return _ordered_filter(_EdgeModel.objects, ["parent", "child"], nodes_queryset)
+        node_pks = _pks_subquery(nodes_queryset)
+        return _EdgeModel.objects.filter(parent__in=node_pks, child__in=node_pks).order_by("parent", "child")
     raise IncorrectQuerySetTypeError("`queryset_type` must be 'nodes_queryset'")
 
 
 def nodes_from_edges_queryset(edges_queryset):
-    """Given a Node Model and a QuerySet or RawQuerySet of edges, returns a queryset of the associated nodes."""
+    """Given a QuerySet or RawQuerySet of edges, returns a queryset of the nodes they connect, ordered by pk.
+
+    The edges are passed to the database as subqueries of their parent and child pks.
+    """
     _NodeModel, _EdgeModel, queryset_type = get_queryset_characteristics(edges_queryset)  # noqa: N806
 
     if queryset_type == "edges_queryset":
-        nodes_list = (
-            _ordered_filter(
-                _NodeModel.objects,
-                [
-                    f"{_NodeModel.__name__}_child",
-                ],
-                edges_queryset,
-            )
-            | _ordered_filter(
-                _NodeModel.objects,
-                [
-                    f"{_NodeModel.__name__}_parent",
-                ],
-                edges_queryset,
-            )
-        ).values_list("pk")
-
-        return _NodeModel.objects.filter(pk__in=nodes_list)
+        if isinstance(edges_queryset, RawQuerySet):
+            edges = list(edges_queryset)
+            parent_pks = [edge.parent_id for edge in edges]
+            child_pks = [edge.child_id for edge in edges]
+        else:
+            parent_pks = edges_queryset.order_by().values("parent_id")
+            child_pks = edges_queryset.order_by().values("child_id")
+        return _NodeModel.objects.filter(Q(pk__in=parent_pks) | Q(pk__in=child_pks)).order_by("pk")
     raise IncorrectQuerySetTypeError
@@ -4,3 +4,10 @@ import django.dispatch
 
 child_removed = django.dispatch.Signal()
 child_added = django.dispatch.Signal()
+
+# Sent once for a batch of Edges created with `bulk_add`, with `pairs` of (parent_id, child_id)
+children_added = django.dispatch.Signal()
+
+# Sent once for a batch of Edges removed with `remove_children` or `remove_parents`, with `pairs` of
+# (parent_id, child_id) and `nodes_deleted`, which is True if the Nodes at the other end were also deleted
+children_removed = django.dispatch.Signal()
@@ -0,0 +1,246 @@
+"""In-memory snapshots of a graph, for answering many traversals without returning to the database."""
+import logging
+from array import array
+from collections import deque
+
+from django_directed.exceptions import GraphContainsCycleError
+
+
+logger = logging.getLogger("django_directed")
+
+# Number of Edges fetched per round trip while streaming the Edge table into a snapshot.
+SNAPSHOT_CHUNK_SIZE = 2000
+
+
+def _compress(size: int, sources: array, targets: array) -> tuple:
+    """Returns `(offsets, targets)` arrays in compressed sparse row form for the provided list of index pairs.
+
+    The targets of source `i` are `targets[offsets[i]:offsets[i + 1]]`.
+    """
+    offsets = array("q", [0]) * (size + 1)
+    for source in sources:
+        offsets[source + 1] += 1
+    for position in range(size):
+        offsets[position + 1] += offsets[position]
+
+    next_slot = offsets[:-1]
+    compressed = array("q", [0]) * len(targets)
+    for source, target in zip(sources, targets):
+        compressed[next_slot[source]] = target
+        next_slot[source] += 1
+    return offsets, compressed
+
+
+class GraphSnapshot:
+    """A read-only copy of a graph's Edges, held in memory as array-backed adjacency lists.
+
+    Nodes are numbered by their position in `pks`. Children and parents are each stored in compressed sparse row
+    form: one array of offsets into one array of Node numbers. All methods accept and return Node pks, and any pk
+    list can be turned back into an ordered QuerySet with `queryset()`.
+
+    A snapshot does not change when the database does, so it should be discarded once the graph is modified.
+    """
+
+    def __init__(self, pairs, node_model=None):
+        """Builds a snapshot from an iterable of `(parent_pk, child_pk)` pairs."""
+        self.node_model = node_model
+        self.pks = []
+        self.index = {}
+        sources = array("q")
+        targets = array("q")
+        for pair in pairs:
+            for pk in pair:
+                if pk not in self.index:
+                    self.index[pk] = len(self.pks)
+                    self.pks.append(pk)
+            sources.append(self.index[pair[0]])
+            targets.append(self.index[pair[1]])
+
+        self.child_offsets, self.child_targets = _compress(len(self.pks), sources, targets)
+        self.parent_offsets, self.parent_targets = _compress(len(self.pks), targets, sources)
+        self._depths = None
+
+    @classmethod
+    def from_queryset(cls, edge_queryset, chunk_size: int = SNAPSHOT_CHUNK_SIZE):
+        """Builds a snapshot from a QuerySet of Edges, streamed in a single query."""
+        pairs = (
+            edge_queryset.filter(parent__isnull=False, child__isnull=False)
+            .order_by()
+            .values_list("parent_id", "child_id")
+            .iterator(chunk_size=chunk_size)
+        )
+        return cls(pairs, node_model=edge_queryset.model._meta.get_field("parent").related_model)
+
+    def __len__(self):
+        return len(self.pks)
+
+    def __contains__(self, pk):
+        return pk in self.index
+
+    @property
+    def edge_count(self) -> int:
+        """Returns the number of Edges in the snapshot."""
+        return len(self.child_targets)
+
+    def _neighbours(self, position: int, leafward: bool = True):
+        if leafward:
+            return self.child_targets[self.child_offsets[position] : self.child_offsets[position + 1]]
+        return self.parent_targets[self.parent_offsets[position] : self.parent_offsets[position + 1]]
+
+    def _walk(self, pk, leafward: bool = True, include_self: bool = False, max_depth: int = None) -> list:
+        """Returns the pks reachable from a Node, ordered by shortest depth and then by pk.
+
+        As with the database traversals, the starting Node is included (at the depth of the shortest cycle back to
+        it) when it lies on a cycle, even if `include_self` is False.
+        """
+        if pk not in self.index:
+            return [pk] if include_self else []
+        start = self.index[pk]
+        depths = {start: 0} if include_self else {}
+        queue = deque([(start, 0)])
+        while queue:
+            position, depth = queue.popleft()
+            if max_depth is not None and depth >= max_depth:
+                continue
+            for neighbour in self._neighbours(position, leafward):
+                if neighbour not in depths:
+                    depths[neighbour] = depth + 1
+                    if neighbour != start:
+                        queue.append((neighbour, depth + 1))
+
+        found = sorted(depths.items(), key=lambda item: (item[1], self.pks[item[0]]))
+        return [self.pks[position] for position, _ in found]
+
+    def descendants(self, pk, max_depth: int = None) -> list:
+        """Returns the pks of all Nodes in connected paths in a leafward direction, ordered by depth."""
+        return self._walk(pk, leafward=True, max_depth=max_depth)
+
+    def self_and_descendants(self, pk, max_depth: int = None) -> list:
+        """Returns the pks of all Nodes in connected paths in a leafward direction, prepending with self."""
+        return self._walk(pk, leafward=True, include_self=True, max_depth=max_depth)
+
+    def ancestors(self, pk, max_depth: int = None) -> list:
+        """Returns the pks of all Nodes in connected paths in a rootward direction, ordered by depth."""
+        return self._walk(pk, leafward=False, max_depth=max_depth)
+
+    def self_and_ancestors(self, pk, max_depth: int = None) -> list:
+        """Returns the pks of all Nodes in connected paths in a rootward direction, prepending with self."""
+        return self._walk(pk, leafward=False, include_self=True, max_depth=max_depth)
+
+    def children(self, pk) -> list:
+        """Returns the pks of the children of a Node."""
+        if pk not in self.index:
+            return []
+        return [self.pks[position] for position in self._neighbours(self.index[pk], leafward=True)]
+
+    def parents(self, pk) -> list:
+        """Returns the pks of the parents of a Node."""
+        if pk not in self.index:
+            return []
+        return [self.pks[position] for position in self._neighbours(self.index[pk], leafward=False)]
+
+    def reachable(self, source_pk, target_pk) -> bool:
+        """Returns True if a path of one or more Edges leads from the source Node to the target Node."""
+        if source_pk not in self.index or target_pk not in self.index:
+            return False
+        target = self.index[target_pk]
+        seen = set()
+        queue = deque([self.index[source_pk]])
+        while queue:
+            for neighbour in self._neighbours(queue.popleft()):
+                if neighbour == target:
+                    return True
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    queue.append(neighbour)
+        return False
+
+    def shortest_path(self, source_pk, target_pk) -> list:
+        """Returns the pks along a shortest path from the source Node to the target Node, or None if there is none."""
+        if source_pk == target_pk:
+            return [source_pk]
+        if source_pk not in self.index or target_pk not in self.index:
+            return None
+        target = self.index[target_pk]
+        links = {self.index[source_pk]: None}
+        queue = deque([self.index[source_pk]])
+        while queue:
+            position = queue.popleft()
+            for neighbour in self._neighbours(position):
+                if neighbour not in links:
+                    links[neighbour] = position
+                    if neighbour == target:
+                        path = [neighbour]
+                        while links[path[-1]] is not None:
+                            path.append(links[path[-1]])
+                        return [self.pks[step] for step in reversed(path)]
+                    queue.append(neighbour)
+        return None
+
+    def distance(self, source_pk, target_pk) -> int:
+        """Returns the number of Edges along a shortest path from the source Node to the target Node, or None."""
+        path = self.shortest_path(source_pk, target_pk)
+        return None if path is None else len(path) - 1
+
+    def roots(self) -> list:
+        """Returns the pks of all Nodes without parents."""
+        offsets = self.parent_offsets
+        return [pk for position, pk in enumerate(self.pks) if offsets[position] == offsets[position + 1]]
+
+    def leaves(self) -> list:
+        """Returns the pks of all Nodes without children."""
+        offsets = self.child_offsets
+        return [pk for position, pk in enumerate(self.pks) if offsets[position] == offsets[position + 1]]
+
+    def _topological_positions(self) -> list:
+        """Returns the Node numbers in topological order, using Kahn's algorithm."""
+        in_degrees = array("q", (self.parent_offsets[i + 1] - self.parent_offsets[i] for i in range(len(self.pks))))
+        queue = deque(position for position, in_degree in enumerate(in_degrees) if in_degree == 0)
+        ordered = []
+        while queue:
+            position = queue.popleft()
+            ordered.append(position)
+            for child in self._neighbours(position):
+                in_degrees[child] -= 1
+                if in_degrees[child] == 0:
+                    queue.append(child)
+        if len(ordered) < len(self.pks):
+            raise GraphContainsCycleError("The graph contains a cycle, so it has no topological order")
+        return ordered
+
+    def topological_sort(self) -> list:
+        """Returns the pks of all Nodes, each appearing after all of its ancestors.
+
+        Raises GraphContainsCycleError if the graph contains a cycle.
+        """
+        return [self.pks[position] for position in self._topological_positions()]
+
+    def depths(self) -> dict:
+        """Returns a mapping of {pk: depth}, where depth is the length of the longest path from any root Node.
+
+        Raises GraphContainsCycleError if the graph contains a cycle.
+        """
+        if self._depths is None:
+            depths = array("q", [0]) * len(self.pks)
+            for position in self._topological_positions():
+                for child in self._neighbours(position):
+                    depths[child] = max(depths[child], depths[position] + 1)
+            self._depths = {pk: depths[position] for position, pk in enumerate(self.pks)}
+        return self._depths
+
+    def depth(self, pk) -> int:
+        """Returns the length of the longest path from any root Node to the Node."""
+        return self.depths().get(pk, 0)
+
+    def nodes(self, pks: list) -> list:
+        """Returns a list of the Nodes with the provided pks, in the same order.
+
+        The Nodes are fetched with `pk__in` and put back in the order of `pks` in Python, rather than ordered by a
+        `CASE` branch per pk in the database.
+        """
+        found = self.node_model.objects.in_bulk(pks)
+        return [found[pk] for pk in pks if pk in found]
+
+    def queryset(self, pks: list):
+        """Returns a QuerySet of the Nodes with the provided pks, ordered by pk. Use `nodes()` to keep their order."""
+        return self.node_model.objects.filter(pk__in=pks).order_by("pk")
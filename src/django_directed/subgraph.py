@@ -0,0 +1,75 @@
+"""Induced subgraphs: a set of Nodes together with every Edge between them, held in memory."""
+import logging
+
+from django_directed.exporting import EXPORT_CHUNK_SIZE
+from django_directed.exporting import export_rows
+from django_directed.exporting import write_export
+from django_directed.snapshot import GraphSnapshot
+
+
+logger = logging.getLogger("django_directed")
+
+SUBGRAPH_DIRECTIONS = ("descendants", "ancestors", "both")
+
+
+class Subgraph:
+    """Nodes and the Edges between them, as returned by `Node.subgraph()`.
+
+    `nodes` is a list of Node instances, each annotated with its `traversal_depth` from the root Node, and `edges`
+    is a list of `(parent_pk, child_pk)` pairs. `depths` maps each Node's pk to its depth, which is negative for
+    ancestors of the root Node. `multigraph` is True if several Edges may link the same Nodes.
+    """
+
+    def __init__(
+        self, nodes: list, edges: list, depths: dict, node_model=None, edge_model=None, multigraph: bool = False
+    ):
+        self.nodes = nodes
+        self.edges = edges
+        self.depths = depths
+        self.node_model = node_model
+        self.edge_model = edge_model
+        self.multigraph = multigraph
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, pk):
+        return pk in self.depths
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    @property
+    def node_pks(self) -> list:
+        """Returns the pks of the Nodes, in the same order as `nodes`."""
+        return [node.pk for node in self.nodes]
+
+    def snapshot(self) -> GraphSnapshot:
+        """Returns a GraphSnapshot of the subgraph's Edges, for further traversals without queries."""
+        return GraphSnapshot(self.edges, node_model=self.node_model)
+
+    def export(self, file=None, format: str = None, node_fields: list = None, chunk_size: int = EXPORT_CHUNK_SIZE):
+        """Exports the subgraph as node-link JSON, GraphML, or DOT, without further queries.
+
+        If a path or open file is provided, the export is written to it. Otherwise a generator of text is returned.
+        See `django_directed.exporting.export_graph`.
+        """
+        node_fields = list(node_fields or [])
+        attnames = [self.node_model._meta.get_field(field).attname for field in node_fields]
+        node_rows = [(node.pk, *(getattr(node, attname) for attname in attnames)) for node in self.nodes]
+
+        def export(format):
+            return export_rows(
+                self.node_model,
+                self.edge_model,
+                node_rows,
+                self.edges,
+                format=format,
+                node_fields=node_fields,
+                chunk_size=chunk_size,
+                multigraph=self.multigraph,
+            )
+
+        if file is not None:
+            return write_export(file, export, format=format)
+        return export(format or "node-link")
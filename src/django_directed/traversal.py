@@ -0,0 +1,857 @@
+"""Building blocks for graph traversal queries that return lazy QuerySets.
+
+A traversal is expressed as a subquery yielding `(node_id, depth)` rows, either from a recursive CTE over the
+Edge table or from a closure table. The subquery is joined directly to the Node table, so that the result is a
+regular QuerySet which can be further filtered, sliced, or counted, and which is ordered by depth in the database.
+
+SQL templates are built once per model, database alias, and shape of traversal, and cached, with all values passed
+as bound parameters. The statement text is therefore stable across calls, which lets the database and any connection
+pooler reuse prepared statements. Builders and executors take the `using` alias of the database which will run the
+statement, so that quoting, column types, and vendor-specific SQL are never shared between databases.
+"""
+import functools
+import json
+import logging
+
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connections
+from django.db.models import Expression
+from django.db.models import PositiveIntegerField
+from django.db.models import Q
+from django.db.models.sql.constants import INNER
+
+
+logger = logging.getLogger("django_directed")
+
+TRAVERSAL_ALIAS = "django_directed_traversal"
+
+# Largest depth followed by traversals. Bounds the recursion on graphs containing cycles.
+DEFAULT_MAX_DEPTH = 100
+
+# Number of traversal statements cached. Filtered traversals add one entry per distinct shape of filter.
+STATEMENT_CACHE_SIZE = 512
+
+# Largest number of Node pks passed in a single query when expanding a bidirectional search frontier.
+FRONTIER_BATCH_SIZE = 500
+
+# Number of rows fetched per round trip when streaming traversal results.
+STREAM_CHUNK_SIZE = 2000
+
+
+class TraversalJoin:
+    """Joins a `(node_id, depth)` subquery to the Node table of a QuerySet.
+
+    Provides the attributes and methods required of entries in `Query.alias_map` (see `django.db.models.sql.Join`).
+    """
+
+    nullable = False
+    filtered_relation = None
+    join_field = None
+
+    def __init__(self, sql, params, parent_alias, pk_column, table_alias=None, join_type=INNER):  # noqa: D107
+        self.sql = sql
+        self.params = tuple(params)
+        self.table_name = TRAVERSAL_ALIAS
+        self.parent_alias = parent_alias
+        self.pk_column = pk_column
+        self.table_alias = table_alias
+        self.join_type = join_type
+
+    def as_sql(self, compiler, connection):
+        """Generates the `INNER JOIN (subquery) alias ON (alias.node_id = node.pk)` clause."""
+        qn = compiler.quote_name_unless_alias
+        qn2 = connection.ops.quote_name
+        sql = "{join_type} ({sql}) {alias} ON ({alias}.{node_id} = {parent}.{pk})".format(
+            join_type=self.join_type,
+            sql=self.sql,
+            alias=qn(self.table_alias),
+            node_id=qn2("node_id"),
+            parent=qn(self.parent_alias),
+            pk=qn2(self.pk_column),
+        )
+        return sql, list(self.params)
+
+    def relabeled_clone(self, change_map):
+        """Returns a copy of the join, with aliases changed according to change_map."""
+        return self.__class__(
+            self.sql,
+            self.params,
+            change_map.get(self.parent_alias, self.parent_alias),
+            self.pk_column,
+            table_alias=change_map.get(self.table_alias, self.table_alias),
+            join_type=self.join_type,
+        )
+
+    @property
+    def identity(self):  # noqa: D102
+        return self.__class__, self.sql, self.params, self.parent_alias, self.pk_column
+
+    def __eq__(self, other):  # noqa: D105
+        if not isinstance(other, TraversalJoin):
+            return NotImplemented
+        return self.identity == other.identity
+
+    def __hash__(self):  # noqa: D105
+        return hash(self.identity)
+
+    def equals(self, other):  # noqa: D102
+        return self.identity == other.identity
+
+    def demote(self):  # noqa: D102
+        return self.relabeled_clone({})
+
+    def promote(self):  # noqa: D102
+        return self.relabeled_clone({})
+
+
+class TraversalColumn(Expression):
+    """References a column of a joined traversal subquery, such as its `depth`."""
+
+    def __init__(self, alias, column, output_field=None):  # noqa: D107
+        super().__init__(output_field=output_field or PositiveIntegerField())
+        self.alias = alias
+        self.column = column
+
+    def as_sql(self, compiler, connection):  # noqa: D102
+        return f"{compiler.quote_name_unless_alias(self.alias)}.{connection.ops.quote_name(self.column)}", []
+
+    def relabeled_clone(self, change_map):  # noqa: D102
+        return self.__class__(change_map.get(self.alias, self.alias), self.column, self.output_field)
+
+    def get_group_by_cols(self):  # noqa: D102
+        return [self]
+
+
+def join_traversal(queryset, sql, params, annotation: str = "traversal_depth"):
+    """Joins a `(node_id, depth)` subquery to the provided Node QuerySet.
+
+    The depth of each Node is available as the `traversal_depth` annotation (or the provided `annotation` name),
+    and the QuerySet is ordered by depth, then pk. Traversals combined with `|`, `^`, or set operations are first
+    rewritten with `detach_traversal`.
+    """
+    queryset = queryset.all()
+    query = queryset.query
+    base_alias = query.get_initial_alias()
+    alias = query.join(TraversalJoin(sql, params, base_alias, queryset.model._meta.pk.column))
+    return queryset.annotate(**{annotation: TraversalColumn(alias, "depth")}).order_by(annotation, "pk")
+
+
+def is_traversal(queryset) -> bool:
+    """Returns True if a traversal subquery has been joined to the QuerySet by `join_traversal`."""
+    return any(isinstance(join, TraversalJoin) for join in queryset.query.alias_map.values())
+
+
+def detach_traversal(queryset):
+    """Returns a QuerySet of the same Nodes which filters on the traversal's pks rather than joining it.
+
+    Combining two QuerySets with `|`, or in a `union()`, would otherwise join both traversals to the Node table and
+    only keep the Nodes found by each of them. The returned QuerySet has no depth annotation or ordering.
+    """
+    if not is_traversal(queryset):
+        return queryset
+    return queryset.model._default_manager.filter(pk__in=queryset.values("pk"))
+
+
+def db_pk(model, pk, using=DEFAULT_DB_ALIAS):
+    """Returns a pk of `model` in the database's own format, for use as a parameter of raw traversal SQL.
+
+    Integer pks are unchanged. Other pks, such as UUIDs, are converted by the pk field as they would be in a QuerySet
+    (for instance to a hex string on SQLite).
+    """
+    return model._meta.pk.get_db_prep_value(pk, connections[using])
+
+
+def filter_sql(model, filters, column, using=DEFAULT_DB_ALIAS):
+    """Returns SQL restricting `column` to the pks of `model` instances matching `filters`, and its params.
+
+    `filters` may be a Q object or a dict of lookups. The result is appended to the WHERE clause of a traversal's
+    recursive term, so that non-matching Edges or Nodes are pruned while the graph is being walked.
+    """
+    if not filters:
+        return "", []
+    if not isinstance(filters, Q):
+        filters = Q(**filters)
+    sql, params = model._base_manager.filter(filters).values("pk").query.get_compiler(using).as_sql()
+    return f"AND {column} IN ({sql})", list(params)
+
+
+def graph_filter_sql(edge_model, graph, using=DEFAULT_DB_ALIAS):
+    """Returns SQL restricting a traversal's recursive term to the Edges of one Graph, and its params.
+
+    The Edge table's `graph` column is compared directly, so that each step of the recursion can use the composite
+    `(graph, parent)` or `(graph, child)` index. Returns no SQL if `graph` is None.
+    """
+    connection = connections[using]
+    if graph is None:
+        return "", []
+    qn = connection.ops.quote_name
+    edge_table = qn(edge_model._meta.db_table)
+    return f"AND {edge_table}.{qn(edge_model._meta.get_field('graph').column)} = %s", [graph.pk]
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def recursive_traversal_sql(
+    edge_model, leafward=True, include_self=False, edge_filter_sql="", node_filter_sql="", using=DEFAULT_DB_ALIAS
+):
+    """Returns the SQL for a recursive CTE yielding `(node_id, depth)` for every Node reachable from a Node.
+
+    Each Node appears once, at its shortest depth. Optional filter SQL (see `filter_sql`) is applied in the
+    recursive term. Takes the parameters from `recursive_traversal_params`.
+    """
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    edge_table = qn(edge_model._meta.db_table)
+    parent_field = edge_model._meta.get_field("parent")
+    parent_col = qn(parent_field.column)
+    child_col = qn(edge_model._meta.get_field("child").column)
+    source_col, target_col = (parent_col, child_col) if leafward else (child_col, parent_col)
+    pk_type = parent_field.rel_db_type(connection)
+
+    self_filter = "" if include_self else "WHERE depth > 0"
+    return f"""
+        WITH RECURSIVE traverse(node_id, depth) AS (
+            SELECT CAST(%s AS {pk_type}), 0
+        UNION
+            SELECT {edge_table}.{target_col}, traverse.depth + 1 FROM traverse
+            INNER JOIN {edge_table} ON {edge_table}.{source_col} = traverse.node_id
+            WHERE traverse.depth < %s AND {edge_table}.{target_col} IS NOT NULL
+            {edge_filter_sql} {node_filter_sql}
+        )
+        SELECT node_id, MIN(depth) AS depth FROM traverse {self_filter} GROUP BY node_id
+    """
+
+
+def recursive_traversal_params(pk, max_depth=None, edge_filter_params=(), node_filter_params=()):
+    """Returns the parameters for the SQL from `recursive_traversal_sql`."""
+    if max_depth is None:
+        max_depth = DEFAULT_MAX_DEPTH
+    return [pk, max_depth, *edge_filter_params, *node_filter_params]
+
+
+def seed_sql(queryset):
+    """Returns the SQL selecting the pks of the Nodes in a QuerySet, and its params, for seeding a traversal."""
+    sql, params = queryset.order_by().values("pk").query.get_compiler(queryset.db).as_sql()
+    return sql, list(params)
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def multi_source_traversal_sql(
+    edge_model,
+    seed_sql,
+    leafward=True,
+    per_source=False,
+    edge_filter_sql="",
+    node_filter_sql="",
+    using=DEFAULT_DB_ALIAS,
+):
+    """Returns the SQL for a recursive CTE walking the graph from every Node selected by `seed_sql` at once.
+
+    Yields `(node_id, depth)` for every Node reachable from any of the sources, at its shortest depth from any of
+    them, or `(source_id, node_id, depth)` if `per_source` is True. Sources are only included if they are reachable
+    from a source. Takes the parameters from `multi_source_traversal_params`.
+    """
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    edge_table = qn(edge_model._meta.db_table)
+    parent_col = qn(edge_model._meta.get_field("parent").column)
+    child_col = qn(edge_model._meta.get_field("child").column)
+    source_col, target_col = (parent_col, child_col) if leafward else (child_col, parent_col)
+    parent_field = edge_model._meta.get_field("parent")
+    node_pk_col = qn(parent_field.related_model._meta.pk.column)
+    pk_type = parent_field.rel_db_type(connection)
+
+    # Without `per_source`, the source is left NULL so that paths from different sources are merged by the UNION
+    seed_source = f"seed.{node_pk_col}" if per_source else f"CAST(NULL AS {pk_type})"
+    source_select = "source_id, " if per_source else ""
+    grouping = "source_id, node_id" if per_source else "node_id"
+    return f"""
+        WITH RECURSIVE traverse(source_id, node_id, depth) AS (
+            SELECT {seed_source}, seed.{node_pk_col}, 0 FROM ({seed_sql}) AS seed
+        UNION
+            SELECT traverse.source_id, {edge_table}.{target_col}, traverse.depth + 1
+            FROM traverse
+            INNER JOIN {edge_table} ON {edge_table}.{source_col} = traverse.node_id
+            WHERE traverse.depth < %s AND {edge_table}.{target_col} IS NOT NULL
+            {edge_filter_sql} {node_filter_sql}
+        )
+        SELECT {source_select}node_id, MIN(depth) AS depth FROM traverse WHERE depth > 0 GROUP BY {grouping}
+    """
+
+
+def multi_source_traversal_params(seed_params, max_depth=None, edge_filter_params=(), node_filter_params=()):
+    """Returns the parameters for the SQL from `multi_source_traversal_sql`."""
+    if max_depth is None:
+        max_depth = DEFAULT_MAX_DEPTH
+    return [*seed_params, max_depth, *edge_filter_params, *node_filter_params]
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def multi_source_closure_sql(
+    closure_model, seed_sql, leafward=True, per_source=False, limit_depth=False, using=DEFAULT_DB_ALIAS
+):
+    """Returns the SQL equivalent to `multi_source_traversal_sql`, reading from a closure table.
+
+    Takes the parameters: the seed params, then max_depth if `limit_depth` is True.
+    """
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    closure_table = qn(closure_model._meta.db_table)
+    ancestor_col = qn(closure_model._meta.get_field("ancestor").column)
+    descendant_col = qn(closure_model._meta.get_field("descendant").column)
+    source_col, target_col = (ancestor_col, descendant_col) if leafward else (descendant_col, ancestor_col)
+
+    source_select = f"{source_col} AS source_id, " if per_source else ""
+    grouping = f"{source_col}, {target_col}" if per_source else target_col
+    depth_sql = "AND depth <= %s" if limit_depth else ""
+    return f"""
+        SELECT {source_select}{target_col} AS node_id, MIN(depth) AS depth FROM {closure_table}
+        WHERE {source_col} IN ({seed_sql}) {depth_sql} GROUP BY {grouping}
+    """
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def closure_traversal_sql(closure_model, leafward=True, include_self=False, limit_depth=False, using=DEFAULT_DB_ALIAS):
+    """Returns the SQL yielding `(node_id, depth)` for every Node reachable from a Node, from a closure table.
+
+    Each Node appears once, at its shortest depth. Takes the parameters from `closure_traversal_params`.
+    """
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    closure_table = qn(closure_model._meta.db_table)
+    ancestor_field = closure_model._meta.get_field("ancestor")
+    ancestor_col = qn(ancestor_field.column)
+    descendant_col = qn(closure_model._meta.get_field("descendant").column)
+    source_col, target_col = (ancestor_col, descendant_col) if leafward else (descendant_col, ancestor_col)
+    pk_type = ancestor_field.rel_db_type(connection)
+
+    self_sql = f"SELECT CAST(%s AS {pk_type}) AS node_id, 0 AS depth UNION ALL" if include_self else ""
+    depth_sql = "AND depth <= %s" if limit_depth else ""
+    return f"""
+        {self_sql}
+        SELECT {target_col} AS node_id, MIN(depth) AS depth FROM {closure_table}
+        WHERE {source_col} = %s {depth_sql} GROUP BY {target_col}
+    """
+
+
+def closure_traversal_params(pk, include_self=False, max_depth=None):
+    """Returns the parameters for the SQL from `closure_traversal_sql`."""
+    return ([pk] if include_self else []) + [pk] + ([] if max_depth is None else [max_depth])
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def levels_sql(edge_model, edge_filter_sql="", using=DEFAULT_DB_ALIAS):
+    """Returns the SQL for a recursive CTE yielding `(node_id, depth)` for every Node, where depth is its level.
+
+    A Node's level is the length of the longest path to it from any root Node, so ordering by level gives a
+    topological order. The walk starts from every root Node at once and keeps each distinct `(node, depth)` pair
+    once. Only meaningful for acyclic graphs. Optional filter SQL (see `graph_filter_sql`) limits both the roots and
+    the walk to the matching Edges. Takes the params: edge filter params, max depth, edge filter params.
+    """
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    edge_table = qn(edge_model._meta.db_table)
+    parent_field = edge_model._meta.get_field("parent")
+    parent_col = qn(parent_field.column)
+    child_col = qn(edge_model._meta.get_field("child").column)
+    node_table = qn(parent_field.related_model._meta.db_table)
+    node_pk_col = qn(parent_field.related_model._meta.pk.column)
+
+    return f"""
+        WITH RECURSIVE levels(node_id, depth) AS (
+            SELECT {node_table}.{node_pk_col}, 0 FROM {node_table}
+            WHERE NOT EXISTS (
+                SELECT 1 FROM {edge_table} WHERE {edge_table}.{child_col} = {node_table}.{node_pk_col}
+                AND {edge_table}.{parent_col} IS NOT NULL {edge_filter_sql}
+            )
+        UNION
+            SELECT {edge_table}.{child_col}, levels.depth + 1 FROM levels
+            INNER JOIN {edge_table} ON {edge_table}.{parent_col} = levels.node_id
+            WHERE levels.depth < %s AND {edge_table}.{child_col} IS NOT NULL {edge_filter_sql}
+        )
+        SELECT node_id, MAX(depth) AS depth FROM levels GROUP BY node_id
+    """
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def closure_levels_sql(closure_model, using=DEFAULT_DB_ALIAS):
+    """Returns the SQL yielding `(node_id, depth)` for every Node, where depth is its level, from a closure table.
+
+    The longest path to a Node always starts at a root, so its level is its greatest depth below any ancestor.
+    """
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    closure_table = qn(closure_model._meta.db_table)
+    descendant_field = closure_model._meta.get_field("descendant")
+    descendant_col = qn(descendant_field.column)
+    node_table = qn(descendant_field.related_model._meta.db_table)
+    node_pk_col = qn(descendant_field.related_model._meta.pk.column)
+
+    return f"""
+        SELECT {node_table}.{node_pk_col} AS node_id, COALESCE(MAX({closure_table}.depth), 0) AS depth
+        FROM {node_table} LEFT OUTER JOIN {closure_table} ON {closure_table}.{descendant_col} = {node_table}.{node_pk_col}
+        GROUP BY {node_table}.{node_pk_col}
+    """
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def ordered_pks_sql(traversal_sql):
+    """Returns the SQL selecting the node ids of a traversal subquery, ordered by depth and then by node id."""
+    return f"SELECT node_id FROM ({traversal_sql}) AS traversal ORDER BY depth, node_id"
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def rows_sql(traversal_sql):
+    """Returns the SQL selecting the `(node_id, depth)` rows of a traversal subquery."""
+    return f"SELECT node_id, depth FROM ({traversal_sql}) AS traversal"
+
+
+def rows_traversal_supported(using=DEFAULT_DB_ALIAS):
+    """Returns True if the database can read traversal rows from a JSON parameter (see `rows_traversal_sql`)."""
+    connection = connections[using]
+    return connection.vendor in ("postgresql", "sqlite")
+
+
+@functools.lru_cache(maxsize=None)
+def rows_traversal_sql(node_model, using=DEFAULT_DB_ALIAS):
+    """Returns the SQL yielding `(node_id, depth)` from previously fetched traversal rows.
+
+    The rows are passed as a single JSON array parameter (see `rows_traversal_params`), so that the statement is the
+    same whatever the number of rows.
+    """
+    connection = connections[using]
+    pk_type = node_model._meta.pk.rel_db_type(connection)
+    if connection.vendor == "postgresql":
+        return f"""
+            SELECT CAST(item->>0 AS {pk_type}) AS node_id, CAST(item->>1 AS integer) AS depth
+            FROM json_array_elements(CAST(%s AS json)) AS item
+        """
+    return f"""
+        SELECT CAST(json_extract(value, '$[0]') AS {pk_type}) AS node_id,
+               CAST(json_extract(value, '$[1]') AS integer) AS depth
+        FROM json_each(%s)
+    """
+
+
+def rows_traversal_params(rows):
+    """Returns the parameters for the SQL from `rows_traversal_sql`."""
+    return [json.dumps([list(row) for row in rows], default=str)]
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def count_sql(traversal_sql):
+    """Returns the SQL counting the rows of a `(node_id, depth)` traversal subquery."""
+    return f"SELECT COUNT(*) FROM ({traversal_sql}) AS traversal"
+
+
+@functools.lru_cache(maxsize=None)
+def reachability_sql(edge_model, edge_filter_sql="", using=DEFAULT_DB_ALIAS):
+    """Returns the SQL testing whether a path of one or more Edges leads from a source Node to a target Node.
+
+    Each Node is expanded at most once and the search is not continued past the target, so the outer `EXISTS` can
+    stop as soon as the target is found rather than materialising every reachable Node. Optional filter SQL (see
+    `graph_filter_sql`) limits the search to the matching Edges. Takes the params: source pk, edge filter params,
+    target pk, edge filter params, target pk.
+    """
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    edge_table = qn(edge_model._meta.db_table)
+    parent_col = qn(edge_model._meta.get_field("parent").column)
+    child_col = qn(edge_model._meta.get_field("child").column)
+
+    return f"""
+        WITH RECURSIVE reach(node_id) AS (
+            SELECT {child_col} FROM {edge_table} WHERE {parent_col} = %s AND {child_col} IS NOT NULL {edge_filter_sql}
+        UNION
+            SELECT {edge_table}.{child_col} FROM reach
+            INNER JOIN {edge_table} ON {edge_table}.{parent_col} = reach.node_id
+            WHERE reach.node_id <> %s AND {edge_table}.{child_col} IS NOT NULL {edge_filter_sql}
+        )
+        SELECT EXISTS(SELECT 1 FROM reach WHERE node_id = %s)
+    """
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def reachable_edges_sql(edge_model, seeds: int, using=DEFAULT_DB_ALIAS):
+    """Returns the SQL selecting `(parent, child)` for every Edge leaving `seeds` Nodes or any of their descendants.
+
+    Every Edge in the table is followed, whatever the current `graph_scope`, and only Node ids are kept in the
+    recursive term, so the search needs no depth limit and terminates on any graph. Takes the seed pks, twice.
+    """
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    edge_table = qn(edge_model._meta.db_table)
+    parent_col = qn(edge_model._meta.get_field("parent").column)
+    child_col = qn(edge_model._meta.get_field("child").column)
+    placeholders = ", ".join(["%s"] * seeds)
+
+    return f"""
+        WITH RECURSIVE reach(node_id) AS (
+            SELECT {child_col} FROM {edge_table} WHERE {parent_col} IN ({placeholders}) AND {child_col} IS NOT NULL
+        UNION
+            SELECT {edge_table}.{child_col} FROM reach
+            INNER JOIN {edge_table} ON {edge_table}.{parent_col} = reach.node_id
+            WHERE {edge_table}.{child_col} IS NOT NULL
+        )
+        SELECT {parent_col}, {child_col} FROM {edge_table}
+        WHERE {child_col} IS NOT NULL
+            AND ({parent_col} IN ({placeholders}) OR {parent_col} IN (SELECT node_id FROM reach))
+    """
+
+
+def _expand_frontier(edge_model, frontier, leafward=True, graph=None, using=DEFAULT_DB_ALIAS):
+    """Returns the set of Node pks one Edge away from any Node in the frontier, in the specified direction.
+
+    Follows the Edges of every Graph, or only those of `graph` if one is given.
+    """
+    source, target = ("parent", "child") if leafward else ("child", "parent")
+    edges = edge_model._base_manager.using(using)
+    if graph is not None:
+        edges = edges.filter(graph=graph)
+    frontier = list(frontier)
+    reached = set()
+    for start in range(0, len(frontier), FRONTIER_BATCH_SIZE):
+        reached.update(
+            edges.filter(**{f"{source}__in": frontier[start : start + FRONTIER_BATCH_SIZE], f"{target}__isnull": False})
+            .order_by()
+            .values_list(f"{target}_id", flat=True)
+            .distinct()
+        )
+    return reached
+
+
+def bidirectional_reachable(edge_model, source_pk, target_pk, graph=None, using=DEFAULT_DB_ALIAS):
+    """Returns True if a path of one or more Edges leads from the source Node to the target Node.
+
+    Searches leafward from the source and rootward from the target at the same time, one query per level, always
+    expanding whichever frontier is smaller. The search stops as soon as the two sides meet, or when either side
+    runs out of Nodes to expand. Only the Edges of `graph` are followed, if one is given.
+    """
+    forward_seen, backward_seen = {source_pk}, {target_pk}
+    forward, backward = {source_pk}, {target_pk}
+    while forward and backward:
+        if len(forward) <= len(backward):
+            reached = _expand_frontier(edge_model, forward, leafward=True, graph=graph, using=using)
+            if not reached.isdisjoint(backward_seen):
+                return True
+            forward = reached - forward_seen
+            forward_seen |= forward
+        else:
+            reached = _expand_frontier(edge_model, backward, leafward=False, graph=graph, using=using)
+            if not reached.isdisjoint(forward_seen):
+                return True
+            backward = reached - backward_seen
+            backward_seen |= backward
+    return False
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def paths_sql(edge_model, shortest=True, edge_filter_sql="", node_filter_sql="", using=DEFAULT_DB_ALIAS):
+    """Returns the SQL for a recursive CTE finding the paths from a source Node to a target Node.
+
+    Each row of the CTE is a path, held as a string of pks (such as "/1/4/9/"), extended breadth-first one Edge at a
+    time. Paths are not extended past the target or back onto themselves. Every path is selected, ordered by length.
+    If `shortest` is True, the SQL from `shortest_path_sql` is returned instead. Takes the parameters from
+    `paths_params`.
+    """
+    if shortest:
+        return shortest_path_sql(
+            edge_model, edge_filter_sql=edge_filter_sql, node_filter_sql=node_filter_sql, using=using
+        )
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    edge_table = qn(edge_model._meta.db_table)
+    parent_field = edge_model._meta.get_field("parent")
+    parent_col = qn(parent_field.column)
+    child_col = qn(edge_model._meta.get_field("child").column)
+    pk_type = parent_field.rel_db_type(connection)
+    child_text = f"CAST({edge_table}.{child_col} AS TEXT)"
+
+    return f"""
+        WITH RECURSIVE paths(node_id, depth, path) AS (
+            SELECT CAST(%s AS {pk_type}), 0, '/' || CAST(%s AS TEXT) || '/'
+        UNION ALL
+            SELECT {edge_table}.{child_col}, paths.depth + 1, paths.path || {child_text} || '/' FROM paths
+            INNER JOIN {edge_table} ON {edge_table}.{parent_col} = paths.node_id
+            WHERE paths.depth < %s AND paths.node_id <> %s AND {edge_table}.{child_col} IS NOT NULL
+            AND paths.path NOT LIKE '%%/' || {child_text} || '/%%'
+            {edge_filter_sql} {node_filter_sql}
+        )
+        SELECT path FROM paths WHERE node_id = %s ORDER BY depth, path
+    """
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def shortest_path_sql(edge_model, edge_filter_sql="", node_filter_sql="", using=DEFAULT_DB_ALIAS):
+    """Returns the SQL selecting one shortest path from a source Node to a target Node, as a string of pks.
+
+    Enumerating paths grows exponentially with the number of branches, so the search instead walks breadth-first
+    over distinct `(node, depth)` pairs, which grow at most linearly with the depth. The path is then rebuilt
+    backwards from the target's shallowest depth, stepping each time to the parent with the lowest pk among those
+    reached one level higher. Takes the parameters from `paths_params` with `shortest=True`.
+    """
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    edge_table = qn(edge_model._meta.db_table)
+    parent_field = edge_model._meta.get_field("parent")
+    parent_col = qn(parent_field.column)
+    child_col = qn(edge_model._meta.get_field("child").column)
+    pk_type = parent_field.rel_db_type(connection)
+
+    return f"""
+        WITH RECURSIVE reach(node_id, depth) AS (
+            SELECT CAST(%s AS {pk_type}), 0
+        UNION
+            SELECT {edge_table}.{child_col}, reach.depth + 1 FROM reach
+            INNER JOIN {edge_table} ON {edge_table}.{parent_col} = reach.node_id
+            WHERE reach.depth < %s AND reach.node_id <> %s AND {edge_table}.{child_col} IS NOT NULL
+            {edge_filter_sql} {node_filter_sql}
+        ),
+        steps(node_id, depth, parent_id) AS (
+            SELECT reach.node_id, reach.depth, MIN({edge_table}.{parent_col}) FROM reach
+            INNER JOIN {edge_table} ON {edge_table}.{child_col} = reach.node_id
+            INNER JOIN reach AS above ON above.node_id = {edge_table}.{parent_col} AND above.depth = reach.depth - 1
+            WHERE reach.depth > 0 {edge_filter_sql}
+            GROUP BY reach.node_id, reach.depth
+        ),
+        walk(node_id, depth, path) AS (
+            SELECT node_id, depth, '/' || CAST(node_id AS TEXT) || '/' FROM reach
+            WHERE node_id = %s AND depth = (SELECT MIN(depth) FROM reach WHERE node_id = %s)
+        UNION ALL
+            SELECT steps.parent_id, walk.depth - 1, '/' || CAST(steps.parent_id AS TEXT) || walk.path FROM walk
+            INNER JOIN steps ON steps.node_id = walk.node_id AND steps.depth = walk.depth
+        )
+        SELECT path FROM walk WHERE depth = 0
+    """
+
+
+def paths_params(source_pk, target_pk, max_depth=None, edge_filter_params=(), node_filter_params=(), shortest=False):
+    """Returns the parameters for the SQL from `paths_sql`, or from `shortest_path_sql` if `shortest` is True."""
+    if max_depth is None:
+        max_depth = DEFAULT_MAX_DEPTH
+    if shortest:
+        return [
+            source_pk,
+            max_depth,
+            target_pk,
+            *edge_filter_params,
+            *node_filter_params,
+            *edge_filter_params,
+            target_pk,
+            target_pk,
+        ]
+    return [source_pk, source_pk, max_depth, target_pk, *edge_filter_params, *node_filter_params, target_pk]
+
+
+def parse_path(path: str, pk_field) -> list:
+    """Returns the list of pks in a path string from `paths_sql`, converted with the Node model's pk field."""
+    return [pk_field.to_python(pk) for pk in path.strip("/").split("/")]
+
+
+def _expand_frontier_edges(edge_model, frontier, leafward=True, using=DEFAULT_DB_ALIAS):
+    """Returns the `(from_pk, to_pk)` pairs of the Edges leading one step away from the frontier, in the direction."""
+    source, target = ("parent", "child") if leafward else ("child", "parent")
+    frontier = list(frontier)
+    pairs = []
+    for start in range(0, len(frontier), FRONTIER_BATCH_SIZE):
+        pairs.extend(
+            edge_model.objects.using(using)
+            .filter(**{f"{source}__in": frontier[start : start + FRONTIER_BATCH_SIZE], f"{target}__isnull": False})
+            .order_by(f"{source}_id", f"{target}_id")
+            .values_list(f"{source}_id", f"{target}_id")
+            .distinct()
+        )
+    return pairs
+
+
+def _walk_back(links: dict, pk) -> list:
+    """Returns the pks from a Node back to the start of a search, following the links recorded by the search."""
+    path = [pk]
+    while links[path[-1]] is not None:
+        path.append(links[path[-1]])
+    return path
+
+
+def bidirectional_shortest_path(edge_model, source_pk, target_pk, max_depth=None, using=DEFAULT_DB_ALIAS):
+    """Returns the pks along a shortest path from the source Node to the target Node, or None if there is none.
+
+    As with `bidirectional_reachable`, searches from both ends at once, one query per level, expanding whichever
+    frontier is smaller. Each Node reached records the Node it was reached from, so the path can be rebuilt once
+    the two sides meet.
+    """
+    if max_depth is None:
+        max_depth = DEFAULT_MAX_DEPTH
+    forward_links, backward_links = {source_pk: None}, {target_pk: None}
+    forward_depths, backward_depths = {source_pk: 0}, {target_pk: 0}
+    forward, backward = {source_pk}, {target_pk}
+    depth = 0
+    while forward and backward and depth < max_depth:
+        depth += 1
+        leafward = len(forward) <= len(backward)
+        links, depths = (forward_links, forward_depths) if leafward else (backward_links, backward_depths)
+        reached = set()
+        frontier = forward if leafward else backward
+        for from_pk, to_pk in _expand_frontier_edges(edge_model, frontier, leafward, using=using):
+            if to_pk not in links:
+                links[to_pk] = from_pk
+                depths[to_pk] = depths[from_pk] + 1
+                reached.add(to_pk)
+
+        meetings = reached & (backward_links.keys() if leafward else forward_links.keys())
+        if meetings:
+            meeting = min(meetings, key=lambda pk: (forward_depths[pk] + backward_depths[pk], pk))
+            return _walk_back(forward_links, meeting)[::-1] + _walk_back(backward_links, meeting)[1:]
+        if leafward:
+            forward = reached
+        else:
+            backward = reached
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def closure_delta_sql(closure_model, using=DEFAULT_DB_ALIAS):
+    """Returns the SQL selecting the closure rows contributed by a single parent -> child Edge.
+
+    Every path into the parent (plus the parent itself) is combined with every path out of the child (plus the
+    child itself). Takes the parameters from `closure_delta_params`.
+    """
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    closure_table = qn(closure_model._meta.db_table)
+    ancestor_field = closure_model._meta.get_field("ancestor")
+    ancestor_col = qn(ancestor_field.column)
+    descendant_col = qn(closure_model._meta.get_field("descendant").column)
+    pk_type = ancestor_field.rel_db_type(connection)
+
+    return f"""
+        SELECT up.{ancestor_col} AS {ancestor_col},
+               down.{descendant_col} AS {descendant_col},
+               up.depth + down.depth + 1 AS depth,
+               SUM(up.paths * down.paths) * %s AS paths
+        FROM (
+            SELECT {ancestor_col}, depth, paths FROM {closure_table} WHERE {descendant_col} = %s
+            UNION ALL
+            SELECT CAST(%s AS {pk_type}), 0, 1
+        ) AS up
+        CROSS JOIN (
+            SELECT {descendant_col}, depth, paths FROM {closure_table} WHERE {ancestor_col} = %s
+            UNION ALL
+            SELECT CAST(%s AS {pk_type}), 0, 1
+        ) AS down
+        GROUP BY up.{ancestor_col}, down.{descendant_col}, up.depth + down.depth + 1
+    """
+
+
+def closure_delta_params(parent_pk, child_pk, quantity=1):
+    """Returns the parameters for the SQL from `closure_delta_sql`."""
+    return [quantity, parent_pk, parent_pk, child_pk, child_pk]
+
+
+@functools.lru_cache(maxsize=None)
+def closure_insert_sql(closure_model, using=DEFAULT_DB_ALIAS):
+    """Returns the SQL adding the paths created by a parent -> child Edge to the closure table."""
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    closure_table = qn(closure_model._meta.db_table)
+    ancestor_col = qn(closure_model._meta.get_field("ancestor").column)
+    descendant_col = qn(closure_model._meta.get_field("descendant").column)
+
+    return f"""
+        INSERT INTO {closure_table} ({ancestor_col}, {descendant_col}, depth, paths)
+        {closure_delta_sql(closure_model, using=using)}
+        ON CONFLICT ({ancestor_col}, {descendant_col}, depth)
+        DO UPDATE SET paths = {closure_table}.paths + EXCLUDED.paths
+    """
+
+
+@functools.lru_cache(maxsize=None)
+def closure_subtract_sql(closure_model, using=DEFAULT_DB_ALIAS):
+    """Returns the SQL subtracting the paths provided by a parent -> child Edge from the closure table."""
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    closure_table = qn(closure_model._meta.db_table)
+    ancestor_col = qn(closure_model._meta.get_field("ancestor").column)
+    descendant_col = qn(closure_model._meta.get_field("descendant").column)
+
+    return f"""
+        UPDATE {closure_table} SET paths = {closure_table}.paths - delta.paths
+        FROM ({closure_delta_sql(closure_model, using=using)}) AS delta
+        WHERE {closure_table}.{ancestor_col} = delta.{ancestor_col}
+            AND {closure_table}.{descendant_col} = delta.{descendant_col}
+            AND {closure_table}.depth = delta.depth
+    """
+
+
+@functools.lru_cache(maxsize=None)
+def closure_prune_sql(closure_model, using=DEFAULT_DB_ALIAS):
+    """Returns the SQL deleting closure rows left without paths below a child. Takes the params: child pk (x2)."""
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    closure_table = qn(closure_model._meta.db_table)
+    ancestor_col = qn(closure_model._meta.get_field("ancestor").column)
+    descendant_field = closure_model._meta.get_field("descendant")
+    descendant_col = qn(descendant_field.column)
+    pk_type = descendant_field.rel_db_type(connection)
+
+    return f"""
+        DELETE FROM {closure_table}
+        WHERE paths <= 0 AND {descendant_col} IN (
+            SELECT {descendant_col} FROM {closure_table} WHERE {ancestor_col} = %s
+            UNION ALL
+            SELECT CAST(%s AS {pk_type})
+        )
+    """
+
+
+def _can_prepare(cursor):
+    """Returns True if the database cursor can use server-side prepared statements.
+
+    Requires psycopg 3, with `server_side_binding` enabled and a `prepare_threshold` set in the DATABASES OPTIONS
+    (Django disables prepared statements by default).
+    """
+    if cursor.db.vendor != "postgresql":
+        return False
+    try:
+        import psycopg
+    except ImportError:
+        return False
+    raw_cursor = cursor.cursor
+    return (
+        isinstance(raw_cursor, psycopg.Cursor)
+        and not isinstance(raw_cursor, psycopg.ClientCursor)
+        and raw_cursor.connection.prepare_threshold is not None
+    )
+
+
+def execute_statement(sql, params, prepare=False, using=DEFAULT_DB_ALIAS):
+    """Executes a statement with bound parameters, returning any resulting rows.
+
+    If `prepare` is True and the connection supports it (see `_can_prepare`), the statement is prepared on the
+    server and reused on later calls over the same connection. Otherwise the statement is executed normally.
+    """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if prepare and _can_prepare(cursor):
+            with connection.wrap_database_errors:
+                cursor.cursor.execute(sql, params, prepare=True)
+        else:
+            cursor.execute(sql, params)
+        if cursor.description is None:
+            return []
+        return cursor.fetchall()
+
+
+def stream_statement(sql, params, chunk_size=STREAM_CHUNK_SIZE, using=DEFAULT_DB_ALIAS):
+    """Yields the rows of a statement lazily, fetching `chunk_size` rows per round trip.
+
+    Uses a server-side cursor where the database supports one (see `DISABLE_SERVER_SIDE_CURSORS`), so that memory
+    use does not grow with the size of the result. The cursor is closed once the rows are exhausted, or when the
+    generator is closed.
+    """
+    connection = connections[using]
+    with connection.chunked_cursor() as cursor:
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield from rows
@@ -0,0 +1,60 @@
+"""Shared helpers and the standard graphs used across the tests."""
+import pytest
+
+from tests.models import DAGNode
+from tests.models import TreeNode
+
+
+@pytest.fixture
+def names():
+    """Returns a function joining the names of some Nodes, in order, such as "rabcd"."""
+
+    def join(nodes) -> str:
+        return "".join(node.name for node in nodes)
+
+    return join
+
+
+@pytest.fixture
+def build_graph():
+    """Returns a function building a graph from a spec such as "ra rb ac x", returning the Nodes by name.
+
+    Each two-letter word is a parent -> child Edge, and each single letter an unconnected Node. Nodes are created in
+    the order their names first appear, and the Edges are added with `bulk_add`, passing on any kwargs.
+    """
+
+    def build(node_model, spec: str, **kwargs) -> dict:
+        nodes = {}
+        for name in spec.replace(" ", ""):
+            if name not in nodes:
+                nodes[name] = node_model.objects.create(name=name)
+        pairs = [(nodes[word[0]], nodes[word[1]]) for word in spec.split() if len(word) == 2]
+        if pairs:
+            node_model.children.through.objects.bulk_add(pairs, **kwargs)
+        return nodes
+
+    return build
+
+
+@pytest.fixture
+def node_model():
+    """The Node model of the standard DAGs. Override this fixture, or parametrize it, to use another model."""
+    return DAGNode
+
+
+@pytest.fixture
+def diamond(build_graph, node_model):
+    """Builds the DAG: r -> (a, b), a -> c, b -> c, c -> d."""
+    return build_graph(node_model, "ra rb ac bc cd")
+
+
+@pytest.fixture
+def layered(build_graph, node_model):
+    """Builds the DAG: r -> a -> b -> d, r -> c -> d, and an unconnected Node x."""
+    return build_graph(node_model, "ra ab rc bd cd x")
+
+
+@pytest.fixture
+def tree(build_graph):
+    """Builds the tree: r -> (a, b), a -> c, c -> d. The subtree c -> d is built before it is moved below a."""
+    return build_graph(TreeNode, "ra rb cd ac")
@@ -0,0 +1,241 @@
+"""Concrete graph models used by the test suite."""
+import uuid
+
+from django.db import models
+
+from django_directed.config import GraphConfig
+from django_directed.models import directed_factory
+
+
+cyclic_config = GraphConfig(
+    graph_type="CYCLIC",
+    graph_fullname="tests.CyclicGraph",
+    edge_fullname="tests.CyclicEdge",
+    node_fullname="tests.CyclicNode",
+)
+cyclic = directed_factory.get(config=cyclic_config)
+
+
+class CyclicGraph(cyclic.graph()):
+    """Cyclic Graph model."""
+
+    pass
+
+
+class CyclicEdge(cyclic.edge()):
+    """Cyclic Edge model."""
+
+    pass
+
+
+class CyclicNode(cyclic.node()):
+    """Cyclic Node model."""
+
+    name = models.CharField(max_length=50)
+
+
+dag_config = GraphConfig(
+    graph_type="DAG",
+    graph_fullname="tests.DAGGraph",
+    edge_fullname="tests.DAGEdge",
+    node_fullname="tests.DAGNode",
+    children_quantity_max=3,
+    prepared_statements=True,
+)
+dag = directed_factory.get(config=dag_config)
+
+
+class DAGGraph(dag.graph()):
+    """DAG Graph model."""
+
+    pass
+
+
+class DAGEdge(dag.edge()):
+    """DAG Edge model."""
+
+    weight = models.IntegerField(default=0)
+
+
+class DAGNode(dag.node()):
+    """DAG Node model."""
+
+    name = models.CharField(max_length=50)
+
+
+closure_dag_config = GraphConfig(
+    graph_type="DAG",
+    graph_fullname="tests.ClosureDAGGraph",
+    edge_fullname="tests.ClosureDAGEdge",
+    node_fullname="tests.ClosureDAGNode",
+    closure_fullname="tests.ClosureDAGClosure",
+    prepared_statements=True,
+)
+closure_dag = directed_factory.get(config=closure_dag_config)
+
+
+class ClosureDAGGraph(closure_dag.graph()):
+    """DAG Graph model using a closure table."""
+
+    pass
+
+
+class ClosureDAGEdge(closure_dag.edge()):
+    """DAG Edge model using a closure table."""
+
+    pass
+
+
+class ClosureDAGNode(closure_dag.node()):
+    """DAG Node model using a closure table."""
+
+    name = models.CharField(max_length=50)
+
+
+class ClosureDAGClosure(closure_dag.closure()):
+    """DAG Closure model."""
+
+    pass
+
+
+cached_dag_config = GraphConfig(
+    graph_type="DAG",
+    graph_fullname="tests.CachedDAGGraph",
+    edge_fullname="tests.CachedDAGEdge",
+    node_fullname="tests.CachedDAGNode",
+    cache_alias="default",
+)
+cached_dag = directed_factory.get(config=cached_dag_config)
+
+
+class CachedDAGGraph(cached_dag.graph()):
+    """DAG Graph model using the traversal cache."""
+
+    pass
+
+
+class CachedDAGEdge(cached_dag.edge()):
+    """DAG Edge model using the traversal cache."""
+
+    pass
+
+
+class CachedDAGNode(cached_dag.node()):
+    """DAG Node model using the traversal cache."""
+
+    name = models.CharField(max_length=50)
+
+
+uuid_dag_config = GraphConfig(
+    graph_type="DAG",
+    graph_fullname="tests.UUIDDAGGraph",
+    edge_fullname="tests.UUIDDAGEdge",
+    node_fullname="tests.UUIDDAGNode",
+    cache_alias="default",
+)
+uuid_dag = directed_factory.get(config=uuid_dag_config)
+
+
+class UUIDDAGGraph(uuid_dag.graph()):
+    """DAG Graph model whose Nodes have UUID pks, using the traversal cache."""
+
+    pass
+
+
+class UUIDDAGEdge(uuid_dag.edge()):
+    """DAG Edge model whose Nodes have UUID pks, using the traversal cache."""
+
+    pass
+
+
+class UUIDDAGNode(uuid_dag.node()):
+    """DAG Node model with a UUID pk, using the traversal cache."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(max_length=50)
+
+
+tree_config = GraphConfig(
+    graph_type="ARBORESCENCE",
+    graph_fullname="tests.TreeGraph",
+    edge_fullname="tests.TreeEdge",
+    node_fullname="tests.TreeNode",
+    tree_paths=True,
+)
+tree = directed_factory.get(config=tree_config)
+
+
+class TreeGraph(tree.graph()):
+    """Arborescence Graph model using tree paths."""
+
+    pass
+
+
+class TreeEdge(tree.edge()):
+    """Arborescence Edge model using tree paths."""
+
+    pass
+
+
+class TreeNode(tree.node()):
+    """Arborescence Node model using tree paths."""
+
+    name = models.CharField(max_length=50)
+
+
+counted_dag_config = GraphConfig(
+    graph_type="DAG",
+    graph_fullname="tests.CountedDAGGraph",
+    edge_fullname="tests.CountedDAGEdge",
+    node_fullname="tests.CountedDAGNode",
+    degree_counters=True,
+    depth_counter=True,
+    children_quantity_max=3,
+)
+counted_dag = directed_factory.get(config=counted_dag_config)
+
+
+class CountedDAGGraph(counted_dag.graph()):
+    """DAG Graph model using degree and depth counters."""
+
+    pass
+
+
+class CountedDAGEdge(counted_dag.edge()):
+    """DAG Edge model using degree and depth counters."""
+
+    pass
+
+
+class CountedDAGNode(counted_dag.node()):
+    """DAG Node model using degree and depth counters."""
+
+    name = models.CharField(max_length=50)
+
+
+partitioned_dag_config = GraphConfig(
+    graph_type="DAG",
+    graph_fullname="tests.PartitionedDAGGraph",
+    edge_fullname="tests.PartitionedDAGEdge",
+    node_fullname="tests.PartitionedDAGNode",
+    edge_partitioning="LIST",
+)
+partitioned_dag = directed_factory.get(config=partitioned_dag_config)
+
+
+class PartitionedDAGGraph(partitioned_dag.graph()):
+    """DAG Graph model with a partitioned Edge table."""
+
+    pass
+
+
+class PartitionedDAGEdge(partitioned_dag.edge()):
+    """DAG Edge model with a partitioned Edge table."""
+
+    pass
+
+
+class PartitionedDAGNode(partitioned_dag.node()):
+    """DAG Node model with a partitioned Edge table."""
+
+    name = models.CharField(max_length=50)
@@ -0,0 +1,58 @@
+"""Tests for the async traversal and mutation API."""
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from django_directed.context_managers import agraph_scope
+from django_directed.context_managers import get_current_graph_instance
+from tests.models import DAGEdge
+from tests.models import DAGGraph
+from tests.models import DAGNode
+
+
+@pytest.mark.django_db
+def test_async_traversals_and_mutations(names) -> None:
+    """Async methods add and remove Edges and traverse, as their sync counterparts do."""
+    a, b, c, d = (DAGNode.objects.create(name=name) for name in "abcd")
+
+    async def run():
+        await a.aadd_child(b)
+        await b.aadd_children([c, d])
+        descendants = await a.adescendants()
+        ancestors = await d.aancestors()
+        count = await a.adescendants_count()
+        await b.aremove_child(d)
+        return descendants, ancestors, count, await a.adescendants(), await d.aancestors_count()
+
+    descendants, ancestors, count, remaining, ancestors_count = async_to_sync(run)()
+    assert names(descendants) == "bcd"
+    assert names(ancestors) == "ba"
+    assert count == 3
+    assert names(remaining) == "bc"
+    assert ancestors_count == 0
+
+
+@pytest.mark.django_db
+def test_async_bulk_add_in_async_graph_scope(names) -> None:
+    """Bulk Edges created in an async scope get the current Graph, and concurrent scopes stay separate."""
+    first, second = DAGGraph.objects.create(), DAGGraph.objects.create()
+    a, b, c = (DAGNode.objects.create(name=name) for name in "abc")
+
+    async def scoped(graph):
+        async with agraph_scope(graph):
+            await asyncio.sleep(0)
+            return get_current_graph_instance("tests.DAGGraph")
+
+    async def run():
+        async with agraph_scope(first):
+            await DAGEdge.objects.abulk_add([(a, b)])
+            await DAGNode.objects.abulk_add_edges([(b, c)])
+            in_scope = await a.adescendants()
+        return in_scope, await asyncio.gather(scoped(first), scoped(second))
+
+    in_scope, current = async_to_sync(run)()
+    assert names(in_scope) == "bc"
+    assert DAGEdge.objects.filter(graph=first).count() == 2
+    assert current == [first, second]
+    assert get_current_graph_instance("tests.DAGGraph") is None
@@ -0,0 +1,188 @@
+"""Tests for bulk Edge creation and removal."""
+
+import django
+import pytest
+from django.core.exceptions import ValidationError
+from django.db import NotSupportedError
+
+from django_directed.context_managers import graph_scope
+from django_directed.signals import children_added
+from django_directed.signals import children_removed
+from tests.models import ClosureDAGNode
+from tests.models import DAGEdge
+from tests.models import DAGGraph
+from tests.models import DAGNode
+
+
+@pytest.fixture
+def nodes(build_graph):
+    """Creates a handful of unconnected DAG Nodes."""
+    return build_graph(DAGNode, "a b c d e f")
+
+
+@pytest.mark.django_db
+def test_add_children_bulk(nodes, django_assert_max_num_queries) -> None:
+    """Children are added with a constant number of queries and a single signal."""
+    received = []
+
+    def receiver(sender, pairs, **kwargs):
+        received.append(pairs)
+
+    children_added.connect(receiver)
+    try:
+        with django_assert_max_num_queries(8):
+            edges = nodes["a"].add_children([nodes["b"], nodes["c"], nodes["d"]])
+    finally:
+        children_added.disconnect(receiver)
+
+    assert all(edge.pk is not None for edge in edges)
+    assert set(nodes["a"].children.all()) == {nodes["b"], nodes["c"], nodes["d"]}
+    assert received == [
+        [(nodes["a"].pk, nodes["b"].pk), (nodes["a"].pk, nodes["c"].pk), (nodes["a"].pk, nodes["d"].pk)]
+    ]
+
+
+@pytest.mark.django_db
+def test_bulk_add_reports_every_offending_edge(nodes) -> None:
+    """Cycles, duplicates and fan-out limits are reported together, and nothing is inserted."""
+    DAGEdge.objects.bulk_add([(nodes["a"], nodes["b"]), (nodes["b"], nodes["c"])])
+
+    with pytest.raises(ValidationError) as err:
+        DAGEdge.objects.bulk_add(
+            [
+                (nodes["c"], nodes["a"]),  # cycle through existing Edges
+                (nodes["d"], nodes["e"]),
+                (nodes["e"], nodes["d"]),  # cycle within the batch
+                (nodes["a"], nodes["b"]),  # duplicate
+                (nodes["f"], nodes["f"]),  # self link
+                (nodes["a"], nodes["c"]),
+                (nodes["a"], nodes["d"]),
+                (nodes["a"], nodes["e"]),  # fourth child of a
+            ]
+        )
+
+    codes = {(e.params["parent"], e.params["child"], e.code) for e in err.value.error_list}
+    messages = {(e.params["parent"], e.params["child"]): e.message for e in err.value.error_list}
+    assert (nodes["c"].pk, nodes["a"].pk, "circular") in codes
+    assert (nodes["e"].pk, nodes["d"].pk, "circular") in codes
+    assert (nodes["a"].pk, nodes["d"].pk, "circular") not in codes
+    assert messages[(nodes["c"].pk, nodes["a"].pk)] == "The new child Node is already an ancestor"
+    assert messages[(nodes["e"].pk, nodes["d"].pk)] == "The Edge would create a cycle together with other new Edges"
+    assert (nodes["a"].pk, nodes["b"].pk, "duplicate") in codes
+    assert (nodes["f"].pk, nodes["f"].pk, "self_link") in codes
+    assert (nodes["a"].pk, nodes["e"].pk, "children_quantity") in codes
+    assert DAGEdge.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_bulk_add_maintains_closure() -> None:
+    """Bulk-added Edges are reflected in the closure table."""
+    root, a, b = (ClosureDAGNode.objects.create(name=name) for name in "rab")
+    ClosureDAGNode.objects.bulk_add_edges([(root, a), (a, b)])
+    assert list(root.descendants()) == [a, b]
+
+
+@pytest.mark.django_db
+def test_remove_children_bulk(nodes, django_assert_max_num_queries) -> None:
+    """Children are removed, and optionally deleted, with a constant number of queries and a single signal."""
+    DAGEdge.objects.bulk_add([(nodes["a"], nodes[name]) for name in "bcd"])
+    received = []
+
+    def receiver(sender, pairs, nodes_deleted, **kwargs):
+        received.append((sorted(pairs), nodes_deleted))
+
+    children_removed.connect(receiver)
+    try:
+        with django_assert_max_num_queries(10):
+            assert nodes["a"].remove_children(DAGNode.objects.filter(name__in=["b", "c"]), delete_nodes=True)
+    finally:
+        children_removed.disconnect(receiver)
+
+    assert list(nodes["a"].children.all()) == [nodes["d"]]
+    assert not DAGNode.objects.filter(name__in=["b", "c"]).exists()
+    assert received == [(sorted([(nodes["a"].pk, nodes["b"].pk), (nodes["a"].pk, nodes["c"].pk)]), True)]
+    assert not nodes["a"].remove_children([nodes["e"]])
+
+
+@pytest.mark.django_db
+def test_remove_parents_bulk(nodes) -> None:
+    """Parents are removed together, leaving the parent Nodes in place."""
+    DAGEdge.objects.bulk_add([(nodes[name], nodes["f"]) for name in "abc"])
+    assert nodes["f"].remove_parents([nodes["a"], nodes["b"]])
+    assert list(nodes["f"].parents.all()) == [nodes["c"]]
+    assert nodes["f"].remove_parent(nodes["c"])
+    assert nodes["f"].remove_parents(remove_all=True)
+    assert DAGNode.objects.count() == 6
+
+
+@pytest.mark.django_db
+def test_remove_children_maintains_closure() -> None:
+    """Removing children keeps the closure table in step."""
+    r, a, b, c = (ClosureDAGNode.objects.create(name=name) for name in "rabc")
+    r.add_children([a, b])
+    a.add_child(c)
+    r.remove_children(remove_all=True)
+    assert r.descendants_count() == 0
+    assert a.descendants_count() == 1
+
+
+@pytest.mark.django_db
+def test_bulk_create_stamps_graph_and_upserts(nodes) -> None:
+    """Edges created in a scope get the current Graph, and existing Edges can be upserted with their pks."""
+    graph = DAGGraph.objects.create()
+    with graph_scope(graph):
+        edges = DAGEdge.objects.bulk_create([DAGEdge(parent=nodes["a"], child=nodes["b"])])
+    assert edges[0].pk is not None
+    assert edges[0].graph_id == graph.pk
+
+    upserted = DAGEdge.objects.bulk_create(
+        [
+            DAGEdge(graph=graph, parent=nodes["a"], child=nodes["b"], weight=5),
+            DAGEdge(graph=graph, parent=nodes["b"], child=nodes["c"], weight=2),
+        ],
+        update_conflicts=True,
+        update_fields=["weight"],
+    )
+    assert upserted[0].pk == edges[0].pk
+    assert upserted[1].pk is not None
+    assert dict(DAGEdge.objects.values_list("child__name", "weight")) == {"b": 5, "c": 2}
+
+
+@pytest.mark.django_db
+def test_upsert_edges_without_graph(nodes) -> None:
+    """Edges without a Graph are matched on parent and child, and `update_fields` defaults to the other fields."""
+    first = DAGEdge.objects.bulk_create(
+        [DAGEdge(parent=nodes["a"], child=nodes["b"], weight=1)], update_conflicts=True, update_fields=["weight"]
+    )
+    upserted = DAGEdge.objects.bulk_create(
+        [
+            DAGEdge(parent=nodes["a"], child=nodes["b"], weight=5),
+            DAGEdge(parent=nodes["b"], child=nodes["c"], weight=2),
+        ],
+        update_conflicts=True,
+    )
+    assert upserted[0].pk == first[0].pk
+    assert upserted[1].pk is not None
+    assert DAGEdge.objects.count() == 2
+    assert dict(DAGEdge.objects.values_list("child__name", "weight")) == {"b": 5, "c": 2}
+
+
+@pytest.mark.django_db
+def test_upsert_requires_django_4_1(nodes, monkeypatch) -> None:
+    """Upserts rely on `update_conflicts`, which was added in Django 4.1."""
+    monkeypatch.setattr(django, "VERSION", (4, 0, 0, "final", 0))
+    with pytest.raises(NotSupportedError):
+        DAGEdge.objects.bulk_create([DAGEdge(parent=nodes["a"], child=nodes["b"])], update_conflicts=True)
+
+
+@pytest.mark.django_db
+def test_bulk_update_is_scoped(nodes) -> None:
+    """Within a scope, `bulk_update` only changes the current Graph's Edges, and returns the number changed."""
+    first, second = DAGGraph.objects.create(), DAGGraph.objects.create()
+    edges = DAGEdge.objects.bulk_create([DAGEdge(parent=nodes["a"], child=nodes["b"], graph=first)])
+    edges[0].weight = 3
+    with graph_scope(second):
+        assert DAGEdge.objects.bulk_update(edges, ["weight"]) == 0
+    with graph_scope(first):
+        assert DAGEdge.objects.bulk_update(edges, ["weight"]) == 1
+    assert DAGEdge.objects.get().weight == 3
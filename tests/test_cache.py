@@ -0,0 +1,73 @@
+"""Tests for the versioned traversal cache."""
+import pytest
+from django.core.cache import cache
+
+from tests.models import CachedDAGEdge
+from tests.models import CachedDAGNode
+from tests.models import UUIDDAGNode
+
+
+@pytest.fixture
+def chain(build_graph):
+    """Builds the DAG: a -> b -> c, using the traversal cache."""
+    cache.clear()
+    return build_graph(CachedDAGNode, "ab bc")
+
+
+@pytest.mark.django_db
+def test_cached_counts_skip_database(chain, django_assert_num_queries) -> None:
+    """Repeated counts are answered from the cache."""
+    assert chain["a"].descendants_count() == 2
+    with django_assert_num_queries(0):
+        assert chain["a"].descendants_count() == 2
+        assert chain["a"].descendants_count() == 2
+
+
+@pytest.mark.django_db
+def test_cached_traversal_queryset(chain, django_assert_num_queries) -> None:
+    """Cached traversals still return ordered, lazy QuerySets annotated with depth."""
+    assert list(chain["a"].descendants()) == [chain["b"], chain["c"]]
+    with django_assert_num_queries(1):
+        descendants = list(chain["a"].descendants())
+    assert descendants == [chain["b"], chain["c"]]
+    assert [node.traversal_depth for node in descendants] == [1, 2]
+    assert list(chain["c"].self_and_ancestors()) == [chain["c"], chain["b"], chain["a"]]
+    assert list(chain["a"].descendants().filter(name="c")) == [chain["c"]]
+
+
+@pytest.mark.django_db
+def test_cache_invalidated_by_edge_changes(chain) -> None:
+    """Adding or removing Edges bumps the graph version, so traversals are recomputed."""
+    assert chain["a"].descendants_count() == 2
+    d = CachedDAGNode.objects.create(name="d")
+    chain["c"].add_child(d)
+    assert chain["a"].descendants_count() == 3
+    CachedDAGEdge.objects.bulk_add([(chain["a"], d)])
+    assert list(d.ancestors()) == [chain["a"], chain["c"], chain["b"]]
+    chain["b"].remove_child(chain["c"])
+    assert chain["a"].descendants_count() == 2
+    CachedDAGEdge.objects.get(parent=chain["a"], child=d).delete()
+    assert chain["a"].descendants_count() == 1
+
+
+@pytest.mark.django_db
+def test_filtered_traversals_bypass_cache(chain, django_assert_num_queries) -> None:
+    """Traversals with filters are always run in the database."""
+    assert chain["a"].descendants_count(node_filter={"name": "b"}) == 1
+    with django_assert_num_queries(1):
+        assert chain["a"].descendants_count(node_filter={"name": "b"}) == 1
+
+
+@pytest.mark.django_db
+def test_cached_traversals_with_uuid_pks(build_graph, django_assert_num_queries) -> None:
+    """Cached rows are passed back to the database in its own format for non-integer pks."""
+    cache.clear()
+    nodes = build_graph(UUIDDAGNode, "ab bc")
+    assert list(nodes["a"].descendants()) == [nodes["b"], nodes["c"]]
+    with django_assert_num_queries(1):
+        assert list(nodes["a"].descendants()) == [nodes["b"], nodes["c"]]
+    assert list(nodes["c"].ancestors()) == [nodes["b"], nodes["a"]]
+    assert nodes["a"].descendants_count() == 2
+    assert list(nodes["a"].descendants(node_filter={"name": "b"})) == [nodes["b"]]
+    assert nodes["a"].is_ancestor_of(nodes["c"])
+    assert list(nodes["a"].iter_descendants(pks_only=True)) == [nodes["b"].pk, nodes["c"].pk]
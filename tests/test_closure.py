@@ -0,0 +1,79 @@
+"""Tests for the transitive-closure table."""
+import pytest
+from django.core.exceptions import ValidationError
+
+from tests.models import ClosureDAGClosure
+from tests.models import ClosureDAGNode
+
+
+def closure_rows():
+    """Returns the closure table as a sorted list of (ancestor, descendant, depth, paths) tuples."""
+    return sorted(
+        ClosureDAGClosure.objects.values_list("ancestor__name", "descendant__name", "depth", "paths").order_by()
+    )
+
+
+@pytest.fixture
+def node_model():
+    """Builds the standard DAGs with a closure table."""
+    return ClosureDAGNode
+
+
+@pytest.mark.django_db
+def test_closure_descendants(diamond) -> None:
+    """Descendants are read from the closure table, ordered by depth."""
+    assert list(diamond["r"].descendants()) == [diamond[name] for name in "abcd"]
+    assert diamond["r"].descendants_count() == 4
+    assert list(diamond["r"].descendants(max_depth=1)) == [diamond["a"], diamond["b"]]
+    assert ("r", "d", 3, 2) in closure_rows()
+
+
+@pytest.mark.django_db
+def test_closure_ancestors(diamond) -> None:
+    """Ancestors are read from the closure table, ordered by depth."""
+    assert list(diamond["d"].ancestors()) == [diamond[name] for name in "cabr"]
+    assert diamond["d"].ancestors_count() == 4
+    assert list(diamond["d"].self_and_ancestors(max_depth=1)) == [diamond["d"], diamond["c"]]
+    assert list(diamond["d"].roots()) == [diamond["r"]]
+
+
+@pytest.mark.django_db
+def test_closure_multi_source(diamond) -> None:
+    """Multi-source traversals are read from the closure table."""
+    sources = ClosureDAGNode.objects.filter(name__in=["a", "b"])
+    assert list(sources.descendants()) == [diamond["c"], diamond["d"]]
+    assert sources.ancestors_by_source() == {
+        diamond["a"].pk: {diamond["r"].pk: 1},
+        diamond["b"].pk: {diamond["r"].pk: 1},
+    }
+
+
+@pytest.mark.django_db
+def test_closure_circular_check(diamond) -> None:
+    """Edges which would create a cycle are rejected."""
+    with pytest.raises(ValidationError):
+        diamond["d"].add_child(diamond["r"])
+
+
+@pytest.mark.django_db
+def test_closure_remove_child(diamond) -> None:
+    """Removing an Edge removes only the paths which ran through it."""
+    diamond["a"].remove_child(diamond["c"])
+    rows = closure_rows()
+    assert ("r", "d", 3, 1) in rows
+    assert ("a", "d", 2, 1) not in rows
+
+
+@pytest.mark.django_db
+def test_rebuild_closure(diamond) -> None:
+    """Rebuilding the closure table from the Edges reproduces the incrementally maintained rows."""
+    rows = closure_rows()
+    ClosureDAGNode.rebuild_closure()
+    assert closure_rows() == rows
+
+
+@pytest.mark.django_db
+def test_closure_node_delete(diamond) -> None:
+    """Deleting a Node removes the paths running through it."""
+    diamond["c"].delete()
+    assert closure_rows() == [("r", "a", 1, 1), ("r", "b", 1, 1)]
@@ -0,0 +1,153 @@
+"""Tests for the persisted degree and depth counters."""
+import pytest
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+from django_directed.context_managers import graph_scope
+from django_directed.snapshot import GraphSnapshot
+from django_directed.traversal import DEFAULT_MAX_DEPTH
+from tests.models import CountedDAGEdge
+from tests.models import CountedDAGGraph
+from tests.models import CountedDAGNode
+
+
+def counters(nodes):
+    """Returns {name: (in_degree, out_degree, depth)}, read from the database."""
+    rows = CountedDAGNode.objects.filter(pk__in=[node.pk for node in nodes.values()])
+    return {node.name: (node.in_degree, node.out_degree, node.depth) for node in rows}
+
+
+def assert_consistent(nodes):
+    """Checks the counters against the degrees and longest-path depths of the current Edges."""
+    snapshot = GraphSnapshot.from_queryset(CountedDAGEdge.objects.all())
+    depths = snapshot.depths()
+    expected = {
+        node.name: (len(snapshot.parents(node.pk)), len(snapshot.children(node.pk)), depths.get(node.pk, 0))
+        for node in nodes.values()
+    }
+    assert counters(nodes) == expected
+
+
+@pytest.fixture
+def node_model():
+    """Builds the standard DAGs with degree and depth counters."""
+    return CountedDAGNode
+
+
+@pytest.mark.django_db
+def test_counters_follow_edge_writes(layered) -> None:
+    """Counters are kept up to date as Edges are added and removed by each write path."""
+    assert counters(layered) == {
+        "r": (0, 2, 0),
+        "a": (1, 1, 1),
+        "b": (1, 1, 2),
+        "c": (1, 1, 1),
+        "d": (2, 0, 3),
+        "x": (0, 0, 0),
+    }
+
+    CountedDAGEdge.objects.get(parent=layered["a"], child=layered["b"]).delete()
+    assert_consistent(layered)
+    assert counters(layered)["d"] == (2, 0, 2)
+
+    layered["x"].add_child(layered["b"])
+    layered["r"].remove_child(layered["c"])
+    assert_consistent(layered)
+
+    layered["b"].delete()
+    del layered["b"]
+    assert_consistent(layered)
+    assert counters(layered)["d"] == (1, 0, 1)
+
+
+@pytest.mark.django_db
+def test_roots_leaves_and_islands(layered, names) -> None:
+    """Roots, leaves, and islands are filtered on the counters."""
+    assert sorted(names(CountedDAGNode.objects.roots())) == list("rx")
+    assert sorted(names(CountedDAGNode.objects.leaves())) == list("dx")
+    assert names(CountedDAGNode.objects.islands()) == "x"
+    assert "in_degree" in str(CountedDAGNode.objects.roots().query)
+    assert names(layered["d"].roots()) == "r"
+    assert names(layered["r"].leaves()) == "d"
+    assert names(CountedDAGNode.objects.order_by("-out_degree", "name")[:1]) == "r"
+
+
+@pytest.mark.django_db
+def test_levels_and_traversals_read_depth(layered, django_assert_num_queries) -> None:
+    """Levels come from the depth column, and traversals still work alongside it."""
+    with django_assert_num_queries(1):
+        levels = [(node.name, node.level) for node in CountedDAGNode.objects.levels()]
+    assert levels == [("r", 0), ("x", 0), ("a", 1), ("c", 1), ("b", 2), ("d", 3)]
+    assert [node.name for node in layered["r"].descendants(node_filter=~Q(name="c"))] == ["a", "b", "d"]
+
+
+@pytest.mark.django_db
+def test_children_quantity_check_reads_out_degree(layered) -> None:
+    """The children quantity limit is checked against `out_degree`."""
+    r = layered["r"]
+    r.add_child(layered["x"])
+    extra = CountedDAGNode.objects.create(name="y")
+    with pytest.raises(ValidationError):
+        r.add_child(extra)
+    with pytest.raises(ValidationError):
+        CountedDAGEdge.objects.bulk_add([(r, extra)])
+
+
+@pytest.mark.django_db
+def test_rebuild_counters(layered) -> None:
+    """Counters can be rebuilt from the Edges."""
+    CountedDAGNode.objects.update(in_degree=0, out_degree=0, depth=0)
+    CountedDAGNode.rebuild_counters()
+    assert_consistent(layered)
+
+
+@pytest.mark.django_db
+def test_set_based_writes_update_counters_per_batch(django_assert_max_num_queries) -> None:
+    """`bulk_add` and `remove_children` update the counters with grouped queries, not once per Edge."""
+    layers = [[CountedDAGNode.objects.create(name=f"{depth}{i}") for i in range(2**depth)] for depth in range(1, 5)]
+    nodes = {node.name: node for layer in layers for node in layer}
+    pairs = [
+        (parent, child)
+        for upper, lower in zip(layers, layers[1:])
+        for i, parent in enumerate(upper)
+        for child in lower[2 * i : 2 * i + 2]
+    ]
+    assert len(pairs) == 28
+
+    with django_assert_max_num_queries(16):
+        CountedDAGEdge.objects.bulk_add(pairs)
+    assert_consistent(nodes)
+    assert counters(nodes)["40"] == (1, 0, 3)
+
+    with django_assert_max_num_queries(12):
+        nodes["20"].remove_children(remove_all=True)
+    assert_consistent(nodes)
+    assert counters(nodes)["30"] == (0, 2, 0)
+
+
+@pytest.mark.django_db
+def test_deleting_leaves_and_islands(layered) -> None:
+    """Deleting a Node without children, with or without parents, leaves nothing to refresh below it."""
+    layered["x"].delete()
+    del layered["x"]
+    layered["d"].delete()
+    del layered["d"]
+    assert_consistent(layered)
+    assert counters(layered)["b"] == (1, 0, 2)
+
+
+@pytest.mark.django_db
+def test_depths_follow_every_graph_and_long_paths(build_graph) -> None:
+    """Depths are refreshed through the Edges of other Graphs, and beyond the traversal depth limit."""
+    first, second = CountedDAGGraph.objects.create(), CountedDAGGraph.objects.create()
+    nodes = build_graph(CountedDAGNode, "ab x", graph=first)
+    CountedDAGEdge.objects.bulk_add([(nodes["b"], CountedDAGNode.objects.create(name="c"))], graph=second)
+    with graph_scope(first):
+        nodes["x"].add_child(nodes["a"])
+    assert CountedDAGNode.objects.get(name="c").depth == 3
+
+    chain = [CountedDAGNode.objects.create(name=f"n{i}") for i in range(DEFAULT_MAX_DEPTH + 3)]
+    CountedDAGEdge.objects.bulk_add(list(zip(chain, chain[1:])))
+    nodes["c"] = CountedDAGNode.objects.get(name="c")
+    nodes["c"].add_child(chain[0])
+    assert CountedDAGNode.objects.get(pk=chain[-1].pk).depth == DEFAULT_MAX_DEPTH + 6
@@ -0,0 +1,81 @@
+"""Tests for streaming graph export."""
+import io
+import json
+from xml.etree import ElementTree
+
+import pytest
+
+from tests.models import DAGGraph
+from tests.models import DAGNode
+
+
+@pytest.fixture
+def graph(build_graph):
+    """Builds the DAG: a -> (b, c), b -> d, in its own Graph, plus an unconnected Node."""
+    graph = DAGGraph.objects.create()
+    return graph, build_graph(DAGNode, "ab ac bd x", graph=graph)
+
+
+@pytest.mark.django_db
+def test_export_node_link(graph, django_assert_num_queries) -> None:
+    """Node-link JSON holds the connected Nodes with their fields, and every Edge, read in two queries."""
+    graph, nodes = graph
+    with django_assert_num_queries(2):
+        data = json.loads("".join(graph.export(node_fields=["name"], chunk_size=2)))
+
+    assert data["directed"] is True
+    assert data["multigraph"] is False
+    assert data["nodes"] == [{"id": nodes[name].pk, "name": name} for name in "abcd"]
+    assert data["links"] == [
+        {"source": nodes["a"].pk, "target": nodes["b"].pk},
+        {"source": nodes["a"].pk, "target": nodes["c"].pk},
+        {"source": nodes["b"].pk, "target": nodes["d"].pk},
+    ]
+    assert json.loads("".join(graph.export(multigraph=True)))["multigraph"] is True
+
+
+@pytest.mark.django_db
+def test_export_graphml(graph, tmp_path) -> None:
+    """GraphML is written to a path, with its format taken from the extension."""
+    graph, nodes = graph
+    path = tmp_path / "graph.graphml"
+    graph.export(path, node_fields=["name"])
+
+    namespace = {"g": "http://graphml.graphdrawing.org/xmlns"}
+    root = ElementTree.parse(path).getroot()
+    assert root.find("g:key", namespace).attrib["attr.name"] == "name"
+    names = [element.text for element in root.findall("g:graph/g:node/g:data", namespace)]
+    assert names == ["a", "b", "c", "d"]
+    assert len(root.findall("g:graph/g:edge", namespace)) == 3
+
+
+@pytest.mark.django_db
+def test_export_induced_subgraph_as_dot(graph) -> None:
+    """Exporting Nodes includes only the Edges between them, and escapes attribute values."""
+    graph, nodes = graph
+    DAGNode.objects.filter(pk=nodes["b"].pk).update(name='say "b"')
+    file = io.StringIO()
+    DAGNode.objects.filter(pk__in=[nodes["a"].pk, nodes["b"].pk, nodes["x"].pk]).export(
+        file, format="dot", node_fields=["name"]
+    )
+
+    a, b, x = nodes["a"].pk, nodes["b"].pk, nodes["x"].pk
+    assert file.getvalue() == (
+        "digraph {\n"
+        f'  "{a}" [name="a"];\n'
+        f'  "{b}" [name="say \\"b\\""];\n'
+        f'  "{x}" [name="x"];\n'
+        f'  "{a}" -> "{b}";\n'
+        "}\n"
+    )
+
+
+@pytest.mark.django_db
+def test_export_descendants_subgraph(graph) -> None:
+    """A traversal QuerySet can be exported as a subgraph."""
+    graph, nodes = graph
+    data = json.loads("".join(nodes["a"].self_and_descendants().export()))
+    assert [node["id"] for node in data["nodes"]] == [nodes[name].pk for name in "abcd"]
+    assert len(data["links"]) == 3
+    with pytest.raises(ValueError):
+        list(graph.export(format="csv"))
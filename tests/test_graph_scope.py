@@ -0,0 +1,124 @@
+"""Tests for limiting Edge QuerySets and traversals to the Graph set by `graph_scope`."""
+import pytest
+from django.core.exceptions import ValidationError
+
+from django_directed.context_managers import get_current_graph_instance
+from django_directed.context_managers import graph_scope
+from django_directed.exceptions import NodeNotReachableError
+from tests.models import ClosureDAGEdge
+from tests.models import ClosureDAGGraph
+from tests.models import ClosureDAGNode
+from tests.models import DAGEdge
+from tests.models import DAGGraph
+from tests.models import DAGNode
+
+
+@pytest.fixture
+def build(build_graph):
+    """Returns a function building a -> b -> c in a first Graph and a -> d -> e in a second, for the given models."""
+
+    def build_scoped(graph_model, edge_model, node_model):
+        first, second = graph_model.objects.create(), graph_model.objects.create()
+        nodes = build_graph(node_model, "ab bc d e", graph=first)
+        edge_model.objects.bulk_add([(nodes["a"], nodes["d"]), (nodes["d"], nodes["e"])], graph=second)
+        return first, second, nodes
+
+    return build_scoped
+
+
+@pytest.mark.django_db
+def test_graph_scope_sets_current_graph() -> None:
+    """The scope is stored under the Graph model's fullname, and restored when nested scopes exit."""
+    first, second = DAGGraph.objects.create(), DAGGraph.objects.create()
+    with graph_scope(first):
+        assert get_current_graph_instance("tests.DAGGraph") == first
+        with graph_scope(second):
+            assert get_current_graph_instance("tests.DAGGraph") == second
+        assert get_current_graph_instance("tests.DAGGraph") == first
+    assert get_current_graph_instance("tests.DAGGraph") is None
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("models", [(DAGGraph, DAGEdge, DAGNode), (ClosureDAGGraph, ClosureDAGEdge, ClosureDAGNode)])
+def test_traversals_follow_scoped_edges(models, names, build) -> None:
+    """Within a scope, Edge QuerySets and traversals only include the current Graph's Edges."""
+    first, second, nodes = build(*models)
+    a = nodes["a"]
+    assert names(a.descendants()) == "bdce"
+
+    with graph_scope(first):
+        assert models[1].objects.count() == 2
+        assert names(a.descendants()) == "bc"
+        assert a.descendants_count() == 2
+        assert names(a.raw_queryset()) == "bc"
+        assert names(models[2].objects.filter(name="a").descendants()) == "bc"
+        assert names(a.shortest_path(nodes["c"])) == "abc"
+    with graph_scope(second):
+        assert names(a.descendants()) == "de"
+        assert names(nodes["e"].ancestors()) == "da"
+        assert not a.all_paths(nodes["c"])
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("models", [(DAGGraph, DAGEdge, DAGNode), (ClosureDAGGraph, ClosureDAGEdge, ClosureDAGNode)])
+@pytest.mark.parametrize("bidirectional", [False, True])
+def test_reachability_and_levels_follow_scoped_edges(models, bidirectional, names, build) -> None:
+    """Within a scope, reachability agrees with path queries, and levels only count the current Graph's Edges."""
+    first, second, nodes = build(*models)
+    a, c, e = nodes["a"], nodes["c"], nodes["e"]
+    assert a.is_ancestor_of(e, bidirectional=bidirectional)
+    assert [node.level for node in models[2].objects.filter(name__in="ce").levels()] == [2, 2]
+
+    with graph_scope(first):
+        assert a.is_ancestor_of(c, bidirectional=bidirectional)
+        assert not a.is_ancestor_of(e, bidirectional=bidirectional)
+        assert names(a.shortest_path(c, bidirectional=bidirectional)) == "abc"
+        with pytest.raises(NodeNotReachableError):
+            a.shortest_path(e, bidirectional=bidirectional)
+        assert names(models[2].objects.levels()) == "adebc"
+        assert [node.level for node in models[2].objects.levels()] == [0, 0, 0, 1, 2]
+    with graph_scope(second):
+        assert e.is_descendant_of(a, bidirectional=bidirectional)
+        assert not c.is_descendant_of(a, bidirectional=bidirectional)
+
+
+@pytest.mark.django_db
+def test_scoped_traversal_sql_filters_on_graph(build) -> None:
+    """The Graph predicate is applied in the recursive term of the traversal."""
+    first, _, nodes = build(DAGGraph, DAGEdge, DAGNode)
+    with graph_scope(first):
+        sql = str(nodes["a"].descendants().query)
+    assert '"graph_id" = ' in sql
+
+
+@pytest.mark.django_db
+def test_integrity_checks_consider_every_graph(build) -> None:
+    """Cycle checks are not limited by the scope, while duplicates are checked within each Graph."""
+    first, second, nodes = build(DAGGraph, DAGEdge, DAGNode)
+    with graph_scope(first):
+        with pytest.raises(ValidationError):
+            nodes["e"].add_child(nodes["a"])
+        with pytest.raises(ValidationError):
+            nodes["a"].add_child(nodes["b"])
+        nodes["a"].add_child(nodes["d"])
+    with pytest.raises(ValidationError):
+        DAGEdge.objects.bulk_add([(nodes["b"], nodes["c"])], graph=first)
+    DAGEdge.objects.bulk_add([(nodes["b"], nodes["c"])], graph=second)
+    DAGEdge.objects.bulk_add([(nodes["b"], nodes["c"])])
+    with pytest.raises(ValidationError):
+        DAGEdge.objects.bulk_add([(nodes["b"], nodes["c"])])
+    assert DAGEdge.objects.filter(parent=nodes["b"], child=nodes["c"]).count() == 3
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("models", [(DAGGraph, DAGEdge, DAGNode), (ClosureDAGGraph, ClosureDAGEdge, ClosureDAGNode)])
+def test_edges_saved_in_scope_belong_to_current_graph(models, names, build) -> None:
+    """Edges saved one at a time within a scope are given the current Graph, as with `bulk_add`."""
+    first, second, nodes = build(*models)
+    with graph_scope(first):
+        edge = nodes["c"].add_child(nodes["e"])
+        assert edge.graph == first
+        assert models[1].objects.count() == 3
+        assert names(nodes["a"].descendants()) == "bce"
+    with graph_scope(second):
+        assert names(nodes["a"].descendants()) == "de"
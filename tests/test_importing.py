@@ -0,0 +1,65 @@
+"""Tests for importing Edges from edge lists."""
+import io
+
+import pytest
+from django.core.exceptions import ValidationError
+
+from django_directed.importing import read_edge_list
+from tests.models import ClosureDAGEdge
+from tests.models import ClosureDAGNode
+from tests.models import DAGEdge
+from tests.models import DAGGraph
+from tests.models import DAGNode
+
+
+def test_read_edge_list_formats(tmp_path) -> None:
+    """CSV and JSON Lines files are read by extension, and file objects by the provided format."""
+    csv_path = tmp_path / "edges.csv"
+    csv_path.write_text("parent,child\na,b\nb,c\n")
+    jsonl_path = tmp_path / "edges.jsonl"
+    jsonl_path.write_text('{"from": "a", "to": "b"}\n\n{"from": "b", "to": "c"}\n')
+
+    assert list(read_edge_list(csv_path)) == [("a", "b"), ("b", "c")]
+    assert list(read_edge_list(jsonl_path, parent_key="from", child_key="to")) == [("a", "b"), ("b", "c")]
+    assert list(read_edge_list(io.StringIO("parent,child\na,b\n"), format="csv")) == [("a", "b")]
+    with pytest.raises(ValueError):
+        list(read_edge_list(io.StringIO(""), format="xml"))
+
+
+@pytest.mark.django_db
+def test_import_edges_from_csv_by_pk(tmp_path) -> None:
+    """Edges are created between the Nodes named by pk, with the provided field values."""
+    graph = DAGGraph.objects.create()
+    a, b, c = (DAGNode.objects.create(name=name) for name in "abc")
+    path = tmp_path / "edges.csv"
+    path.write_text(f"parent,child\n{a.pk},{b.pk}\n{b.pk},{c.pk}\n")
+
+    assert DAGEdge.objects.import_edges(path, graph=graph) == 2
+    assert list(a.descendants()) == [b, c]
+    assert DAGEdge.objects.filter(graph=graph).count() == 2
+
+
+@pytest.mark.django_db
+def test_import_edges_by_field_updates_closure() -> None:
+    """Node references may be resolved by another field, and the closure table is maintained."""
+    a, b, c = (ClosureDAGNode.objects.create(name=name) for name in "abc")
+    source = io.StringIO('{"parent": "a", "child": "b"}\n{"parent": "b", "child": "c"}\n')
+
+    assert ClosureDAGEdge.objects.import_edges(source, format="jsonl", node_field="name") == 2
+    assert list(a.descendants()) == [b, c]
+    assert c.ancestors_count() == 2
+
+
+@pytest.mark.django_db
+def test_import_edges_reports_every_error() -> None:
+    """Unknown Nodes and invalid Edges are all reported, and nothing is written."""
+    a, b, c = (DAGNode.objects.create(name=name) for name in "abc")
+
+    with pytest.raises(ValidationError) as excinfo:
+        DAGEdge.objects.import_edges([("a", "b"), ("a", "x"), ("y", "c")], node_field="name")
+    assert [error.code for error in excinfo.value.error_list] == ["unknown_node", "unknown_node"]
+
+    with pytest.raises(ValidationError) as excinfo:
+        DAGEdge.objects.import_edges([(a.pk, b.pk), (b.pk, c.pk), (c.pk, a.pk), (b.pk, b.pk)])
+    assert len(excinfo.value.error_list) >= 2
+    assert not DAGEdge.objects.exists()
@@ -0,0 +1,43 @@
+"""Tests for topological order and levels computed in the database."""
+import pytest
+
+from django_directed.exceptions import GraphContainsCycleError
+from tests.models import ClosureDAGNode
+from tests.models import CyclicNode
+from tests.models import DAGNode
+from tests.models import TreeNode
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("node_model", [DAGNode, ClosureDAGNode])
+def test_levels(node_model, layered, django_assert_num_queries) -> None:
+    """Each Node's level is its longest distance from a root, and levels can be fetched as batches."""
+    with django_assert_num_queries(1):
+        levels = [(node.name, node.level) for node in node_model.objects.levels()]
+    assert levels == [("r", 0), ("x", 0), ("a", 1), ("c", 1), ("b", 2), ("d", 3)]
+    assert list(node_model.objects.levels().filter(level=1)) == [layered["a"], layered["c"]]
+    assert [node.name for node in node_model.objects.filter(name__in="bcd").levels()] == ["c", "b", "d"]
+
+
+@pytest.mark.django_db
+def test_topological_sort(layered) -> None:
+    """Every Node follows all of its ancestors."""
+    order = list(DAGNode.objects.topological_sort())
+    for node in layered.values():
+        assert all(order.index(ancestor) < order.index(node) for ancestor in node.ancestors())
+
+
+@pytest.mark.django_db
+def test_levels_of_tree() -> None:
+    """Tree levels are read from the stored tree depth."""
+    root, a, b = (TreeNode.objects.create(name=name) for name in "rab")
+    root.add_child(a)
+    a.add_child(b)
+    assert [(node.name, node.level) for node in TreeNode.objects.levels()] == [("r", 0), ("a", 1), ("b", 2)]
+
+
+@pytest.mark.django_db
+def test_levels_of_cyclic_graph() -> None:
+    """Cyclic graphs have no levels."""
+    with pytest.raises(GraphContainsCycleError):
+        CyclicNode.objects.levels()
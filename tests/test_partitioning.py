@@ -0,0 +1,125 @@
+"""Tests for partitioning Edge tables by Graph on PostgreSQL."""
+import pytest
+from django.apps import apps
+from django.db import connection
+from django.db.migrations.state import ProjectState
+from pydantic import ValidationError
+
+from django_directed.config import GraphConfig
+from django_directed.context_managers import graph_scope
+from django_directed.operations import PartitionEdgeTable
+from django_directed.operations import is_partitioned
+from tests.models import PartitionedDAGEdge
+from tests.models import PartitionedDAGGraph
+from tests.models import PartitionedDAGNode
+
+
+postgresql_only = pytest.mark.skipif(connection.vendor != "postgresql", reason="Partitioning requires PostgreSQL")
+
+
+def partitions():
+    """Returns the names of the partitions of the Edge table."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(%s) ORDER BY child.relname",
+            [PartitionedDAGEdge._meta.db_table],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def primary_key():
+    """Returns the name and columns of the Edge table's primary key constraint."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = to_regclass(%s) "
+            "AND contype = 'p'",
+            [PartitionedDAGEdge._meta.db_table],
+        )
+        return cursor.fetchall()
+
+
+def run(operation, backwards: bool = False):
+    state = ProjectState.from_apps(apps)
+    with connection.schema_editor() as editor:
+        if backwards:
+            operation.database_backwards("tests", editor, state, state)
+        else:
+            operation.database_forwards("tests", editor, state, state)
+
+
+@pytest.fixture
+def build(build_graph):
+    """Returns a function building a -> b -> c in a first Graph and a -> d in a second, returning the Graphs and Nodes."""
+
+    def build_partitioned():
+        first, second = PartitionedDAGGraph.objects.create(), PartitionedDAGGraph.objects.create()
+        nodes = build_graph(PartitionedDAGNode, "ab bc d", graph=first)
+        PartitionedDAGEdge.objects.bulk_add([(nodes["a"], nodes["d"])], graph=second)
+        return first, second, nodes
+
+    return build_partitioned
+
+
+def test_partitioning_config() -> None:
+    """Only 'LIST' and 'HASH' partitioning are accepted, and the Edge graph field is then required."""
+    with pytest.raises(ValidationError):
+        GraphConfig(
+            graph_type="DAG",
+            graph_fullname="tests.DAGGraph",
+            edge_fullname="tests.DAGEdge",
+            node_fullname="tests.DAGNode",
+            edge_partitioning="RANGE",
+        )
+    assert not PartitionedDAGEdge._meta.get_field("graph").null
+    assert PartitionEdgeTable("PartitionedDAGEdge", method="hash", partitions=4).deconstruct() == (
+        "PartitionEdgeTable",
+        ["PartitionedDAGEdge"],
+        {"method": "HASH", "partitions": 4},
+    )
+
+
+@postgresql_only
+@pytest.mark.django_db
+def test_hash_partitioning_keeps_rows_and_traversals(build) -> None:
+    """Existing Edges are copied into hash partitions, and the table can be converted back."""
+    first, _, nodes = build()
+    operation = PartitionEdgeTable("PartitionedDAGEdge", method="HASH", partitions=4)
+    run(operation)
+    assert is_partitioned(PartitionedDAGEdge)
+    assert len(partitions()) == 4
+    assert PartitionedDAGEdge.objects.count() == 3
+    table = PartitionedDAGEdge._meta.db_table
+    assert primary_key() == [(f"{table}_pkey", "PRIMARY KEY (id, graph_id)")]
+
+    with graph_scope(first):
+        assert [node.name for node in nodes["a"].descendants()] == ["b", "c"]
+    nodes["c"].add_child(nodes["d"], graph=first)
+    assert PartitionedDAGEdge.objects.filter(graph=first).count() == 3
+
+    run(operation, backwards=True)
+    assert not is_partitioned(PartitionedDAGEdge)
+    assert primary_key() == [(f"{table}_pkey", "PRIMARY KEY (id)")]
+    assert PartitionedDAGEdge.objects.count() == 4
+    nodes["b"].add_child(nodes["d"], graph=first)
+
+
+@postgresql_only
+@pytest.mark.django_db
+def test_list_partitioning_creates_partitions_per_graph(build) -> None:
+    """Each Graph has its own partition, created and dropped with the Graph."""
+    first, second, nodes = build()
+    run(PartitionEdgeTable("PartitionedDAGEdge", method="LIST"))
+    table = PartitionedDAGEdge._meta.db_table
+    assert partitions() == sorted([f"{table}_default", f"{table}_graph_{first.pk}", f"{table}_graph_{second.pk}"])
+
+    third = PartitionedDAGGraph.objects.create()
+    assert f"{table}_graph_{third.pk}" in partitions()
+    nodes["c"].add_child(nodes["d"], graph=third)
+    with graph_scope(third):
+        assert [node.name for node in nodes["c"].descendants()] == ["d"]
+        assert "graph_id" in str(nodes["c"].descendants().query)
+
+    third.delete()
+    assert f"{table}_graph_{third.pk}" not in partitions()
+    assert PartitionedDAGEdge.objects.count() == 3
@@ -0,0 +1,97 @@
+"""Tests for shortest-path, distance, and all-paths queries."""
+import pytest
+from django.db.models import Q
+
+from django_directed.exceptions import NodeNotReachableError
+from django_directed.snapshot import GraphSnapshot
+from tests.models import ClosureDAGNode
+from tests.models import CyclicNode
+from tests.models import DAGEdge
+from tests.models import DAGNode
+
+
+@pytest.fixture
+def nodes(build_graph):
+    """Builds the DAG: r -> a -> b -> c -> d, r -> x -> c, and an unconnected Node z."""
+    return build_graph(DAGNode, "ra ab bc cd rx xc z")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("bidirectional", [False, True])
+def test_shortest_path_and_distance(nodes, bidirectional, names) -> None:
+    """The shortest path is found in either mode, and distance is its number of Edges."""
+    r, d = nodes["r"], nodes["d"]
+    assert names(r.shortest_path(d, bidirectional=bidirectional)) == "rxcd"
+    assert r.distance(d, bidirectional=bidirectional) == 3
+    assert r.distance(r, bidirectional=bidirectional) == 0
+    assert names(d.shortest_path(r, directional=False, bidirectional=bidirectional)) == "rxcd"
+    with pytest.raises(NodeNotReachableError):
+        d.shortest_path(r, bidirectional=bidirectional)
+    with pytest.raises(NodeNotReachableError):
+        r.distance(nodes["z"], bidirectional=bidirectional)
+    with pytest.raises(NodeNotReachableError):
+        r.distance(d, max_depth=2, bidirectional=bidirectional)
+
+
+@pytest.mark.django_db
+def test_shortest_path_with_filters(nodes, names) -> None:
+    """Filters are applied while searching, so the path avoids excluded Nodes."""
+    r, d = nodes["r"], nodes["d"]
+    assert names(r.shortest_path(d, node_filter=~Q(name="x"))) == "rabcd"
+    assert names(r.shortest_path(d, edge_filter=~Q(parent__name="x"))) == "rabcd"
+
+
+@pytest.mark.django_db
+def test_shortest_path_through_many_paths(build_graph, names) -> None:
+    """Shortest paths are found without enumerating the 2 ** 20 paths through 20 fully connected pairs of Nodes."""
+    levels = [("ABCDEFGHIJKLMNOPQRST"[level], "abcdefghijklmnopqrst"[level]) for level in range(20)]
+    spec = " ".join(parent + child for upper, lower in zip(levels, levels[1:]) for parent in upper for child in lower)
+    nodes = build_graph(DAGNode, spec + " z")
+    assert names(nodes["A"].shortest_path(nodes["t"], bidirectional=False)) == "ABCDEFGHIJKLMNOPQRSt"
+    with pytest.raises(NodeNotReachableError):
+        nodes["A"].shortest_path(nodes["z"], bidirectional=False)
+
+
+@pytest.mark.django_db
+def test_all_paths(nodes, django_assert_num_queries, names) -> None:
+    """Every path is returned in order of length, using two queries."""
+    r, d = nodes["r"], nodes["d"]
+    with django_assert_num_queries(2):
+        paths = r.all_paths(d)
+    assert [names(path) for path in paths] == ["rxcd", "rabcd"]
+    assert [names(path) for path in r.all_paths(d, max_depth=3)] == ["rxcd"]
+    assert r.all_paths(nodes["z"]) == []
+
+
+@pytest.mark.django_db
+def test_paths_in_cyclic_graph(names) -> None:
+    """Paths do not revisit Nodes, so searches over cycles terminate."""
+    a, b, c = (CyclicNode.objects.create(name=name) for name in "abc")
+    a.add_child(b)
+    b.add_child(c)
+    c.add_child(a)
+    assert names(a.shortest_path(c)) == "abc"
+    assert [names(path) for path in b.all_paths(a)] == ["bca"]
+
+
+@pytest.mark.django_db
+def test_distance_from_closure_table(django_assert_num_queries, names) -> None:
+    """With a closure table, distance is a single lookup."""
+    a, b, c = (ClosureDAGNode.objects.create(name=name) for name in "abc")
+    a.add_child(b)
+    b.add_child(c)
+    a.add_child(c)
+    with django_assert_num_queries(1):
+        assert a.distance(c) == 1
+    assert c.distance(a, directional=False) == 1
+    assert names(a.shortest_path(c)) == "ac"
+
+
+@pytest.mark.django_db
+def test_snapshot_shortest_path(nodes) -> None:
+    """Snapshots answer path queries in memory."""
+    snapshot = GraphSnapshot.from_queryset(DAGEdge.objects.all())
+    r, d = nodes["r"], nodes["d"]
+    assert snapshot.shortest_path(r.pk, d.pk) == [nodes[name].pk for name in "rxcd"]
+    assert snapshot.distance(r.pk, d.pk) == 3
+    assert snapshot.distance(d.pk, r.pk) is None
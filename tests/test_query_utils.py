@@ -0,0 +1,73 @@
+"""Tests for transforming QuerySets to alternate formats."""
+import pytest
+
+from django_directed.query_utils import edges_from_nodes_queryset
+from django_directed.query_utils import model_to_dict
+from django_directed.query_utils import nodes_from_edges_queryset
+from django_directed.query_utils import queryset_to_dicts
+from tests.models import DAGEdge
+from tests.models import DAGNode
+
+
+@pytest.mark.django_db
+def test_queryset_to_dicts_matches_model_to_dict(django_assert_num_queries) -> None:
+    """Each dict matches model_to_dict, with ManyToManyField pks fetched in one query per chunk."""
+    a, b, c, d = (DAGNode.objects.create(name=name) for name in "abcd")
+    a.add_children([b, c])
+    b.add_child(d)
+    queryset = DAGNode.objects.order_by("pk")
+    field_list = ["id", "name", "children"]
+
+    with django_assert_num_queries(3):
+        dicts = list(queryset_to_dicts(queryset, field_list, chunk_size=3))
+
+    assert [{key: data[key] for key in ("id", "name")} for data in dicts] == [
+        model_to_dict(node, ["id", "name"]) for node in queryset
+    ]
+    assert [data["children"] for data in dicts] == [[b.pk, c.pk], [d.pk], [], []]
+
+
+@pytest.mark.django_db
+def test_queryset_to_dicts_matches_model_to_dict_with_nulls(build_graph) -> None:
+    """Null foreign keys, and Edges left without a child, give the same dicts as model_to_dict."""
+    nodes = build_graph(DAGNode, "ab ac bd")
+    nodes["c"].delete()
+    DAGEdge.objects.filter(parent=nodes["b"]).update(parent=None)
+
+    node_fields = ["id", "name", "children"]
+    assert list(queryset_to_dicts(DAGNode.objects.order_by("pk"), node_fields)) == [
+        model_to_dict(node, node_fields) for node in DAGNode.objects.order_by("pk")
+    ]
+    edge_fields = ["id", "graph", "parent", "child", "weight"]
+    assert list(queryset_to_dicts(DAGEdge.objects.order_by("pk"), edge_fields)) == [
+        model_to_dict(edge, edge_fields) for edge in DAGEdge.objects.order_by("pk")
+    ]
+
+
+@pytest.mark.django_db
+def test_queryset_to_dicts_with_properties() -> None:
+    """Names of methods and properties are evaluated on each instance."""
+    a, b = (DAGNode.objects.create(name=name) for name in "ab")
+    a.add_child(b)
+    dicts = list(queryset_to_dicts(DAGNode.objects.order_by("pk"), ["name", "get_pk_name", "children"]))
+    assert dicts == [
+        {"name": "a", "children": [b.pk], "get_pk_name": "id"},
+        {"name": "b", "children": [], "get_pk_name": "id"},
+    ]
+
+
+@pytest.mark.django_db
+def test_edges_and_nodes_between_querysets(django_assert_num_queries) -> None:
+    """Edges between Nodes, and Nodes of Edges, are found with a single query using subqueries."""
+    a, b, c, d = (DAGNode.objects.create(name=name) for name in "abcd")
+    a.add_children([b, c])
+    c.add_child(d)
+
+    with django_assert_num_queries(1):
+        edges = list(edges_from_nodes_queryset(DAGNode.objects.exclude(pk=b.pk)))
+    assert [(edge.parent_id, edge.child_id) for edge in edges] == [(a.pk, c.pk), (c.pk, d.pk)]
+
+    with django_assert_num_queries(1):
+        nodes = list(nodes_from_edges_queryset(DAGEdge.objects.filter(parent=a)))
+    assert nodes == [a, b, c]
+    assert list(edges_from_nodes_queryset(c.self_and_descendants())) == [DAGEdge.objects.get(parent=c)]
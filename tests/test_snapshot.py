@@ -0,0 +1,80 @@
+"""Tests for in-memory graph snapshots."""
+import pytest
+
+from django_directed.exceptions import GraphContainsCycleError
+from django_directed.snapshot import GraphSnapshot
+from tests.models import CyclicEdge
+from tests.models import CyclicNode
+from tests.models import DAGEdge
+from tests.models import DAGGraph
+
+
+@pytest.fixture
+def graph(diamond):
+    """Moves the Edges of the diamond DAG into their own Graph."""
+    graph = DAGGraph.objects.create()
+    DAGEdge.objects.update(graph=graph)
+    return graph, diamond
+
+
+@pytest.mark.django_db
+def test_snapshot_loads_in_one_query(graph, django_assert_num_queries) -> None:
+    """The Edge table is loaded with a single query, and traversals then run without queries."""
+    graph, nodes = graph
+    with django_assert_num_queries(1):
+        snapshot = graph.snapshot()
+    with django_assert_num_queries(0):
+        assert len(snapshot) == 5
+        assert snapshot.edge_count == 5
+        assert snapshot.children(nodes["r"].pk) == [nodes["a"].pk, nodes["b"].pk]
+        assert snapshot.reachable(nodes["r"].pk, nodes["d"].pk)
+        assert not snapshot.reachable(nodes["a"].pk, nodes["b"].pk)
+
+
+@pytest.mark.django_db
+def test_snapshot_matches_database_traversals(graph) -> None:
+    """Snapshot traversals return the same pks, in the same order, as the database traversals."""
+    graph, nodes = graph
+    snapshot = graph.snapshot()
+    for node in nodes.values():
+        assert snapshot.descendants(node.pk) == [n.pk for n in node.descendants()]
+        assert snapshot.ancestors(node.pk) == [n.pk for n in node.ancestors()]
+        assert snapshot.self_and_descendants(node.pk, max_depth=1) == [n.pk for n in node.self_and_descendants(1)]
+
+
+@pytest.mark.django_db
+def test_snapshot_nodes_keep_pk_order(graph, django_assert_num_queries) -> None:
+    """Snapshot pks are turned back into Nodes with one query, in the order of the snapshot's list."""
+    graph, nodes = graph
+    snapshot = graph.snapshot()
+    ancestors = list(nodes["d"].ancestors())
+    with django_assert_num_queries(1):
+        assert snapshot.nodes(snapshot.ancestors(nodes["d"].pk)) == ancestors
+    assert list(snapshot.queryset(snapshot.ancestors(nodes["d"].pk))) == sorted(ancestors, key=lambda node: node.pk)
+
+
+@pytest.mark.django_db
+def test_snapshot_topological_order_and_depth(graph) -> None:
+    """Every Node follows its ancestors, and depth is the longest path from a root."""
+    graph, nodes = graph
+    snapshot = graph.snapshot()
+    order = snapshot.topological_sort()
+    for node in nodes.values():
+        assert all(order.index(pk) < order.index(node.pk) for pk in snapshot.ancestors(node.pk))
+    assert snapshot.roots() == [nodes["r"].pk]
+    assert snapshot.leaves() == [nodes["d"].pk]
+    assert [snapshot.depth(nodes[name].pk) for name in "rabcd"] == [0, 1, 1, 2, 3]
+
+
+@pytest.mark.django_db
+def test_snapshot_of_cyclic_graph() -> None:
+    """Traversals of a cyclic snapshot terminate, while topological order is unavailable."""
+    a, b, c = (CyclicNode.objects.create(name=name) for name in "abc")
+    a.add_child(b)
+    b.add_child(c)
+    c.add_child(a)
+    snapshot = GraphSnapshot.from_queryset(CyclicEdge.objects.all())
+    assert snapshot.descendants(a.pk) == [b.pk, c.pk, a.pk]
+    assert snapshot.reachable(a.pk, a.pk)
+    with pytest.raises(GraphContainsCycleError):
+        snapshot.topological_sort()
@@ -0,0 +1,58 @@
+"""Tests for induced subgraph extraction."""
+import json
+
+import pytest
+
+from tests.models import DAGNode
+from tests.models import TreeNode
+
+
+@pytest.fixture
+def nodes(build_graph):
+    """Builds the DAG: r -> a, a -> (b, c), r -> c, b -> d, x -> b."""
+    return build_graph(DAGNode, "ra ab ac rc bd xb")
+
+
+def pairs(nodes, *names):
+    return [(nodes[parent].pk, nodes[child].pk) for parent, child in names]
+
+
+@pytest.mark.django_db
+def test_subgraph_of_descendants(nodes, django_assert_num_queries) -> None:
+    """Nodes and induced Edges are fetched in two queries, including Edges not on shortest paths."""
+    with django_assert_num_queries(2):
+        subgraph = nodes["r"].subgraph()
+    assert subgraph.node_pks == [nodes[name].pk for name in "racbd"]
+    assert subgraph.edges == pairs(nodes, "ra", "rc", "ab", "ac", "bd")
+    assert subgraph.depths[nodes["d"].pk] == 3
+    assert nodes["x"].pk not in subgraph
+
+    limited = nodes["r"].subgraph(max_depth=1)
+    assert limited.edges == pairs(nodes, "ra", "rc", "ac")
+
+
+@pytest.mark.django_db
+def test_subgraph_in_both_directions(nodes) -> None:
+    """Ancestors are included with negative depths, ahead of the root Node and its descendants."""
+    subgraph = nodes["b"].subgraph(direction="both")
+    assert subgraph.node_pks == [nodes[name].pk for name in "raxbd"]
+    assert [subgraph.depths[pk] for pk in subgraph.node_pks] == [-2, -1, -1, 0, 1]
+    assert subgraph.edges == pairs(nodes, "ra", "ab", "bd", "xb")
+    assert subgraph.snapshot().ancestors(nodes["d"].pk) == [nodes[name].pk for name in "baxr"]
+
+    data = json.loads("".join(subgraph.export(node_fields=["name"])))
+    assert [node["name"] for node in data["nodes"]] == list("raxbd")
+    assert len(data["links"]) == 4
+    with pytest.raises(ValueError):
+        nodes["b"].subgraph(direction="sideways")
+
+
+@pytest.mark.django_db
+def test_subgraph_of_tree() -> None:
+    """Subgraphs of trees use the tree path traversals."""
+    root, a, b = (TreeNode.objects.create(name=name) for name in "rab")
+    root.add_child(a)
+    a.add_child(b)
+    subgraph = a.subgraph(direction="both")
+    assert subgraph.node_pks == [root.pk, a.pk, b.pk]
+    assert subgraph.edges == [(root.pk, a.pk), (a.pk, b.pk)]
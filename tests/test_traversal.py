@@ -0,0 +1,221 @@
+"""Tests for graph traversal queries."""
+import pytest
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connection
+from django.db.models import Q
+
+from django_directed import traversal
+from tests.models import CyclicNode
+from tests.models import DAGEdge
+from tests.models import DAGNode
+
+
+@pytest.mark.django_db
+def test_descendants_single_query(diamond, django_assert_num_queries) -> None:
+    """Descendants are fetched, with their depth, in one query ordered by depth."""
+    with django_assert_num_queries(1):
+        descendants = list(diamond["r"].descendants())
+    assert descendants == [diamond[name] for name in "abcd"]
+    assert [node.traversal_depth for node in descendants] == [1, 1, 2, 3]
+
+
+@pytest.mark.django_db
+def test_descendants_queryset_is_lazy(diamond) -> None:
+    """The traversal QuerySet can be filtered and counted like any other QuerySet."""
+    assert list(diamond["r"].descendants().filter(name__in=["b", "d"])) == [diamond["b"], diamond["d"]]
+    assert diamond["r"].descendants_count() == 4
+    assert DAGNode.objects.filter(pk__in=diamond["a"].descendants()).count() == 2
+
+
+@pytest.mark.django_db
+def test_self_and_descendants(diamond) -> None:
+    """Self is prepended or appended to the descendants."""
+    assert list(diamond["c"].self_and_descendants()) == [diamond["c"], diamond["d"]]
+    assert list(diamond["c"].descendants_and_self()) == [diamond["d"], diamond["c"]]
+
+
+@pytest.mark.django_db
+def test_descendants_terminates_on_cycles() -> None:
+    """Traversals of cyclic graphs return each reachable Node once, including self."""
+    a, b, c = (CyclicNode.objects.create(name=name) for name in "abc")
+    a.add_child(b)
+    b.add_child(c)
+    c.add_child(a)
+    assert list(a.descendants()) == [b, c, a]
+    assert [node.traversal_depth for node in a.descendants()] == [1, 2, 3]
+
+
+@pytest.mark.django_db
+def test_descendants_max_depth(diamond) -> None:
+    """The traversal stops after max_depth Edges."""
+    assert list(diamond["r"].descendants(max_depth=2)) == [diamond[name] for name in "abc"]
+    assert diamond["r"].descendants_count(max_depth=1) == 2
+
+
+@pytest.mark.django_db
+def test_descendants_filters_prune_traversal(diamond) -> None:
+    """Edges and Nodes which do not match the filters are not followed."""
+    assert list(diamond["r"].descendants(node_filter={"name__in": ["a", "d"]})) == [diamond["a"]]
+    assert list(diamond["r"].descendants(edge_filter=~Q(parent__name="a"))) == [diamond[name] for name in "abcd"]
+    assert list(diamond["r"].descendants(edge_filter=~Q(child__name="c"))) == [diamond["a"], diamond["b"]]
+
+
+@pytest.mark.django_db
+def test_ancestors(diamond) -> None:
+    """Ancestors share the descendant engine, in the rootward direction."""
+    ancestors = list(diamond["d"].ancestors())
+    assert ancestors == [diamond[name] for name in "cabr"]
+    assert [node.traversal_depth for node in ancestors] == [1, 2, 2, 3]
+    assert diamond["d"].ancestors_count() == 4
+    assert diamond["d"].ancestors_count(max_depth=2) == 3
+    assert list(diamond["d"].ancestors(node_filter=~Q(name="a"))) == [diamond[name] for name in "cbr"]
+    assert [node.pk for node in diamond["c"].ancestors_raw()] == [diamond[name].pk for name in "abr"]
+
+
+@pytest.mark.django_db
+def test_combined_traversals(diamond, names) -> None:
+    """Traversals combined with each other or with other QuerySets keep the Nodes found by either or both."""
+    descendants, ancestors = diamond["a"].descendants(), diamond["d"].ancestors()
+    assert sorted(names(descendants | ancestors)) == ["a", "b", "c", "d", "r"]
+    assert sorted(names(descendants | DAGNode.objects.filter(name="r"))) == ["c", "d", "r"]
+    assert sorted(names(DAGNode.objects.filter(name="r") | descendants)) == ["c", "d", "r"]
+    assert sorted(names(descendants & ancestors)) == ["c"]
+    assert sorted(names(descendants.union(ancestors))) == ["a", "b", "c", "d", "r"]
+    assert sorted(names(descendants.intersection(ancestors))) == ["c"]
+    assert sorted(names(descendants.difference(ancestors))) == ["d"]
+
+
+@pytest.mark.django_db
+def test_self_and_ancestors(diamond) -> None:
+    """Self is prepended to the ancestors, or appended after them in root-to-self order."""
+    assert list(diamond["a"].self_and_ancestors()) == [diamond["a"], diamond["r"]]
+    assert list(diamond["c"].ancestors_and_self()) == [diamond["r"], diamond["a"], diamond["b"], diamond["c"]]
+
+
+@pytest.mark.django_db
+def test_roots_and_leaves(diamond) -> None:
+    """Roots and leaves are the reachable Nodes without parents or children."""
+    extra_root = DAGNode.objects.create(name="x")
+    extra_root.add_child(diamond["c"])
+    assert set(diamond["d"].roots()) == {diamond["r"], extra_root}
+    assert list(diamond["r"].leaves()) == [diamond["d"]]
+    assert not diamond["r"].roots().exists()
+
+
+@pytest.mark.django_db
+def test_circular_check_without_closure(diamond) -> None:
+    """Edges which would create a cycle are rejected using an ancestor traversal."""
+    with pytest.raises(ValidationError):
+        diamond["d"].add_child(diamond["a"])
+    diamond["b"].add_child(diamond["d"])
+    assert diamond["d"].ancestors_count() == 4
+
+
+@pytest.mark.parametrize("bidirectional", [False, True])
+@pytest.mark.django_db
+def test_reachability(diamond, bidirectional) -> None:
+    """Reachability follows one or more Edges in the leafward direction, in either search mode."""
+    assert diamond["r"].is_ancestor_of(diamond["d"], bidirectional=bidirectional)
+    assert diamond["d"].is_descendant_of(diamond["a"], bidirectional=bidirectional)
+    assert not diamond["a"].is_ancestor_of(diamond["b"], bidirectional=bidirectional)
+    assert not diamond["d"].is_ancestor_of(diamond["r"], bidirectional=bidirectional)
+    assert not diamond["a"].is_ancestor_of(diamond["a"], bidirectional=bidirectional)
+
+
+@pytest.mark.parametrize("bidirectional", [False, True])
+@pytest.mark.django_db
+def test_reachability_with_cycles(bidirectional) -> None:
+    """A Node on a cycle reaches itself, and searches terminate on cycles which never reach the target."""
+    a, b, c, d = (CyclicNode.objects.create(name=name) for name in "abcd")
+    a.add_child(b)
+    b.add_child(c)
+    c.add_child(a)
+    assert a.is_ancestor_of(a, bidirectional=bidirectional)
+    assert c.is_ancestor_of(b, bidirectional=bidirectional)
+    assert not a.is_ancestor_of(d, bidirectional=bidirectional)
+    assert not d.is_ancestor_of(d, bidirectional=bidirectional)
+
+
+@pytest.mark.django_db
+def test_reachability_single_query(diamond, django_assert_num_queries) -> None:
+    """The default reachability check is a single query."""
+    with django_assert_num_queries(1):
+        assert DAGNode.reachable(diamond["r"].pk, diamond["d"].pk)
+
+
+@pytest.mark.django_db
+def test_multi_source_descendants(diamond, django_assert_num_queries) -> None:
+    """Descendants of a whole QuerySet are found in one query, at their shortest depth from any source."""
+    sources = DAGNode.objects.filter(name__in=["a", "b", "c"])
+    with django_assert_num_queries(1):
+        descendants = list(sources.descendants())
+    assert descendants == [diamond["c"], diamond["d"]]
+    assert [node.traversal_depth for node in descendants] == [1, 1]
+    assert list(sources.descendants(max_depth=1)) == [diamond["c"], diamond["d"]]
+    assert list(DAGNode.objects.filter(name__in=["a", "b"]).descendants(node_filter=~Q(name="c"))) == []
+    ancestors = list(DAGNode.objects.filter(name__in=["c", "b"]).ancestors())
+    assert ancestors == [diamond["r"], diamond["a"], diamond["b"]]
+    assert [node.traversal_depth for node in ancestors] == [1, 1, 1]
+
+
+@pytest.mark.django_db
+def test_multi_source_mapping(diamond, django_assert_num_queries) -> None:
+    """A mapping of descendants and depths for each source is built with one query."""
+    with django_assert_num_queries(1):
+        mapping = DAGNode.objects.filter(name__in=["r", "c", "d"]).descendants_by_source()
+    assert mapping == {
+        diamond["r"].pk: {diamond["a"].pk: 1, diamond["b"].pk: 1, diamond["c"].pk: 2, diamond["d"].pk: 3},
+        diamond["c"].pk: {diamond["d"].pk: 1},
+    }
+    assert DAGNode.objects.filter(pk=diamond["c"].pk).ancestors_by_source(max_depth=1) == {
+        diamond["c"].pk: {diamond["a"].pk: 1, diamond["b"].pk: 1}
+    }
+
+
+@pytest.mark.django_db
+def test_iter_descendants_streams_in_depth_order(diamond) -> None:
+    """Streaming traversals yield Nodes or pks lazily, in the same order as the QuerySet."""
+    assert list(diamond["r"].iter_descendants(chunk_size=2)) == [diamond[name] for name in "abcd"]
+    assert list(diamond["r"].iter_descendants(chunk_size=2, pks_only=True)) == [diamond[name].pk for name in "abcd"]
+    assert list(diamond["d"].iter_ancestors(pks_only=True, max_depth=2)) == [diamond[name].pk for name in "cab"]
+
+    stream = diamond["r"].iter_descendants(chunk_size=1, pks_only=True)
+    assert next(stream) == diamond["a"].pk
+    stream.close()
+
+
+@pytest.mark.django_db
+def test_descendants_raw(diamond) -> None:
+    """The raw traversal returns pks in depth order."""
+    assert [node.pk for node in diamond["r"].descendants_raw(max_depth=2)] == [diamond[name].pk for name in "abc"]
+
+
+@pytest.mark.django_db
+def test_traversal_sql_is_cached(diamond) -> None:
+    """Traversals from different Nodes share one cached statement, with the pk passed as a parameter."""
+    sql_a, params_a = diamond["a"]._traversal_sql(max_depth=3)
+    sql_b, params_b = diamond["b"]._traversal_sql(max_depth=5)
+    assert sql_a is sql_b
+    assert params_a == [diamond["a"].pk, 3]
+    assert params_b == [diamond["b"].pk, 5]
+
+
+def test_traversal_sql_is_cached_per_database(monkeypatch) -> None:
+    """Statements are built and cached separately for each database alias, with that database's quoting."""
+
+    class BacktickOperations:
+        @staticmethod
+        def quote_name(name):
+            return f"`{name}`"
+
+    class OtherConnection:
+        ops = BacktickOperations()
+        vendor = "mysql"
+
+    monkeypatch.setattr(traversal, "connections", {DEFAULT_DB_ALIAS: connection, "other": OtherConnection()})
+    default_sql = traversal.reachability_sql(DAGEdge)
+    other_sql = traversal.reachability_sql(DAGEdge, using="other")
+    assert f'"{DAGEdge._meta.db_table}"' in default_sql
+    assert f"`{DAGEdge._meta.db_table}`" in other_sql
+    assert traversal.reachability_sql(DAGEdge) is default_sql
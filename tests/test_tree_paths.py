@@ -0,0 +1,119 @@
+"""Tests for materialised tree paths on arborescences."""
+import pytest
+from django.core.exceptions import ValidationError
+
+from django_directed.config import GraphConfig
+from tests.models import TreeEdge
+from tests.models import TreeNode
+
+
+def paths():
+    """Returns {name: (tree_path as names, tree_depth)} for every Node."""
+    names = dict(TreeNode.objects.values_list("pk", "name"))
+    return {
+        name: ("/".join(names[int(pk)] for pk in path.strip("/").split("/")), depth)
+        for name, path, depth in TreeNode.objects.values_list("name", "tree_path", "tree_depth")
+    }
+
+
+@pytest.mark.django_db
+def test_tree_paths_maintained(tree) -> None:
+    """Adding an Edge moves the child's whole subtree below the parent."""
+    assert paths() == {
+        "r": ("r", 0),
+        "a": ("r/a", 1),
+        "b": ("r/b", 1),
+        "c": ("r/a/c", 2),
+        "d": ("r/a/c/d", 3),
+    }
+
+
+@pytest.mark.django_db
+def test_tree_path_traversals(tree, django_assert_num_queries) -> None:
+    """Traversals are answered from the tree paths, ordered and annotated as other traversals are."""
+    with django_assert_num_queries(2):
+        descendants = list(tree["r"].descendants())
+    assert descendants == [tree[name] for name in "abcd"]
+    assert [node.traversal_depth for node in descendants] == [1, 1, 2, 3]
+    assert list(tree["r"].descendants(max_depth=2)) == [tree[name] for name in "abc"]
+    assert list(tree["d"].ancestors()) == [tree[name] for name in "car"]
+    assert list(tree["d"].ancestors_and_self()) == [tree[name] for name in "racd"]
+    assert list(tree["d"].self_and_ancestors(max_depth=1)) == [tree["d"], tree["c"]]
+    assert tree["r"].descendants_count() == 4
+    assert tree["d"].ancestors_count() == 3
+    assert list(tree["d"].roots()) == [tree["r"]]
+    assert list(tree["r"].descendants(node_filter={"name__in": ["a", "b"]})) == [tree["a"], tree["b"]]
+
+
+@pytest.mark.django_db
+def test_tree_paths_after_removal(tree) -> None:
+    """Removing an Edge or deleting a Node makes the detached subtrees roots."""
+    tree["r"].remove_child(tree["a"])
+    assert paths()["d"] == ("a/c/d", 2)
+    tree["c"].delete()
+    assert paths()["d"] == ("d", 0)
+    assert paths()["a"] == ("a", 0)
+
+
+@pytest.mark.django_db
+def test_single_parent_enforced(tree) -> None:
+    """Each Node may have only one parent."""
+    with pytest.raises(ValidationError):
+        tree["b"].add_child(tree["c"])
+    with pytest.raises(ValidationError):
+        TreeEdge.objects.bulk_add([(tree["b"], tree["d"])])
+
+
+@pytest.mark.django_db
+def test_rebuild_tree_paths(tree) -> None:
+    """Rebuilding the tree paths from the Edges reproduces the incrementally maintained paths."""
+    expected = paths()
+    TreeNode.objects.update(tree_path="", tree_depth=0)
+    TreeNode.rebuild_tree_paths()
+    assert paths() == expected
+
+
+@pytest.mark.django_db
+def test_bulk_created_nodes_get_tree_paths() -> None:
+    """Nodes inserted with bulk_create are given root paths, so tree path traversals never see an empty path."""
+    nodes = TreeNode.objects.bulk_create([TreeNode(name=name) for name in "xyz"])
+    assert [node.tree_path for node in nodes] == [f"/{node.pk}/" for node in nodes]
+    assert paths() == {"x": ("x", 0), "y": ("y", 0), "z": ("z", 0)}
+    nodes[0].add_child(nodes[1])
+    assert list(nodes[0].descendants()) == [nodes[1]]
+
+
+@pytest.mark.django_db
+def test_nodes_without_tree_paths_use_recursive_traversal(tree) -> None:
+    """Until `rebuild_tree_paths()` is run, Nodes without a tree path are traversed with the recursive query."""
+    TreeNode.objects.update(tree_path="", tree_depth=0)
+    assert list(tree["a"].descendants()) == [tree["c"], tree["d"]]
+    assert list(tree["d"].ancestors()) == [tree[name] for name in "car"]
+    assert tree["r"].descendants_count() == 4
+    assert tree["d"].ancestors_count() == 3
+
+
+@pytest.mark.django_db
+def test_tree_path_length_is_validated(tree) -> None:
+    """An Edge which would make a tree path longer than the field allows is rejected, and not saved."""
+    long_path = f"/{'0' * (1020 - len(str(tree['b'].pk)))}/{tree['b'].pk}/"
+    assert len(long_path) == 1023
+    TreeNode.objects.filter(pk=tree["b"].pk).update(tree_path=long_path, tree_depth=1)
+    extra = TreeNode.objects.create(name="e")
+    with pytest.raises(ValidationError) as err:
+        tree["b"].add_child(extra)
+    assert err.value.error_list[0].code == "tree_path_too_long"
+    assert not TreeEdge.objects.filter(child=extra).exists()
+    assert TreeNode.objects.get(pk=extra.pk).tree_path == f"/{extra.pk}/"
+
+
+def test_tree_paths_only_for_arborescences() -> None:
+    """Tree paths are rejected for other graph types."""
+    with pytest.raises(ValueError):
+        GraphConfig(
+            graph_type="DAG",
+            graph_fullname="tests.DAGGraph",
+            edge_fullname="tests.DAGEdge",
+            node_fullname="tests.DAGNode",
+            tree_paths=True,
+        )